@@ -0,0 +1,93 @@
+# ---------------------------------------------------
+# Micro-batching of LLM calls under bursty load
+# ---------------------------------------------------
+# Waves of concurrent sessions hit the memory graph at once (the fake LLM,
+# async path). Every session opens with the same greeting and then asks its
+# own question, and the same workload runs with the model called directly and
+# through MicroBatchChatModel. Reported per run:
+#
+# - upstream LLM calls (one per request when direct; one per unique prompt of
+#   each batch when batched) and the batches they were grouped into,
+# - throughput and p50 / p95 turn latency (the window adds up to `--window`).
+#
+# Usage (from the project root):
+#     python benchmarks/bench_batching.py --sessions 16 64 256 --window-ms 10
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langgraph.checkpoint.memory import MemorySaver
+
+from langgraph_playground.batching import MicroBatchChatModel
+from langgraph_playground.fakes import FakeChatModel, FakeSearchTool
+from langgraph_playground.graph import build_graph
+
+
+class CallCounter(BaseCallbackHandler):
+    """Counts chat model calls made by the graph itself."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def on_chat_model_start(self, *args, **kwargs):
+        self.calls += 1
+
+
+async def run(graph, sessions: int, counter: CallCounter) -> tuple:
+    latencies = []
+
+    async def turn(thread_id: str, text: str):
+        start = time.perf_counter()
+        config = {"configurable": {"thread_id": thread_id}, "callbacks": [counter]}
+        await graph.ainvoke({"messages": [{"role": "user", "content": text}]}, config)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    # Two waves: the shared greeting, then a distinct question per session
+    await asyncio.gather(*(turn(f"s-{i}", "Hi! How are you?") for i in range(sessions)))
+    await asyncio.gather(*(turn(f"s-{i}", f"Tell me about graph node {i}") for i in range(sessions)))
+    return latencies, time.perf_counter() - start
+
+
+def percentile(samples: list, q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Upstream LLM calls and latency with micro-batching")
+    parser.add_argument("--sessions", nargs="+", type=int, default=[16, 64, 256])
+    parser.add_argument("--window-ms", type=float, default=10.0)
+    parser.add_argument("--max-batch-size", type=int, default=16)
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    print(f"{'mode':<9}{'sessions':>9}{'requests':>10}{'upstream':>10}{'batches':>9}"
+          f"{'turns/s':>9}{'p50 ms':>8}{'p95 ms':>8}")
+    for sessions in args.sessions:
+        for mode in ("direct", "batched"):
+            llm = FakeChatModel(latency=args.llm_latency)
+            if mode == "batched":
+                llm = MicroBatchChatModel(
+                    model=llm, max_wait=args.window_ms / 1000, max_batch_size=args.max_batch_size
+                )
+            graph = build_graph("memory", llm=llm, tools=[FakeSearchTool()], checkpointer=MemorySaver())
+            counter = CallCounter()
+            latencies, elapsed = asyncio.run(run(graph, sessions, counter))
+
+            stats = llm.stats if mode == "batched" else {"upstream_calls": counter.calls, "batches": "-"}
+            print(
+                f"{mode:<9}{sessions:>9}{counter.calls:>10}{stats['upstream_calls']:>10}{stats['batches']:>9}"
+                f"{len(latencies) / elapsed:>9.1f}"
+                f"{percentile(latencies, 0.50) * 1000:>8.0f}"
+                f"{percentile(latencies, 0.95) * 1000:>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# ---------------------------------------------------
+# Checkpoint storage: full snapshots vs deltas vs deltas + retention
+# ---------------------------------------------------
+# Runs long conversations (one thread each) through the memory chatbot's
+# graph without a history policy, so every message stays in the state, and
+# reports per conversation length:
+#
+# - bytes of checkpoint data: Python heap held by MemorySaver (tracemalloc),
+#   SQLite file size (WAL checkpointed) for the other savers,
+# - mean put latency and the latency of reading the latest state back
+#   from a fresh saver (delta chains are rebuilt from disk, no cache).
+#
+# Usage (from the project root):
+#     python benchmarks/bench_checkpoint_storage.py --turns 50 200 500 --snapshot-every 16 --keep-last 50
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from langgraph.checkpoint.memory import MemorySaver
+
+from langgraph_playground.fakes import FakeChatModel
+from langgraph_playground.graph import build_graph
+from langgraph_playground.sqlite_checkpointer import SqliteCheckpointer
+
+
+class TimedSaver:
+    """Wraps a saver's put to time it."""
+
+    def __init__(self, saver) -> None:
+        self.saver = saver
+        self.put_seconds = []
+        put = saver.put
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return put(*args, **kwargs)
+            finally:
+                self.put_seconds.append(time.perf_counter() - start)
+
+        saver.put = timed
+
+
+def converse(saver, turns: int) -> None:
+    graph = build_graph("basic", llm=FakeChatModel(latency=0, answer_words=60), checkpointer=saver)
+    config = {"configurable": {"thread_id": "long"}}
+    for turn in range(turns):
+        graph.invoke({"messages": [{"role": "user", "content": f"Question {turn}: how do LangGraph nodes work?"}]}, config)
+
+
+def file_size(path: str) -> int:
+    return sum(os.path.getsize(path + suffix) for suffix in ("", "-wal") if os.path.exists(path + suffix))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Checkpoint bytes and latency over long conversations")
+    parser.add_argument("--turns", type=int, nargs="+", default=[50, 200, 500])
+    parser.add_argument("--snapshot-every", type=int, default=16)
+    parser.add_argument("--keep-last", type=int, default=50)
+    args = parser.parse_args()
+
+    modes = {
+        "full": {},
+        "delta": {"snapshot_every": args.snapshot_every},
+        "delta+keep": {"snapshot_every": args.snapshot_every, "keep_last": args.keep_last},
+    }
+    print(f"{'turns':>6} {'saver':<12}{'bytes':>14}{'put ms':>10}{'read ms':>10}{'checkpoints':>13}")
+    for turns in args.turns:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        memory = MemorySaver()
+        timed = TimedSaver(memory)
+        converse(memory, turns)
+        held = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        put_ms = sum(timed.put_seconds) / len(timed.put_seconds) * 1000
+        print(f"{turns:>6} {'MemorySaver':<12}{held:>14,}{put_ms:>10.3f}{'':>10}{len(memory.storage['long']['']):>13}")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, options in modes.items():
+                path = os.path.join(tmp, f"{name}.db")
+                saver = SqliteCheckpointer(path, **options)
+                timed = TimedSaver(saver)
+                converse(saver, turns)
+                saver.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                saver.close()
+
+                reader = SqliteCheckpointer(path, **options)
+                start = time.perf_counter()
+                reader.get_tuple({"configurable": {"thread_id": "long"}})
+                read_ms = (time.perf_counter() - start) * 1000
+                (count,) = reader.conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()
+                reader.close()
+                put_ms = sum(timed.put_seconds) / len(timed.put_seconds) * 1000
+                print(f"{turns:>6} {name:<12}{file_size(path):>14,}{put_ms:>10.3f}{read_ms:>10.3f}{count:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# ---------------------------------------------------
+# Benchmark: SqliteCheckpointer vs MemorySaver
+# ---------------------------------------------------
+# Replays the checkpoint traffic of the memory chatbot (one put + one
+# put_writes per superstep, one get_tuple per turn) for many thread_ids and
+# reports the mean and p95 latency of each operation.
+#
+# Usage (from the project root):
+#     python benchmarks/bench_checkpointer.py --threads 10000 --turns 3
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import create_checkpoint, empty_checkpoint
+from langgraph.checkpoint.memory import MemorySaver
+
+from langgraph_playground.sqlite_checkpointer import SqliteCheckpointer
+
+
+def percentile(samples: list, q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def replay(saver, n_threads: int, n_turns: int) -> dict:
+    """Write n_turns supersteps per thread, reading the latest checkpoint before each."""
+    timings = {"put": [], "put_writes": [], "get_tuple": []}
+    for turn in range(n_turns):
+        for t in range(n_threads):
+            config = {"configurable": {"thread_id": f"thread-{t}", "checkpoint_ns": ""}}
+
+            start = time.perf_counter()
+            saved = saver.get_tuple(config)
+            timings["get_tuple"].append(time.perf_counter() - start)
+
+            previous = saved.checkpoint if saved else empty_checkpoint()
+            messages = list(previous["channel_values"].get("messages", []))
+            messages += [
+                HumanMessage(f"question {turn} from thread {t}"),
+                AIMessage(f"answer {turn} " + "lorem ipsum " * 20),
+            ]
+            checkpoint = create_checkpoint(previous, None, turn)
+            checkpoint["channel_values"] = {"messages": messages}
+            version = saver.get_next_version(
+                previous["channel_versions"].get("messages"), None
+            )
+            checkpoint["channel_versions"] = {"messages": version}
+            parent = saved.config if saved else config
+
+            start = time.perf_counter()
+            new_config = saver.put(
+                parent, checkpoint, {"source": "loop", "step": turn, "writes": {}}, {"messages": version}
+            )
+            timings["put"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            saver.put_writes(new_config, [("messages", messages[-1:])], task_id=f"task-{turn}")
+            timings["put_writes"].append(time.perf_counter() - start)
+    return timings
+
+
+def report(name: str, timings: dict, total: float) -> None:
+    print(f"\n{name}  (total {total:.2f}s)")
+    for op, samples in timings.items():
+        print(
+            f"  {op:<11} mean {statistics.mean(samples) * 1e6:8.1f} us"
+            f"   p95 {percentile(samples, 0.95) * 1e6:8.1f} us"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SqliteCheckpointer vs MemorySaver latency")
+    parser.add_argument("--threads", type=int, default=10_000)
+    parser.add_argument("--turns", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{args.threads} threads x {args.turns} turns")
+    with tempfile.TemporaryDirectory() as tmp:
+        savers = {
+            "MemorySaver": MemorySaver(),
+            "SqliteCheckpointer(commit_every=1)": SqliteCheckpointer(os.path.join(tmp, "a.db")),
+            "SqliteCheckpointer(commit_every=64)": SqliteCheckpointer(
+                os.path.join(tmp, "b.db"), commit_every=64
+            ),
+        }
+        for name, saver in savers.items():
+            start = time.perf_counter()
+            timings = replay(saver, args.threads, args.turns)
+            report(name, timings, time.perf_counter() - start)
+            if isinstance(saver, SqliteCheckpointer):
+                saver.close()
+
+
+if __name__ == "__main__":
+    main()
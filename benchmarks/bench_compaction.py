@@ -0,0 +1,81 @@
+# ---------------------------------------------------
+# Tool-output compaction in search-heavy sessions
+# ---------------------------------------------------
+# Runs sessions where most turns trigger a web search, with fake results
+# shaped like raw pages (long, with boilerplate and a mirrored duplicate),
+# once with the tool output kept as is and once through the `compact` node.
+# Reported per configuration:
+#
+# - prompt tokens sent to the LLM per call (mean and on the last turn),
+# - tokens of tool output before / after compaction,
+# - mean turn latency; the fake LLM's prefill time grows with the prompt
+#   (`--prefill-ms-per-1k`), like a real model's.
+#
+# Usage (from the project root):
+#     python benchmarks/bench_compaction.py --turns 12 --page-sentences 40 --budget 300
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from langgraph.checkpoint.memory import MemorySaver
+
+from langgraph_playground.compaction import ToolOutputCompactor
+from langgraph_playground.fakes import FakeChatModel, FakeSearchTool
+from langgraph_playground.graph import build_graph
+from langgraph_playground.history import HistoryPolicy
+
+TOPICS = ["LangGraph release", "Python 3.13 features", "SQLite WAL mode", "vector databases", "Rust async"]
+
+
+def run(compaction, args) -> dict:
+    graph = build_graph(
+        "memory",
+        llm=FakeChatModel(latency=args.llm_latency, prefill_latency=args.prefill_ms_per_1k / 1000),
+        tools=[FakeSearchTool(latency=0.0, max_results=3, page_sentences=args.page_sentences)],
+        checkpointer=MemorySaver(),
+        history_policy=HistoryPolicy(max_messages=10_000),  # keep everything: measure the raw growth
+        compaction=compaction,
+    )
+    config = {"configurable": {"thread_id": "search-heavy"}}
+    latencies, prompts = [], []
+    for turn in range(args.turns):
+        question = f"Search the latest news about {TOPICS[turn % len(TOPICS)]} ({turn})"
+        start = time.perf_counter()
+        state = graph.invoke({"messages": [{"role": "user", "content": question}]}, config)
+        latencies.append(time.perf_counter() - start)
+        prompts += [
+            m.usage_metadata["input_tokens"]
+            for m in state["messages"][-3:]
+            if m.type == "ai" and m.usage_metadata
+        ]
+    return {"latencies": latencies, "prompts": prompts}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prompt size and latency with and without tool-output compaction")
+    parser.add_argument("--turns", type=int, default=12)
+    parser.add_argument("--page-sentences", type=int, default=40)
+    parser.add_argument("--budget", type=int, default=300, help="token budget per tool message")
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    parser.add_argument("--prefill-ms-per-1k", type=float, default=20.0)
+    args = parser.parse_args()
+
+    compactor = ToolOutputCompactor(max_tokens=args.budget)
+    print(f"{'tool output':<12}{'prompt mean':>12}{'prompt last':>12}{'turn ms':>9}")
+    for name, compaction in (("raw", False), ("compacted", compactor)):
+        result = run(compaction, args)
+        print(
+            f"{name:<12}{statistics.mean(result['prompts']):>12.0f}{result['prompts'][-1]:>12}"
+            f"{statistics.mean(result['latencies']) * 1000:>9.0f}"
+        )
+    s = compactor.stats
+    print(f"tool output: {s['tokens_before']} -> {s['tokens_after']} tokens over {s['messages']} messages "
+          f"({1 - s['tokens_after'] / s['tokens_before']:.0%} smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# ---------------------------------------------------
+# Offline benchmark of the three chatbot graphs
+# ---------------------------------------------------
+# Builds the basic, web (tool-integrated) and memory graphs with the fake LLM and
+# fake search tool (fixed, configurable latencies, no network) and measures
+# what the graph itself costs on top of them:
+#
+# - p50 / p95 / p99 latency of one user turn,
+# - throughput (turns per second) with N concurrent sessions,
+# - peak traced memory of the run (second pass, with tracemalloc on).
+#
+# Usage (from the project root):
+#     python benchmarks/bench_graph.py --sessions 1 8 32 --history 0 20 --turns 5
+#     python benchmarks/bench_graph.py --llm-latency 0 --search-latency 0   # pure overhead
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from langgraph.checkpoint.memory import MemorySaver
+
+from langgraph_playground.fakes import FakeChatModel, FakeSearchTool
+from langgraph_playground.graph import build_graph
+
+QUESTIONS = [
+    "What's a 'node' in LangGraph?",
+    "Thanks! Can you explain it with an example?",
+    "Search the latest LangGraph release notes.",
+    "Great, summarize that in one sentence.",
+]
+
+# Same graphs as the scripts in src/, with the offline stand-ins
+VARIANTS = {
+    "basic": lambda llm, tool: build_graph("basic", llm=llm),
+    "web": lambda llm, tool: build_graph("web", llm=llm, tools=[tool]),
+    "memory": lambda llm, tool: build_graph("memory", llm=llm, tools=[tool], checkpointer=MemorySaver()),
+}
+
+
+# --- Workload ---
+def synthetic_history(n_pairs: int) -> list:
+    history = []
+    for i in range(n_pairs):
+        history.append({"role": "user", "content": f"Earlier question {i} about graphs"})
+        history.append({"role": "assistant", "content": "Earlier answer " + "about nodes and edges " * 8})
+    return history
+
+
+def run_session(graph, variant: str, history: int, turns: int) -> list:
+    """Run `turns` turns of one conversation and return each turn's latency."""
+    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+    seed = synthetic_history(history)
+    latencies = []
+    for turn in range(turns):
+        question = {"role": "user", "content": QUESTIONS[turn % len(QUESTIONS)]}
+        # Stateless graphs get the history with every request; the memory
+        # graph receives it once and keeps it in the checkpointer
+        if variant == "memory":
+            messages = (seed if turn == 0 else []) + [question]
+        else:
+            messages = seed + [question]
+        start = time.perf_counter()
+        graph.invoke({"messages": messages}, config)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def run(graph, variant: str, sessions: int, history: int, turns: int) -> tuple:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        results = list(pool.map(lambda _: run_session(graph, variant, history, turns), range(sessions)))
+    elapsed = time.perf_counter() - start
+    return [lat for session in results for lat in session], elapsed
+
+
+def percentile(samples: list, q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline latency/throughput/memory of the chatbot graphs")
+    parser.add_argument("--variants", nargs="+", default=list(VARIANTS), choices=list(VARIANTS))
+    parser.add_argument("--sessions", nargs="+", type=int, default=[1, 8, 32])
+    parser.add_argument("--history", nargs="+", type=int, default=[0, 20],
+                        help="prior user/assistant pairs in the conversation")
+    parser.add_argument("--turns", type=int, default=4)
+    parser.add_argument("--llm-latency", type=float, default=0.02)
+    parser.add_argument("--search-latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    llm = FakeChatModel(latency=args.llm_latency)
+    tool = FakeSearchTool(latency=args.search_latency)
+
+    print(f"fake LLM {args.llm_latency * 1000:.0f} ms, fake search {args.search_latency * 1000:.0f} ms, "
+          f"{args.turns} turns per session")
+    print(f"{'graph':<8}{'sessions':>9}{'history':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'turns/s':>10}{'peak MB':>9}")
+    for variant in args.variants:
+        for sessions in args.sessions:
+            for history in args.history:
+                latencies, elapsed = run(VARIANTS[variant](llm, tool), variant, sessions, history, args.turns)
+
+                # Memory pass: same workload on a fresh graph with tracing on
+                tracemalloc.start()
+                run(VARIANTS[variant](llm, tool), variant, sessions, history, args.turns)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                print(
+                    f"{variant:<8}{sessions:>9}{history:>9}"
+                    f"{percentile(latencies, 0.50) * 1000:>9.1f}"
+                    f"{percentile(latencies, 0.95) * 1000:>9.1f}"
+                    f"{percentile(latencies, 0.99) * 1000:>9.1f}"
+                    f"{len(latencies) / elapsed:>10.1f}"
+                    f"{peak / 1e6:>9.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# ---------------------------------------------------
+# Benchmark: prompt tokens per request with and without a HistoryPolicy
+# ---------------------------------------------------
+# Runs a long conversation on the memory graph (MemorySaver + thread_id) with
+# an offline fake LLM and prints the prompt tokens sent on each request. With
+# the policy the curve flattens once the window is full; without it the
+# prompt grows linearly with the number of turns.
+#
+# Usage (from the project root):
+#     python benchmarks/bench_history.py --turns 120 --max-messages 20
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import StateGraph
+
+from langgraph_playground.history import (
+    HistoryPolicy,
+    PromptTokenMeter,
+    SummaryState,
+    summarize_history,
+    with_summary,
+)
+
+ANSWER = "LangGraph models an agent as a state machine of nodes and edges. " * 4
+
+
+def build(policy, meter: PromptTokenMeter):
+    llm = FakeListChatModel(responses=[ANSWER])
+
+    def chatbot(state: SummaryState):
+        messages = with_summary(state)
+        meter.record(messages)
+        return {"messages": [llm.invoke(messages)]}
+
+    graph_builder = StateGraph(SummaryState)
+    graph_builder.add_node("chatbot", chatbot)
+    graph_builder.set_finish_point("chatbot")
+    if policy:
+        graph_builder.add_node("summarize", summarize_history(llm, policy))
+        graph_builder.add_edge("summarize", "chatbot")
+        graph_builder.set_entry_point("summarize")
+    else:
+        graph_builder.set_entry_point("chatbot")
+    return graph_builder.compile(checkpointer=MemorySaver())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prompt tokens per request over a long session")
+    parser.add_argument("--turns", type=int, default=120)
+    parser.add_argument("--max-messages", type=int, default=20)
+    parser.add_argument("--max-tokens", type=int, default=None)
+    args = parser.parse_args()
+
+    runs = {
+        "no policy": None,
+        "HistoryPolicy": HistoryPolicy(max_messages=args.max_messages, max_tokens=args.max_tokens),
+    }
+    checkpoints = sorted({1, 10, 25, 50, 100, args.turns} & set(range(1, args.turns + 1)))
+    print("turn".ljust(16) + "".join(str(t).rjust(8) for t in checkpoints) + "    mean")
+    for name, policy in runs.items():
+        meter = PromptTokenMeter()
+        graph = build(policy, meter)
+        config = {"configurable": {"thread_id": name}}
+        for turn in range(args.turns):
+            graph.invoke({"messages": [("user", f"Question number {turn} about LangGraph nodes?")]}, config)
+        row = "".join(str(meter.samples[t - 1]).rjust(8) for t in checkpoints)
+        print(name.ljust(16) + row + f"{meter.mean:8.0f}")
+
+
+if __name__ == "__main__":
+    main()
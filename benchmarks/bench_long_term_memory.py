@@ -0,0 +1,119 @@
+# ---------------------------------------------------
+# Long-term memory: recall across threads, prompt size and search cost
+# ---------------------------------------------------
+# Each simulated user states a few facts about themselves, one per thread,
+# between ordinary questions, then asks about those facts in brand new
+# threads. Compared with keeping everything in one thread (the only way to
+# recall facts with the checkpointer alone), it reports:
+#
+# - recall@k: share of the questions whose fact was among the retrieved ones,
+# - mean prompt tokens of the recall questions: one long thread vs a fresh
+#   thread plus the top-k facts,
+# - search latency as a user's store grows (1k .. 10k facts).
+#
+# Usage (from the project root):
+#     python benchmarks/bench_long_term_memory.py --users 20 --top-k 3
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from langchain_core.messages.utils import count_tokens_approximately
+from langgraph.checkpoint.memory import MemorySaver
+
+from langgraph_playground.fakes import FakeChatModel
+from langgraph_playground.graph import build_graph
+from langgraph_playground.long_term_memory import LongTermMemory
+
+# (fact template, question about it, values)
+FACTS = [
+    ("My name is {}.", "Do you remember my name?", ["Ana", "Bruno", "Chen", "Dara", "Emeka"]),
+    ("I live in {}.", "Which city do I live in?", ["Lisbon", "Porto", "Recife", "Osaka", "Nairobi"]),
+    ("I work as a {}.", "What kind of work do I do?", ["data engineer", "teacher", "nurse", "designer"]),
+    ("My favorite programming language is {}.", "Which programming language is my favorite?", ["Rust", "Go", "Python"]),
+    ("I have a dog named {}.", "What is my dog called?", ["Rex", "Luna", "Toby", "Mel"]),
+    ("I prefer {} as my editor.", "Which editor do I prefer?", ["Vim", "VS Code", "Emacs"]),
+    ("My birthday is on {}.", "When is my birthday?", ["March 3", "July 21", "December 9"]),
+    ("I am allergic to {}.", "What food am I allergic to?", ["peanuts", "shrimp", "gluten"]),
+    ("I use {} as the database for my project.", "Which database does my project use?", ["Postgres", "SQLite", "MongoDB"]),
+    ("My team has {} engineers.", "How many engineers are on my team?", ["four", "seven", "twelve"]),
+]
+SMALL_TALK = [
+    "Can you explain how LangGraph edges work?",
+    "Give me an example of a StateGraph with two nodes.",
+    "How do checkpointers store the conversation?",
+]
+
+
+class MeteredModel(FakeChatModel):
+    """Fake model that records the prompt tokens of its last call."""
+
+    last_prompt_tokens: int = 0
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.last_prompt_tokens = count_tokens_approximately(messages)
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+
+def conversation(rng: random.Random) -> tuple:
+    """The user's turns (facts and small talk, in order) and their recall questions."""
+    facts = [(template.format(rng.choice(values)), question) for template, question, values in FACTS]
+    turns = []
+    for fact, _ in facts:
+        turns += [fact, rng.choice(SMALL_TALK)]
+    return turns, facts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cross-thread recall and prompt size with long-term memory")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--top-k", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    memory = LongTermMemory(top_k=args.top_k)
+    llm = MeteredModel(latency=0)
+    with_memory = build_graph("memory", llm=llm, tools=[], checkpointer=MemorySaver(), long_term_memory=memory)
+    # One ever-growing thread per user, no summary: everything is resent
+    one_thread = build_graph("web", llm=llm, tools=[], checkpointer=MemorySaver(), compaction=False)
+
+    hits, total, tokens_memory, tokens_thread = 0, 0, [], []
+    for user in range(args.users):
+        turns, facts = conversation(rng)
+        for i, turn in enumerate(turns):
+            inputs = {"messages": [{"role": "user", "content": turn}]}
+            with_memory.invoke(inputs, {"configurable": {"thread_id": f"u{user}-t{i}", "user_id": f"u{user}"}})
+            one_thread.invoke(inputs, {"configurable": {"thread_id": f"u{user}"}})
+        for j, (fact, question) in enumerate(facts):
+            total += 1
+            hits += fact in memory.search(f"u{user}", question)
+            inputs = {"messages": [{"role": "user", "content": question}]}
+            with_memory.invoke(inputs, {"configurable": {"thread_id": f"u{user}-q{j}", "user_id": f"u{user}"}})
+            tokens_memory.append(llm.last_prompt_tokens)
+            one_thread.invoke(inputs, {"configurable": {"thread_id": f"u{user}"}})
+            tokens_thread.append(llm.last_prompt_tokens)
+
+    print(memory.report())
+    print(f"recall@{args.top_k}: {hits}/{total} ({hits / total:.0%})")
+    print(f"{'':<22}{'prompt tokens':>14}")
+    print(f"{'one long thread':<22}{statistics.mean(tokens_thread):>14.0f}")
+    print(f"{'new thread + memory':<22}{statistics.mean(tokens_memory):>14.0f}")
+
+    print(f"{'facts per user':<22}{'search ms':>14}")
+    for size in (1_000, 5_000, 10_000):
+        store = LongTermMemory(max_per_namespace=size)
+        for n in range(size):
+            template, _, values = FACTS[n % len(FACTS)]
+            store.add("big", template.format(f"{rng.choice(values)} {n}"))
+        start = time.perf_counter()
+        for _, question, _ in FACTS * 10:
+            store.search("big", question)
+        print(f"{store.count('big'):<22}{(time.perf_counter() - start) / (len(FACTS) * 10) * 1000:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# ---------------------------------------------------
+# Speculative search prefetch: hit rate and latency saved
+# ---------------------------------------------------
+# Replays a fixed set of questions (some need the web, some do not) through
+# the memory graph with the fake LLM and search tool, once without and once
+# with prefetching, and reports:
+#
+# - prefetch hit rate (searches the model made that a prefetch served),
+#   unused prefetches (wasted searches) and seconds saved as measured inside
+#   the tool,
+# - mean turn latency of both runs, overall and for the search turns.
+#
+# The fake model decides to search with its own keyword list, independent of
+# the prefetch heuristic, so both misses and unused prefetches show up.
+#
+# Usage (from the project root):
+#     python benchmarks/bench_prefetch.py --llm-latency 0.4 --search-latency 0.6
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from langgraph.checkpoint.memory import MemorySaver
+
+from langgraph_playground.fakes import FakeChatModel, FakeSearchTool
+from langgraph_playground.graph import build_graph, components
+
+QUESTIONS = [
+    "Hi! I'm learning LangGraph.",
+    "What is the latest LangGraph release?",
+    "Thanks, can you explain checkpointers?",
+    "Search for news about LangChain today",
+    "What is a StateGraph?",
+    "Who won the 2022 World Cup?",
+    "Great, and how do edges work?",
+    "What's the weather in Lisbon right now?",
+    "Give me an example with two nodes.",
+    "Look up the current price of a Raspberry Pi 5",
+    "When was Python 3.12 released?",
+    "Thank you, that's all.",
+]
+
+
+def run(prefetch: bool, args) -> tuple:
+    graph = build_graph(
+        "memory",
+        llm=FakeChatModel(latency=args.llm_latency),
+        tools=[FakeSearchTool(latency=args.search_latency)],
+        checkpointer=MemorySaver(),
+        prefetch=prefetch,
+    )
+    turns, search_turns = [], []
+    for session in range(args.sessions):
+        config = {"configurable": {"thread_id": f"replay-{session}"}}
+        for question in QUESTIONS:
+            start = time.perf_counter()
+            state = graph.invoke({"messages": [{"role": "user", "content": question}]}, config)
+            elapsed = time.perf_counter() - start
+            turns.append(elapsed)
+            # A search turn ends with: AI tool call, tool result, AI answer
+            if state["messages"][-2].type == "tool":
+                search_turns.append(elapsed)
+    return graph, turns, search_turns
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prefetch hit rate and latency saved on a replayed query set")
+    parser.add_argument("--sessions", type=int, default=3)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--search-latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    _, base_turns, base_search = run(False, args)
+    graph, turns, search = run(True, args)
+
+    print(components(graph).prefetcher.report())
+    print(f"{'':<10}{'turn ms':>10}{'search turn ms':>16}")
+    for name, all_turns, search_turns in (("off", base_turns, base_search), ("prefetch", turns, search)):
+        print(f"{name:<10}{statistics.mean(all_turns) * 1000:>10.0f}{statistics.mean(search_turns) * 1000:>16.0f}")
+    saved = (statistics.mean(base_search) - statistics.mean(search)) * 1000
+    print(f"search turns {saved:.0f} ms faster on average ({len(search)} search turns)")
+
+
+if __name__ == "__main__":
+    main()
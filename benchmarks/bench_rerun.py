@@ -0,0 +1,64 @@
+# ---------------------------------------------------
+# Streamlit rerun overhead: graph rebuilt vs cached
+# ---------------------------------------------------
+# Streamlit re-executes ui_web_app_integrate-web.py on every interaction. This
+# replays the script's setup work N times, the way each rerun would:
+#
+# - "rebuild": build_graph("web") on every rerun (TavilySearchResults,
+#   ChatTogether, bind_tools, StateGraph, compile) - the app before caching,
+# - "cached" : the graph built once per process and reused, which is what
+#   st.cache_resource gives the app.
+#
+# The real client classes are constructed (with placeholder keys if none are
+# set) but no request is sent, so the numbers are pure per-rerun overhead.
+#
+# Usage (from the project root):
+#     python benchmarks/bench_rerun.py --reruns 50
+import argparse
+import functools
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from langgraph_playground.graph import build_graph
+
+
+@functools.lru_cache(maxsize=None)
+def cached_graph():
+    return build_graph("web")
+
+
+def measure(setup, reruns: int) -> list:
+    samples = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        setup()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-rerun setup cost of the Streamlit web app")
+    parser.add_argument("--reruns", type=int, default=50)
+    args = parser.parse_args()
+
+    os.environ.setdefault("TOGETHER_API_KEY", "placeholder")
+    os.environ.setdefault("TAVILY_API_KEY", "placeholder")
+    build_graph("web")  # warm up imports so both modes start equal
+
+    print(f"{'mode':<10}{'first ms':>10}{'mean ms':>10}{'p95 ms':>10}")
+    for mode, setup in (("rebuild", lambda: build_graph("web")), ("cached", cached_graph)):
+        samples = measure(setup, args.reruns)
+        rest = sorted(samples[1:]) or samples
+        print(
+            f"{mode:<10}{samples[0] * 1000:>10.1f}"
+            f"{statistics.mean(rest) * 1000:>10.2f}"
+            f"{rest[min(len(rest) - 1, int(0.95 * len(rest)))] * 1000:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# ---------------------------------------------------
+# Model routing: latency, cost and route accuracy per threshold
+# ---------------------------------------------------
+# Replays a labelled question set (each question marked hard or not, and
+# needing the web or not) through the memory graph with two fake models: a
+# fast, cheap "small" one and a slow, pricier "large" one. Compared:
+#
+# - "large only":  every turn on the large model with the tools bound
+#   (what the chatbots do without routing),
+# - "small only":  every turn on the small model with the tools bound,
+# - "routed @ T":  ModelRouter with the small model up to complexity T.
+#
+# Reported per setup: mean and p95 turn latency, cost, share of turns on the
+# large model, searches made, and routing errors against the labels (hard
+# questions sent to the small model, easy ones escalated). The per-route
+# table of the last threshold follows.
+#
+# The fakes answer the same text whichever route is taken, so answer
+# quality is not measured here; the labels stand in for it.
+#
+# Usage (from the project root):
+#     python benchmarks/bench_routing.py --thresholds 0.5 1.5 3 --sessions 3
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from langgraph.checkpoint.memory import MemorySaver
+
+from langgraph_playground.fakes import FakeChatModel, FakeSearchTool
+from langgraph_playground.graph import build_graph
+from langgraph_playground.routing import ModelRouter, Route
+
+# (question, hard, needs the web)
+QUESTIONS = [
+    ("Hi! I'm learning LangGraph.", False, False),
+    ("What is a StateGraph?", False, False),
+    ("Thanks, can you explain checkpointers?", False, False),
+    ("Compare MemorySaver and a SQLite checkpointer: trade-offs for a multi-process server?", True, False),
+    ("What is the latest LangGraph release?", False, True),
+    ("Why does my graph loop forever between chatbot and tools, and how do I debug it step by step?", True, False),
+    ("Give me an example with two nodes.", False, False),
+    ("Search for news about LangChain today", False, True),
+    ("Refactor this node so it streams: def chatbot(state): return {'messages': [llm.invoke(state['messages'])]}", True, False),
+    ("Great, thank you!", False, False),
+    ("Design an architecture for a chatbot that serves 10k users with long-term memory.", True, False),
+    ("Who won the 2022 World Cup?", False, True),
+    ("Explique a diferença entre nós e arestas no LangGraph, passo a passo.", True, False),
+    ("Qual é a capital de Portugal?", False, False),
+    ("Look up the current price of a Raspberry Pi 5 and compare it with last year's", True, True),
+    ("Thank you, that's all.", False, False),
+]
+LARGE_PRICE = 0.88
+SMALL_PRICE = 0.18
+
+
+def run(router: ModelRouter, args) -> dict:
+    graph = build_graph(
+        "memory",
+        llm=router.order[0].llm,
+        tools=[FakeSearchTool(latency=args.search_latency)],
+        checkpointer=MemorySaver(),
+        router=router,
+    )
+    turns, searches, routing_errors, on_large = [], 0, 0, 0
+    for session in range(args.sessions):
+        config = {"configurable": {"thread_id": f"replay-{session}"}}
+        for question, hard, _ in QUESTIONS:
+            start = time.perf_counter()
+            state = graph.invoke({"messages": [{"role": "user", "content": question}]}, config)
+            turns.append(time.perf_counter() - start)
+            # A search turn ends with: AI tool call, tool result, AI answer
+            searches += state["messages"][-2].type == "tool"
+            large = state["route"].startswith("large")
+            on_large += large
+            routing_errors += large != hard
+    return {
+        "mean": statistics.mean(turns),
+        "p95": sorted(turns)[int(0.95 * (len(turns) - 1))],
+        "cost": sum(r["cost"] for r in router.summary().values()),
+        "large": on_large / len(turns),
+        "searches": searches,
+        "errors": routing_errors,
+        "turns": len(turns),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Latency, cost and route accuracy of model routing")
+    parser.add_argument("--thresholds", nargs="+", type=float, default=[0.5, 1.5, 3.0])
+    parser.add_argument("--sessions", type=int, default=3)
+    parser.add_argument("--small-latency", type=float, default=0.08)
+    parser.add_argument("--large-latency", type=float, default=0.4)
+    parser.add_argument("--search-latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    def small():
+        return FakeChatModel(model="fake-small", latency=args.small_latency, answer_words=40)
+
+    def large():
+        return FakeChatModel(model="fake-large", latency=args.large_latency, answer_words=80)
+
+    def always(text: str) -> bool:
+        return True  # tools bound on every turn, like the unrouted graph
+
+    setups = [
+        ("large only", ModelRouter([Route("large", large(), input_price=LARGE_PRICE, output_price=LARGE_PRICE)], tools_when=always)),
+        ("small only", ModelRouter([Route("small", small(), input_price=SMALL_PRICE, output_price=SMALL_PRICE)], tools_when=always)),
+    ]
+    for threshold in args.thresholds:
+        setups.append((f"routed @ {threshold:g}", ModelRouter([
+            Route("small", small(), max_complexity=threshold, input_price=SMALL_PRICE, output_price=SMALL_PRICE),
+            Route("large", large(), input_price=LARGE_PRICE, output_price=LARGE_PRICE),
+        ])))
+
+    print(f"{len(QUESTIONS)} questions x {args.sessions} sessions, "
+          f"{sum(h for _, h, _ in QUESTIONS)} hard, {sum(w for _, _, w in QUESTIONS)} needing the web\n")
+    print(f"{'setup':>14}{'mean ms':>9}{'p95 ms':>9}{'cost $':>11}{'on large':>10}{'searches':>10}{'misroutes':>11}")
+    for label, router in setups:
+        r = run(router, args)
+        misroutes = f"{r['errors']}/{r['turns']}"
+        print(
+            f"{label:>14}{r['mean'] * 1000:>9.0f}{r['p95'] * 1000:>9.0f}{r['cost']:>11.6f}"
+            f"{r['large']:>10.0%}{r['searches']:>10}{misroutes:>11}"
+        )
+
+    # Per-route detail of the last routed setup
+    print()
+    print(setups[-1][1].report())
+
+
+if __name__ == "__main__":
+    main()
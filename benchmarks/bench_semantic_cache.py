@@ -0,0 +1,94 @@
+# ---------------------------------------------------
+# Semantic cache: hit rate, false hits and lookup cost
+# ---------------------------------------------------
+# Replays groups of paraphrased questions (each group asks the same thing in
+# different words) plus look-alike questions that must NOT share an answer
+# (node vs edge, Python 3.11 vs 3.12) through the memory graph with the fake
+# LLM, once without and once with a `SemanticCache`, and reports:
+#
+# - hit rate among cacheable turns and the questions skipped by the
+#   safeguards (time-sensitive, referring to the conversation),
+# - false hits: answers served from a question of another group,
+# - mean lookup cost and mean turn latency of both runs.
+#
+# Every question runs in its own thread, so only the cache can connect them.
+#
+# Usage (from the project root):
+#     python benchmarks/bench_semantic_cache.py --llm-latency 0.4 --threshold 0.8
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from langgraph.checkpoint.memory import MemorySaver
+
+from langgraph_playground.fakes import FakeChatModel
+from langgraph_playground.graph import build_graph
+from langgraph_playground.semantic_cache import SemanticCache
+
+GROUPS = {
+    "node": ["What is a node in LangGraph?", "Explain LangGraph nodes", "What are nodes in LangGraph?"],
+    "edge": ["What is an edge in LangGraph?", "Explain edges in LangGraph", "LangGraph edges?"],
+    "reducer": ["What does a reducer do in LangGraph?", "What do reducers do in LangGraph state?"],
+    "compile": ["How do I compile a StateGraph?", "Compiling a StateGraph, how?"],
+    "create": ["How do I create a StateGraph?", "Create a StateGraph"],
+    "checkpointer": ["What is a checkpointer?", "Explain checkpointers", "What are checkpointers for?"],
+    "py311": ["What changed in Python 3.11?", "Python 3.11 changes"],
+    "py312": ["What changed in Python 3.12?"],
+    # Skipped by the safeguards: depend on the conversation or on fresh data
+    "context": ["What is my name?", "Can you explain that again?"],
+    "fresh": ["What is the latest LangGraph release?", "LangGraph news today"],
+}
+
+
+def run(cache, args) -> tuple:
+    graph = build_graph(
+        "memory",
+        llm=FakeChatModel(latency=args.llm_latency),
+        tools=[],
+        checkpointer=MemorySaver(),
+        semantic_cache=cache if cache is not None else False,
+    )
+    group_of = {q: group for group, questions in GROUPS.items() for q in questions}
+    turns, false_hits = [], []
+    for rnd in range(args.rounds):
+        # Interleave the groups so paraphrases are never back to back
+        for i in range(max(map(len, GROUPS.values()))):
+            for group, questions in GROUPS.items():
+                if i >= len(questions):
+                    continue
+                config = {"configurable": {"thread_id": f"{rnd}-{group}-{i}"}}
+                start = time.perf_counter()
+                state = graph.invoke({"messages": [{"role": "user", "content": questions[i]}]}, config)
+                turns.append(time.perf_counter() - start)
+                served = state["messages"][-1].response_metadata.get("semantic_cache")
+                if served and group_of.get(served["question"]) != group:
+                    false_hits.append((questions[i], served["question"]))
+    return turns, false_hits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Semantic cache hit rate and false hits on paraphrased questions")
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    args = parser.parse_args()
+
+    base_turns, _ = run(None, args)
+    cache = SemanticCache(threshold=args.threshold)
+    turns, false_hits = run(cache, args)
+
+    print(cache.report())
+    print(f"false hits: {len(false_hits)}")
+    for question, served in false_hits:
+        print(f"  {question!r} answered from {served!r}")
+    print(f"{'':<10}{'turn ms':>10}")
+    for name, all_turns in (("off", base_turns), ("cache", turns)):
+        print(f"{name:<10}{statistics.mean(all_turns) * 1000:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
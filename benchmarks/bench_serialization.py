@@ -0,0 +1,90 @@
+# ---------------------------------------------------
+# Message list serialization: size and speed
+# ---------------------------------------------------
+# Serializes the `messages` channel of conversations of growing length (user
+# questions, AI answers with usage metadata, searches as AI tool calls plus
+# ToolMessages with their artifacts) with:
+#
+# - JsonPlusSerializer : LangGraph's default, what checkpoints use today
+# - langchain dumps    : LangChain JSON, what the response cache used
+# - MessageSerializer  : compact msgpack schema, without and with zstd
+#
+# and reports bytes, dumps and loads time per conversation, and checks that
+# every round trip gives back equal messages.
+#
+# Usage (from the project root):
+#     python benchmarks/bench_serialization.py --messages 20 200 1000
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from langchain_core.load import dumps, loads
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from langgraph_playground.fakes import FakeSearchTool
+from langgraph_playground.serialization import MessageSerializer
+
+
+def conversation(n_messages: int) -> list:
+    search = FakeSearchTool(max_results=2)
+    messages, turn = [], 0
+    while len(messages) < n_messages:
+        question = f"Question {turn}: what is new in LangGraph checkpointing?"
+        messages.append(HumanMessage(question, id=f"h{turn}"))
+        usage = {"input_tokens": 120 + turn, "output_tokens": 60, "total_tokens": 180 + turn}
+        if turn % 3 == 0:
+            call = {"name": search.name, "args": {"query": question}, "id": f"call_{turn}", "type": "tool_call"}
+            messages.append(AIMessage("", id=f"a{turn}t", tool_calls=[call], usage_metadata=usage))
+            content, artifact = search._results(question)
+            messages.append(ToolMessage(str(content), tool_call_id=call["id"], artifact=artifact, id=f"t{turn}"))
+        answer = "LangGraph stores a checkpoint of the state after every superstep. " * 4
+        messages.append(
+            AIMessage(answer, id=f"a{turn}", usage_metadata=usage, response_metadata={"finish_reason": "stop"})
+        )
+        turn += 1
+    return messages[:n_messages]
+
+
+class LangChainJSON:
+    def dumps_typed(self, obj):
+        return "json", dumps(obj).encode()
+
+    def loads_typed(self, data):
+        return loads(data[1].decode())
+
+
+def timed(fn, repeat: int) -> tuple:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serialized size and speed of the message list")
+    parser.add_argument("--messages", type=int, nargs="+", default=[20, 200, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    serializers = {
+        "JsonPlusSerializer": JsonPlusSerializer(),
+        "langchain dumps": LangChainJSON(),
+        "MessageSerializer": MessageSerializer(),
+        "MessageSerializer+zstd": MessageSerializer(compress_level=3),
+    }
+    print(f"{'messages':>8} {'serializer':<24}{'bytes':>12}{'dumps ms':>10}{'loads ms':>10}  lossless")
+    for n in args.messages:
+        messages = conversation(n)
+        for name, serde in serializers.items():
+            data, dump_s = timed(lambda: serde.dumps_typed(messages), args.repeat)
+            back, load_s = timed(lambda: serde.loads_typed(data), args.repeat)
+            lossless = all(type(a) is type(b) and a == b for a, b in zip(messages, back)) and len(back) == n
+            print(f"{n:>8} {name:<24}{len(data[1]):>12,}{dump_s * 1000:>10.3f}{load_s * 1000:>10.3f}  {lossless}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+# ---------------------------------------------------
+# Load test of the HTTP/SSE server
+# ---------------------------------------------------
+# N concurrent clients, each on its own thread_id, send SSE turns back to back
+# for a fixed time and report:
+#
+# - sustained requests per second (completed turns),
+# - p50 / p95 / p99 latency of a full turn and of the first token,
+# - how many requests the server rejected (503, queue full / queue timeout).
+#
+# By default the ASGI app is driven in-process with the fake LLM and search
+# tool (no network, no ASGI server needed); `--url` targets a running server
+# instead, e.g. `python src/Chat-bot_server/chat_bot_server.py --fake`.
+#
+# Usage (from the project root):
+#     python benchmarks/bench_server.py --clients 8 64 256 --duration 10
+#     python benchmarks/bench_server.py --clients 512 --max-concurrency 64 --max-queue 128
+#     python benchmarks/bench_server.py --url http://localhost:8000 --clients 64
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from langgraph.checkpoint.memory import MemorySaver
+
+from langgraph_playground.fakes import FakeChatModel, FakeSearchTool
+from langgraph_playground.graph import build_graph
+from langgraph_playground.server import GraphServer
+
+QUESTIONS = [
+    "What's a 'node' in LangGraph?",
+    "Search the latest LangGraph release notes.",
+    "Great, summarize that in one sentence.",
+]
+RETRY_AFTER = 1.0
+
+
+# --- Clients: one request, returns (status, first token s, total s) ---
+def in_process_client(app: GraphServer):
+    async def request(thread_id: str, message: str) -> tuple:
+        body = json.dumps({"message": message}).encode()
+        scope = {
+            "type": "http",
+            "method": "POST",
+            "path": f"/threads/{thread_id}",
+            "headers": [(b"accept", b"text/event-stream"), (b"content-type", b"application/json")],
+        }
+        sent = asyncio.Event()
+        status, first = None, None
+        start = time.perf_counter()
+
+        async def receive():
+            if not sent.is_set():
+                sent.set()
+                return {"type": "http.request", "body": body, "more_body": False}
+            await asyncio.Future()  # never disconnects
+
+        async def send(message):
+            nonlocal status, first
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif first is None and b"event: token" in message.get("body", b""):
+                first = time.perf_counter() - start
+
+        await app(scope, receive, send)
+        return status, first, time.perf_counter() - start
+
+    return request
+
+
+def http_client(url: str, clients: int):
+    import httpx
+
+    client = httpx.AsyncClient(base_url=url, timeout=None, limits=httpx.Limits(max_connections=clients))
+
+    async def request(thread_id: str, message: str) -> tuple:
+        first = None
+        start = time.perf_counter()
+        async with client.stream(
+            "POST", f"/threads/{thread_id}", json={"message": message}, headers={"Accept": "text/event-stream"}
+        ) as response:
+            async for line in response.aiter_lines():
+                if first is None and line == "event: token":
+                    first = time.perf_counter() - start
+        return response.status_code, first, time.perf_counter() - start
+
+    return request
+
+
+# --- Load ---
+async def load(request, clients: int, duration: float) -> tuple:
+    results = []
+    deadline = time.perf_counter() + duration
+
+    async def client(i: int):
+        turn = 0
+        while time.perf_counter() < deadline:
+            result = await request(f"load-{i}", QUESTIONS[turn % len(QUESTIONS)])
+            results.append(result)
+            if result[0] == 503:
+                await asyncio.sleep(RETRY_AFTER)  # what the server's Retry-After asks for
+                continue
+            turn += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    return results, time.perf_counter() - start
+
+
+def percentile(samples: list, q: float) -> float:
+    if not samples:
+        return float("nan")
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sustained req/s and tail latency of the HTTP/SSE server")
+    parser.add_argument("--clients", nargs="+", type=int, default=[8, 64, 256])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per run")
+    parser.add_argument("--url", help="running server to target instead of the in-process app")
+    parser.add_argument("--max-concurrency", type=int, default=32)
+    parser.add_argument("--max-queue", type=int, default=256)
+    parser.add_argument("--queue-timeout", type=float, default=30.0)
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    parser.add_argument("--token-latency", type=float, default=0.002)
+    parser.add_argument("--search-latency", type=float, default=0.1)
+    args = parser.parse_args()
+
+    print(f"{'clients':>8}{'ok':>8}{'503':>7}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'ttft p50':>10}{'ttft p95':>10}")
+    for clients in args.clients:
+        if args.url:
+            request = http_client(args.url, clients)
+        else:
+            graph = build_graph(
+                "memory",
+                llm=FakeChatModel(latency=args.llm_latency, token_latency=args.token_latency),
+                tools=[FakeSearchTool(latency=args.search_latency)],
+                checkpointer=MemorySaver(),
+            )
+            app = GraphServer(
+                graph,
+                max_concurrency=args.max_concurrency,
+                max_queue=args.max_queue,
+                queue_timeout=args.queue_timeout,
+            )
+            request = in_process_client(app)
+
+        results, elapsed = asyncio.run(load(request, clients, args.duration))
+        ok = [r for r in results if r[0] == 200]
+        latencies = [r[2] for r in ok]
+        ttft = [r[1] for r in ok if r[1] is not None]
+        print(
+            f"{clients:>8}{len(ok):>8}{sum(r[0] == 503 for r in results):>7}"
+            f"{len(ok) / elapsed:>9.1f}"
+            f"{percentile(latencies, 0.50) * 1000:>9.0f}"
+            f"{percentile(latencies, 0.95) * 1000:>9.0f}"
+            f"{percentile(latencies, 0.99) * 1000:>9.0f}"
+            f"{percentile(ttft, 0.50) * 1000:>10.0f}"
+            f"{percentile(ttft, 0.95) * 1000:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
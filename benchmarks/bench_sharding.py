@@ -0,0 +1,146 @@
+# ---------------------------------------------------
+# Throughput and rebalancing of the sharded runtime
+# ---------------------------------------------------
+# 1. Scaling: `ShardRouter` with 1, 2, 4, ... worker processes serving the
+#    fake LLM with no latency, so every turn is pure graph CPU work (the case
+#    a single process cannot scale). Reports sustained turns per second
+#    against one in-process `GraphServer`, and the speedup per worker count.
+#    Scaling is bounded by the cores available (printed first).
+# 2. Rebalancing: sessions are spread over 3 workers, a 4th is added, then
+#    one is removed, with a turn on every session after each change. Reports
+#    the fraction of sessions that moved (ideal: 1/4, then the removed
+#    worker's share) and whether every conversation continued with its full
+#    history (answers compared with an unsharded reference run).
+#
+# Usage (from the project root):
+#     python benchmarks/bench_sharding.py --workers 1 2 4 --duration 10
+#     python benchmarks/bench_sharding.py --sessions 500 --skip-scaling
+import argparse
+import asyncio
+import functools
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from langgraph.checkpoint.memory import MemorySaver
+
+from langgraph_playground.fakes import FakeChatModel, FakeSearchTool
+from langgraph_playground.graph import build_graph
+from langgraph_playground.server import GraphServer
+from langgraph_playground.sharding import ShardRouter
+
+QUESTIONS = [
+    "What's a 'node' in LangGraph?",
+    "Search the latest LangGraph release notes.",
+    "Great, summarize that in one sentence.",
+]
+
+
+def fake_server(llm_latency: float = 0.0) -> GraphServer:
+    # Module level so that spawned workers can unpickle it
+    graph = build_graph(
+        "memory",
+        llm=FakeChatModel(latency=llm_latency),
+        tools=[FakeSearchTool(latency=0.0)],
+        checkpointer=MemorySaver(),
+    )
+    return GraphServer(graph, max_concurrency=64, max_queue=4096)
+
+
+async def direct(server: GraphServer, thread_id: str, message: str) -> dict:
+    # The in-process baseline: same work as a worker's JSON turn
+    inputs = {"messages": [{"role": "user", "content": message}]}
+    state = await server.graph.ainvoke(inputs, {"configurable": {"thread_id": thread_id}})
+    return {"thread_id": thread_id, "answer": state["messages"][-1].content}
+
+
+# --- 1. Scaling ---
+async def load(run, clients: int, duration: float) -> float:
+    done = 0
+    deadline = time.perf_counter() + duration
+
+    async def client(i: int):
+        nonlocal done
+        turn = 0
+        while time.perf_counter() < deadline:
+            await run(f"load-{i}", QUESTIONS[turn % len(QUESTIONS)])
+            done += 1
+            turn += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    return done / (time.perf_counter() - start)
+
+
+async def scaling(worker_counts: list, clients: int, duration: float, llm_latency: float) -> None:
+    server = fake_server(llm_latency)
+    baseline = await load(functools.partial(direct, server), clients, duration)
+    print(f"{'setup':>22}{'turns/s':>10}{'speedup':>9}")
+    print(f"{'1 process, no router':>22}{baseline:>10.1f}{1.0:>8.2f}x")
+    for workers in worker_counts:
+        router = ShardRouter(workers, server_factory=functools.partial(fake_server, llm_latency))
+        await router.start()
+        try:
+            rate = await load(router.run, clients, duration)
+        finally:
+            await router.stop()
+        print(f"{f'{workers} worker(s) + router':>22}{rate:>10.1f}{rate / baseline:>8.2f}x")
+
+
+# --- 2. Rebalancing ---
+async def turn_all(run, sessions: int, question: str) -> dict:
+    results = await asyncio.gather(*(run(f"s{i}", question) for i in range(sessions)))
+    return {r["thread_id"]: r["answer"] for r in results}
+
+
+def owners(router: ShardRouter) -> dict:
+    return {t: name for name, worker in router.workers.items() for t in worker.threads}
+
+
+async def rebalancing(sessions: int) -> None:
+    reference = fake_server()
+    router = ShardRouter(3, server_factory=fake_server)
+    await router.start()
+    try:
+        steps = [("3 workers", None), ("add a worker", router.add_worker), ("remove w0", lambda: router.remove_worker("w0"))]
+        print(f"{'step':>14}{'moved':>8}{'moved %':>9}{'pause ms':>10}{'history kept':>14}")
+        for step, (label, change) in enumerate(steps):
+            before = owners(router)
+            start = time.perf_counter()
+            if change is not None:
+                await change()
+            pause = (time.perf_counter() - start) * 1000
+            moved = sum(before[t] != owner for t, owner in owners(router).items() if t in before)
+            # The fake's answer depends on the conversation length: lost history shows
+            question = QUESTIONS[step % len(QUESTIONS)]
+            expected = await turn_all(functools.partial(direct, reference), sessions, question)
+            answers = await turn_all(router.run, sessions, question)
+            kept = sum(answers[t] == expected[t] for t in expected)
+            print(f"{label:>14}{moved:>8}{moved / sessions:>9.0%}{pause:>10.0f}{f'{kept}/{sessions}':>14}")
+        sizes = {name: len(worker.threads) for name, worker in router.workers.items()}
+        print(f"sessions per worker: {sizes}")
+    finally:
+        await router.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Throughput and rebalancing of the sharded runtime")
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=64, help="concurrent sessions in the scaling runs")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per scaling run")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="0 = CPU-bound turns")
+    parser.add_argument("--sessions", type=int, default=200, help="sessions in the rebalancing run")
+    parser.add_argument("--skip-scaling", action="store_true")
+    args = parser.parse_args()
+
+    print(f"cores available: {os.cpu_count()}\n")
+    if not args.skip_scaling:
+        asyncio.run(scaling(args.workers, args.clients, args.duration, args.llm_latency))
+        print()
+    asyncio.run(rebalancing(args.sessions))
+
+
+if __name__ == "__main__":
+    main()
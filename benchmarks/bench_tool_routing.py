@@ -0,0 +1,148 @@
+# ---------------------------------------------------
+# Tool routing: search-call rate and turn latency with and without gating
+# ---------------------------------------------------
+# Replays a labelled question set (each question marked as needing the web or
+# not) through the web graph with the fake LLM and search tool, once with the
+# tools bound on every call (the chatbots' default) and once with tool
+# routing (`build_graph(..., tool_routing=True)`), and reports:
+#
+# - searches per turn, unneeded searches (on questions that need no web) and
+#   missed ones (questions that need the web, answered without a search),
+# - mean and p95 turn latency, and the tool-schema tokens sent to the model,
+# - precision/recall of the intent predicates alone against the labels:
+#   `SearchIntent` (rules + classifier) and the plain `looks_like_search`
+#   keyword check.
+#
+# The fake model decides to search with its own keyword list ("what", "who",
+# ...), like a real model that sometimes searches for no reason; tool routing
+# can only prevent searches, never start one.
+#
+# Usage (from the project root):
+#     python benchmarks/bench_tool_routing.py --sessions 3 --search-latency 0.5
+#     python benchmarks/bench_tool_routing.py --queries my_queries.jsonl   # {"text": ..., "search": true|false}
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from langchain_core.messages import AIMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from langgraph.checkpoint.memory import MemorySaver
+
+from langgraph_playground.fakes import FakeChatModel, FakeSearchTool
+from langgraph_playground.graph import build_graph, components
+from langgraph_playground.prefetch import looks_like_search
+from langgraph_playground.routing import SearchIntent
+
+# (question, needs the web)
+QUESTIONS = [
+    ("Hi! I'm learning LangGraph.", False),
+    ("What is a StateGraph?", False),
+    ("What is the latest LangGraph release?", True),
+    ("What does a checkpointer do?", False),
+    ("Who won the 2022 World Cup?", True),
+    ("Great, summarize that in one sentence.", False),
+    ("What's the weather in Lisbon right now?", True),
+    ("Where should I put the summarize node in my graph?", False),
+    ("Who is the CEO of Nvidia?", True),
+    ("When should I use a conditional edge?", False),
+    ("Search for news about LangChain today", True),
+    ("What is the difference between invoke and stream?", False),
+    ("How much does a Raspberry Pi 5 cost?", True),
+    ("Write a haiku about graphs.", False),
+    ("What is the population of Japan?", True),
+    ("What did I ask you first?", False),
+    ("Quem ganhou o último Oscar de melhor filme?", True),
+    ("O que é um nó no LangGraph?", False),
+    ("Quais são as notícias de hoje sobre IA?", True),
+    ("Explique o que é recursão.", False),
+    ("When was Python 3.12 released?", True),
+    ("Who invented the binary search algorithm, roughly?", False),
+    ("Thank you, that's all.", False),
+]
+
+
+def load_queries(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [(row["text"], bool(row["search"])) for row in (json.loads(line) for line in f if line.strip())]
+
+
+def run(questions: list, tool_routing: bool, args) -> dict:
+    tool = FakeSearchTool(latency=args.search_latency)
+    graph = build_graph(
+        "web",
+        llm=FakeChatModel(latency=args.llm_latency),
+        tools=[tool],
+        checkpointer=MemorySaver(),
+        tool_routing=tool_routing,
+    )
+    schema_tokens = count_tokens_approximately([json.dumps(convert_to_openai_tool(tool))])
+    turns, searches, unneeded, missed, bound_calls = [], 0, 0, 0, 0
+    for session in range(args.sessions):
+        config = {"configurable": {"thread_id": f"replay-{session}"}}
+        seen = 0
+        for question, needs_web in questions:
+            start = time.perf_counter()
+            state = graph.invoke({"messages": [{"role": "user", "content": question}]}, config)
+            turns.append(time.perf_counter() - start)
+            new = state["messages"][seen + 1:]
+            seen = len(state["messages"])
+            searched = any(m.type == "tool" for m in new)
+            searches += searched
+            unneeded += searched and not needs_web
+            missed += needs_web and not searched
+            calls = sum(isinstance(m, AIMessage) for m in new)
+            if not tool_routing or state["route"].endswith("+tools"):
+                bound_calls += calls
+    return {
+        "turns": len(turns),
+        "searches": searches,
+        "unneeded": unneeded,
+        "missed": missed,
+        "mean": statistics.mean(turns),
+        "p95": sorted(turns)[int(0.95 * (len(turns) - 1))],
+        "schema_tokens": bound_calls * schema_tokens,
+        "router": components(graph).router,
+    }
+
+
+def precision_recall(predicate, questions: list) -> tuple:
+    predicted = [(predicate(text), needs_web) for text, needs_web in questions]
+    tp = sum(p and n for p, n in predicted)
+    return tp / max(1, sum(p for p, _ in predicted)), tp / max(1, sum(n for _, n in predicted))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Search-call rate and turn latency with and without tool routing")
+    parser.add_argument("--queries", help="JSONL file of {'text': ..., 'search': bool} to replay instead of the built-in set")
+    parser.add_argument("--sessions", type=int, default=3)
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--search-latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    questions = load_queries(args.queries) if args.queries else QUESTIONS
+    print(f"{len(questions)} questions x {args.sessions} sessions, {sum(n for _, n in questions)} need the web\n")
+    print(f"{'setup':>14}{'search/turn':>13}{'unneeded':>10}{'missed':>8}{'mean ms':>9}{'p95 ms':>9}{'schema tok':>12}")
+    for label, tool_routing in (("always bound", False), ("tool routing", True)):
+        r = run(questions, tool_routing, args)
+        print(
+            f"{label:>14}{r['searches'] / r['turns']:>13.2f}{r['unneeded']:>10}{r['missed']:>8}"
+            f"{r['mean'] * 1000:>9.0f}{r['p95'] * 1000:>9.0f}{r['schema_tokens']:>12}"
+        )
+        if r["router"]:
+            intent = r["router"].tools_when
+            print(f"{'':>14}{intent.report()}")
+
+    print()
+    for label, predicate in (("SearchIntent", SearchIntent()), ("looks_like_search", looks_like_search)):
+        precision, recall = precision_recall(predicate, questions)
+        print(f"{label:>18}: precision {precision:.0%}, recall {recall:.0%}")
+
+
+if __name__ == "__main__":
+    main()
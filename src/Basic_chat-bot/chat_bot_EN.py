@@ -1,77 +1,53 @@
 # Imports standard libraries
 import os
-import getpass
-from dotenv import load_dotenv  # Library to load environment variables from a .env file
+import sys
+
+# Makes the shared `langgraph_playground` package (in src/) importable
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langgraph_playground.graph import build_graph, load_env
 #---------------------------------------------------
 '''
 Section to load the PROJECT API keys
 '''
 #---------------------------------------------------
-# Loads the variables from the .env file 
-load_dotenv()
-
-# Helper function to request environment variables via terminal if not already set
-def _set_env(var: str):
-    if not os.environ.get(var): 
-        os.environ[var] = getpass.getpass(f"{var}: ")
-
-# Checks if the Together.ai key was loaded correctly
-if not os.getenv("TOGETHER_API_KEY"):
-    raise EnvironmentError("The TOGETHER_API_KEY was not found. Check your .env file.")
-
-# Assigns the key to the variable
-api_key = os.getenv("TOGETHER_API_KEY")
-print("Key loaded successfully!" if api_key else "Error: key not loaded.")
+# Loads the variables from the .env file and checks if the Together.ai key was loaded
+load_env(require=("TOGETHER_API_KEY",))
+print("Key loaded successfully!")
 
 
 #---------------------------------------------------
 #---------------------------------------------------
-# Typing and tools for creating state graphs
-from typing import Annotated 
-from typing_extensions import TypedDict
-from langgraph.graph import StateGraph, START, END
-from langgraph.graph.message import add_messages
-
-# Defines the state type
-class State(TypedDict): 
-    messages: Annotated[list, add_messages]
-
-# Creates the graph builder
-graph_builder = StateGraph(State) # defines the graph type as a machine state
+# Builds the graph: START -> chatbot -> END
+# The chatbot node receives the state and returns a dictionary containing a new
+# list of messages under the 'messages' key, produced by the ChatTogether LLM
+# (temperature=0: same input returns same output).
+# The LLM client is only created here, on first use (see src/langgraph_playground/graph.py)
+graph = build_graph("basic")
 #---------------------------------------------------
 #---------------------------------------------------
 
-
-# Used to connect with a specific LLM
-from langchain_together import ChatTogether
-
-
-llm = ChatTogether(
-    model="meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo-classifier", # Model name
-    together_api_key=api_key, # API key
-    temperature=0 # makes the model more deterministic — same input returns same output
-)
-# Defines the chatbot node
-# This function is called when the node is activated and receives a state as input,
-# then returns a dictionary containing a new list of messages under the 'messages' key. 
-# (Basic pattern for LangGraph node functions)
-def chatbot(state: State):
-    return {"messages": [llm.invoke(state["messages"])]} 
-
-# Adds the node and connections
-graph_builder.add_node("chatbot", chatbot) # The first argument is the node name, the second is the function called when the node is activated
-# Adds the start and end nodes
-graph_builder.add_edge(START, "chatbot")
-graph_builder.add_edge("chatbot", END)
-
-# Compiles the graph
-graph = graph_builder.compile()
-
 # Function to execute the graph
 def stream_graph_updates(user_input: str):
-    for event in graph.stream({"messages": [{"role": "user", "content": user_input}]}):
-        for value in event.values():
-            print("Assistant:", value["messages"][-1].content)
+    # stream_mode="messages" yields (token, metadata) pairs as the LLM generates them,
+    # so the answer is printed as soon as the first token arrives
+    current_id = None
+    for chunk, metadata in graph.stream(
+        {"messages": [{"role": "user", "content": user_input}]},
+        stream_mode="messages"
+    ):
+        # Only the chatbot node produces tokens; tool outputs are skipped
+        if metadata.get("langgraph_node") != "chatbot" or not chunk.content:
+            continue
+        # A new message id means a new LLM call (e.g. after the tools -> chatbot loop)
+        if chunk.id != current_id:
+            if current_id is not None:
+                print()
+            print("Assistant: ", end="", flush=True)
+            current_id = chunk.id
+        print(chunk.content, end="", flush=True)
+    if current_id is not None:
+        print()
 
 # Terminal loop
 while True:
@@ -81,8 +57,15 @@ while True:
             print("Goodbye!")
             break
         stream_graph_updates(user_input)
-    except:
+    except EOFError:
+        # No interactive input (e.g. stdin closed): ask one sample question and stop
         user_input = "What do you know about LangGraph?"
         print("User: " + user_input)
         stream_graph_updates(user_input)
         break
+    except KeyboardInterrupt:
+        print("\nGoodbye!")
+        break
+    except Exception as exc:
+        # Upstream failures (timeout, retries exhausted, circuit open) end the turn, not the chat
+        print(f"\nError: {exc}")
@@ -1,88 +1,45 @@
 # --- Standard Library Imports ---
 import os
-import getpass
-from dotenv import load_dotenv  # Library to load environment variables from a .env file
+import sys
 
-# --- Load Project API Keys ---
-env_path = os.path.join(os.getcwd(), "config", ".env")  # Path to the .env file
-load_dotenv(dotenv_path=env_path)
-
-# Function to request environment variables from terminal if not set
-def _set_env(var: str):
-    if not os.environ.get(var): 
-        os.environ[var] = getpass.getpass(f"{var}: ")
-
-# Check if Together API key is loaded
-if not os.getenv("TOGETHER_API_KEY"):
-    raise EnvironmentError("TOGETHER_API_KEY not found. Check your .env file.")
-
-# Check if Tavily API key is loaded
-if not os.getenv("TAVILY_API_KEY"):
-    raise EnvironmentError("TAVILY_API_KEY not found. Check your .env file.")
-
-# Assign API keys to variables
-api_key = os.getenv("TOGETHER_API_KEY")
-print("Together API key loaded!" if api_key else "Error: Together API key not loaded.")
-
-api_key_1 = os.getenv("TAVILY_API_KEY")
-print("Tavily API key loaded!" if api_key_1 else "Error: Tavily API key not loaded.")
-
-# --- Define External Tools ---
-from langchain_community.tools.tavily_search import TavilySearchResults
-
-tool = TavilySearchResults(max_results=2)
-tools = [tool]
-tool.invoke("What's a 'node' in LangGraph?")
-
-# --- Typing and Graph Tools ---
-from typing import Annotated 
-from typing_extensions import TypedDict
-from langgraph.graph import StateGraph, START, END
-from langgraph.graph.message import add_messages
-from langgraph.prebuilt import ToolNode, tools_condition
+# Makes the shared `langgraph_playground` package (in src/) importable
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Define the state type
-class State(TypedDict): 
-    messages: Annotated[list, add_messages]
+from langgraph_playground.graph import build_graph, load_env
 
-# Create the graph builder
-graph_builder = StateGraph(State)
-
-# --- Language Model Setup ---
-from langchain_together import ChatTogether
-
-llm = ChatTogether(
-    model="meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo-classifier",
-    together_api_key=api_key,
-    temperature=0  # More deterministic: same input gives same output
-)
-llm_with_tools = llm.bind_tools(tools)
-
-# --- Define the LangGraph Nodes ---
-# This function is called when the chatbot node is active
-def chatbot(state: State):
-    return {"messages": [llm_with_tools.invoke(state["messages"])]}
-
-# Add chatbot node
-graph_builder.add_node("chatbot", chatbot)
-
-# Add tool node
-tool_node = ToolNode(tools=[tool])
-graph_builder.add_node("tools", tool_node)
-
-# Define transitions
-graph_builder.add_conditional_edges("chatbot", tools_condition)
-graph_builder.add_edge("tools", "chatbot")  # Return to chatbot after using a tool
-graph_builder.set_entry_point("chatbot")
+# --- Load Project API Keys ---
+# Loads config/.env and checks the Together and Tavily API keys
+load_env(require=("TOGETHER_API_KEY", "TAVILY_API_KEY"))
+print("Together and Tavily API keys loaded!")
 
-# Compile the graph
-graph = graph_builder.compile()
+# --- Build the Graph ---
+# chatbot node: ChatTogether LLM with the Tavily search tool bound to it
+# tools node: runs the searches the LLM asked for, then returns to the chatbot
+# (tools_condition routes chatbot -> tools when there are tool calls, otherwise ends)
+# Clients are only created here, on first use (see src/langgraph_playground/graph.py)
+graph = build_graph("web")
 
 # --- Runtime Function ---
 def stream_graph_updates(user_input: str):
-    for event in graph.stream({"messages": [{"role": "user", "content": user_input}]}):
-        for value in event.values():
-            print("Assistant:", value["messages"][-1].content)
+    # stream_mode="messages" yields (token, metadata) pairs as the LLM generates them,
+    # so the answer is printed as soon as the first token arrives
+    current_id = None
+    for chunk, metadata in graph.stream(
+        {"messages": [{"role": "user", "content": user_input}]},
+        stream_mode="messages"
+    ):
+        # Only the chatbot node produces tokens; tool outputs are skipped
+        if metadata.get("langgraph_node") != "chatbot" or not chunk.content:
+            continue
+        # A new message id means a new LLM call (e.g. after the tools -> chatbot loop)
+        if chunk.id != current_id:
+            if current_id is not None:
+                print()
+            print("Assistant: ", end="", flush=True)
+            current_id = chunk.id
+        print(chunk.content, end="", flush=True)
+    if current_id is not None:
+        print()
 
 # --- Main Loop ---
 while True:
@@ -92,8 +49,15 @@ while True:
             print("Goodbye!")
             break
         stream_graph_updates(user_input)
-    except:
+    except EOFError:
+        # No interactive input (e.g. stdin closed): ask one sample question and stop
         user_input = "What do you know about LangGraph?"
         print("User: " + user_input)
         stream_graph_updates(user_input)
         break
+    except KeyboardInterrupt:
+        print("\nGoodbye!")
+        break
+    except Exception as exc:
+        # Upstream failures (timeout, retries exhausted, circuit open) end the turn, not the chat
+        print(f"\nError: {exc}")
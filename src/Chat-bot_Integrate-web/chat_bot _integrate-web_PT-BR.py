@@ -2,109 +2,52 @@
 # Importações de bibliotecas padrão
 # ---------------------------------------------------
 import os
-import getpass
-from dotenv import load_dotenv  # Biblioteca para carregar variáveis de ambiente de um arquivo .env
+import sys
 
-# ---------------------------------------------------
-# Carregamento das chaves de API do projeto
-# ---------------------------------------------------
-# Define o caminho para o arquivo .env
-path_env = os.path.join(os.getcwd(), "config", ".env")
-load_dotenv(dotenv_path=path_env)
-
-# Função auxiliar para solicitar variáveis de ambiente pelo terminal, caso não estejam definidas
-def _set_env(var: str):
-    if not os.environ.get(var): 
-        os.environ[var] = getpass.getpass(f"{var}: ")
+# Torna o pacote compartilhado `langgraph_playground` (em src/) importável
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Verifica se a chave da Together.ai foi carregada corretamente
-if not os.getenv("TOGETHER_API_KEY"):
-    raise EnvironmentError("TOGETHER_API_KEY não encontrada. Verifique seu arquivo .env.")
+from langgraph_playground.graph import build_graph, load_env
 
-# Verifica se a chave da Tavily foi carregada corretamente
-if not os.getenv("TAVILY_API_KEY"):
-    raise EnvironmentError("TAVILY_API_KEY não encontrada. Verifique seu arquivo .env.")
-
-# Armazena as chaves em variáveis
-api_key = os.getenv("TOGETHER_API_KEY")
-print("Chave TOGETHER_API_KEY carregada com sucesso!" if api_key else "Erro ao carregar a chave.")
-
-api_key_1 = os.getenv("TAVILY_API_KEY")
-print("Chave TAVILY_API_KEY carregada com sucesso!" if api_key_1 else "Erro ao carregar a chave.")
-
-# ---------------------------------------------------
-# Definição da ferramenta para o chatbot
 # ---------------------------------------------------
-from langchain_community.tools.tavily_search import TavilySearchResults
-
-tool = TavilySearchResults(max_results=2)
-tools = [tool]
-
-# Teste da ferramenta (pode ser removido em produção)
-tool.invoke("What's a 'node' in LangGraph?")
-
-# ---------------------------------------------------
-# Tipagem e ferramentas para criação do grafo de estados
-# ---------------------------------------------------
-from typing import Annotated 
-from typing_extensions import TypedDict
-from langgraph.graph import StateGraph
-from langgraph.graph.message import add_messages
-from langgraph.prebuilt import ToolNode, tools_condition
-
-# Define o tipo de estado que será passado entre os nós do grafo
-class State(TypedDict): 
-    messages: Annotated[list, add_messages]
-
-# Cria o construtor do grafo com base no tipo definido
-graph_builder = StateGraph(State)
-
-# ---------------------------------------------------
-# Definição do modelo de linguagem
-# ---------------------------------------------------
-from langchain_together import ChatTogether
-
-llm = ChatTogether(
-    model="meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo-classifier",
-    together_api_key=api_key,
-    temperature=0  # saída determinística: mesmo input gera mesmo output
-)
-
-# Conecta as ferramentas ao modelo
-llm_with_tools = llm.bind_tools(tools)
-
-# ---------------------------------------------------
-# Função do nó principal do chatbot
+# Carregamento das chaves de API do projeto
 # ---------------------------------------------------
-def chatbot(state: State):
-    return {"messages": [llm_with_tools.invoke(state["messages"])]} 
+# Carrega config/.env e verifica as chaves da Together e da Tavily
+load_env(require=("TOGETHER_API_KEY", "TAVILY_API_KEY"))
+print("Chaves TOGETHER_API_KEY e TAVILY_API_KEY carregadas com sucesso!")
 
 # ---------------------------------------------------
 # Montagem do grafo de estados
 # ---------------------------------------------------
-graph_builder.add_node("chatbot", chatbot)
-
-tool_node = ToolNode(tools=[tool])
-graph_builder.add_node("tools", tool_node)
-
-graph_builder.add_conditional_edges("chatbot", tools_condition)
-
-# Sempre que uma ferramenta for chamada, voltamos ao chatbot
-graph_builder.add_edge("tools", "chatbot")
-
-# Define o ponto de entrada do grafo
-graph_builder.set_entry_point("chatbot")
-
-# Compila o grafo
-graph = graph_builder.compile()
+# nó chatbot: LLM ChatTogether com a ferramenta de busca Tavily conectada
+# nó tools: executa as buscas pedidas pela LLM e volta para o chatbot
+# (tools_condition leva do chatbot para tools quando há chamadas de ferramenta, senão encerra)
+# Os clientes só são criados aqui, no primeiro uso (veja src/langgraph_playground/graph.py)
+graph = build_graph("web")
 
 # ---------------------------------------------------
 # Função para executar o grafo com entrada do usuário
 # ---------------------------------------------------
 def stream_graph_updates(user_input: str):
-    for event in graph.stream({"messages": [{"role": "user", "content": user_input}]}):
-        for value in event.values():
-            print("Assistant:", value["messages"][-1].content)
+    # stream_mode="messages" retorna pares (token, metadata) conforme a LLM gera o texto,
+    # então a resposta é exibida assim que o primeiro token chega
+    current_id = None
+    for chunk, metadata in graph.stream(
+        {"messages": [{"role": "user", "content": user_input}]},
+        stream_mode="messages"
+    ):
+        # Apenas o nó chatbot gera tokens; as saídas das ferramentas são ignoradas
+        if metadata.get("langgraph_node") != "chatbot" or not chunk.content:
+            continue
+        # Um novo id de mensagem indica uma nova chamada à LLM (ex.: após o ciclo tools -> chatbot)
+        if chunk.id != current_id:
+            if current_id is not None:
+                print()
+            print("Assistant: ", end="", flush=True)
+            current_id = chunk.id
+        print(chunk.content, end="", flush=True)
+    if current_id is not None:
+        print()
 
 # ---------------------------------------------------
 # Loop de execução via terminal
@@ -116,8 +59,15 @@ while True:
             print("Goodbye!")
             break
         stream_graph_updates(user_input)
-    except:
+    except EOFError:
+        # Sem entrada interativa (ex.: stdin fechado): faz uma pergunta de exemplo e encerra
         user_input = "What do you know about LangGraph?"
         print("User: " + user_input)
         stream_graph_updates(user_input)
         break
+    except KeyboardInterrupt:
+        print("\nGoodbye!")
+        break
+    except Exception as exc:
+        # Falhas dos provedores (timeout, tentativas esgotadas, circuito aberto) encerram o turno, não o chat
+        print(f"\nError: {exc}")
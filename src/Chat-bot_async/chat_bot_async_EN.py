@@ -0,0 +1,50 @@
+# ---------------------------------------------------
+# Import of standard libraries
+# ---------------------------------------------------
+import os
+import sys
+import time
+import asyncio
+
+# Makes the shared `langgraph_playground` package (in src/) importable
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langgraph_playground.graph import build_graph, load_env
+from langgraph_playground.async_driver import run_sessions
+
+# ---------------------------------------------------
+# Loading the project's API keys
+# ---------------------------------------------------
+load_env(require=("TOGETHER_API_KEY", "TAVILY_API_KEY"))
+
+# ---------------------------------------------------
+# Memory graph, driven asynchronously
+# ---------------------------------------------------
+# The graph nodes also have async paths: under ainvoke the chatbot node awaits
+# llm.ainvoke and the tools node awaits every tool call with asyncio.gather
+graph = build_graph("memory")
+
+# ---------------------------------------------------
+# Runs several conversations (thread_ids) at the same time
+# ---------------------------------------------------
+# Number of simultaneous sessions, e.g. `SESSIONS=200 python chat_bot_async_EN.py`
+n_sessions = int(os.getenv("SESSIONS", "10"))
+
+sessions = {
+    f"session-{i}": [
+        "Hi! My name is user " + str(i) + ".",
+        "What do you know about LangGraph?",
+        "What is my name?",
+    ]
+    for i in range(n_sessions)
+}
+
+start = time.perf_counter()
+answers = asyncio.run(run_sessions(graph, sessions))
+elapsed = time.perf_counter() - start
+
+for thread_id, replies in answers.items():
+    print(f"[{thread_id}] Assistant:", replies[-1])
+
+turns = sum(len(inputs) for inputs in sessions.values())
+print(f"{n_sessions} sessions / {turns} turns in {elapsed:.2f}s ({turns / elapsed:.2f} turns/s)")
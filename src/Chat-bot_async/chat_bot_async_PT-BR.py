@@ -0,0 +1,50 @@
+# ---------------------------------------------------
+# Importações de bibliotecas padrão
+# ---------------------------------------------------
+import os
+import sys
+import time
+import asyncio
+
+# Torna o pacote compartilhado `langgraph_playground` (em src/) importável
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langgraph_playground.graph import build_graph, load_env
+from langgraph_playground.async_driver import run_sessions
+
+# ---------------------------------------------------
+# Carregamento das chaves de API do projeto
+# ---------------------------------------------------
+load_env(require=("TOGETHER_API_KEY", "TAVILY_API_KEY"))
+
+# ---------------------------------------------------
+# Grafo com memória, executado de forma assíncrona
+# ---------------------------------------------------
+# Os nós do grafo também têm caminhos assíncronos: com ainvoke o nó chatbot aguarda
+# llm.ainvoke e o nó tools aguarda todas as chamadas de ferramenta com asyncio.gather
+graph = build_graph("memory")
+
+# ---------------------------------------------------
+# Executa várias conversas (thread_ids) ao mesmo tempo
+# ---------------------------------------------------
+# Número de sessões simultâneas, ex.: `SESSIONS=200 python chat_bot_async_PT-BR.py`
+n_sessions = int(os.getenv("SESSIONS", "10"))
+
+sessions = {
+    f"session-{i}": [
+        "Olá! Meu nome é usuário " + str(i) + ".",
+        "O que você sabe sobre LangGraph?",
+        "Qual é o meu nome?",
+    ]
+    for i in range(n_sessions)
+}
+
+start = time.perf_counter()
+answers = asyncio.run(run_sessions(graph, sessions))
+elapsed = time.perf_counter() - start
+
+for thread_id, replies in answers.items():
+    print(f"[{thread_id}] Assistant:", replies[-1])
+
+turns = sum(len(inputs) for inputs in sessions.values())
+print(f"{n_sessions} sessões / {turns} turnos em {elapsed:.2f}s ({turns / elapsed:.2f} turnos/s)")
@@ -2,144 +2,76 @@
 # Import of standard libraries
 # ---------------------------------------------------
 import os
-import getpass
-from dotenv import load_dotenv  # Library to load environment variables from a .env file
+import sys
 
-# ---------------------------------------------------
-# Loading the project's API keys
-# ---------------------------------------------------
-# Sets the path to the .env file
-path_env = os.path.join(os.getcwd(), "config", ".env")
-load_dotenv(dotenv_path=path_env)
-
-# Helper function to request environment variables from the terminal if not set
-def _set_env(var: str):
-    if not os.environ.get(var): 
-        os.environ[var] = getpass.getpass(f"{var}: ")
-
-# Checks if the Together.ai key was loaded correctly
-if not os.getenv("TOGETHER_API_KEY"):
-    raise EnvironmentError("TOGETHER_API_KEY not found. Check your .env file.")
-
-# Checks if the Tavily key was loaded correctly
-if not os.getenv("TAVILY_API_KEY"):
-    raise EnvironmentError("TAVILY_API_KEY not found. Check your .env file.")
-
-# Stores the keys in variables
-api_key = os.getenv("TOGETHER_API_KEY")
-print("TOGETHER_API_KEY loaded successfully!" if api_key else "Error loading the key.")
-
-api_key_1 = os.getenv("TAVILY_API_KEY")
-print("TAVILY_API_KEY loaded successfully!" if api_key_1 else "Error loading the key.")
+# Makes the shared `langgraph_playground` package (in src/) importable
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# ---------------------------------------------------
-# Definition of the tool for the chatbot
-# ---------------------------------------------------
-from langchain_community.tools.tavily_search import TavilySearchResults
-
-tool = TavilySearchResults(max_results=2)
-tools = [tool]
-
-# Tool test (can be removed in production)
-tool.invoke("What's a 'node' in LangGraph?")
+from langgraph_playground.graph import build_graph, default_checkpointer, load_env
+from langgraph_playground.instrumentation import GraphMetrics, MeasuredCheckpointer, instrument, serve_prometheus
+from langgraph_playground.resilience import UPSTREAM_METRICS
 
 # ---------------------------------------------------
-# Typing and tools for creating the state graph
-# ---------------------------------------------------
-from typing import Annotated 
-from typing_extensions import TypedDict
-
-from langgraph.checkpoint.memory import MemorySaver
-from langgraph.graph import StateGraph
-from langgraph.graph.message import add_messages
-from langgraph.prebuilt import ToolNode, tools_condition
-
-# Defines the type of state that will be passed between graph nodes
-class State(TypedDict): 
-    messages: Annotated[list, add_messages]
-
-# Creates the graph builder based on the defined type
-graph_builder = StateGraph(State)
-
-# ---------------------------------------------------
-# Definition of the language model
-# ---------------------------------------------------
-from langchain_together import ChatTogether
-
-llm = ChatTogether(
-    model="meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo-classifier",
-    together_api_key=api_key,
-    temperature=0  # deterministic output: same input yields same output
-)
-
-# Connects tools to the model
-llm_with_tools = llm.bind_tools(tools)
-
-# ---------------------------------------------------
-# Function of the main chatbot node
+# Loading the project's API keys
 # ---------------------------------------------------
-def chatbot(state: State):
-    return {"messages": [llm_with_tools.invoke(state["messages"])]} 
+# Loads config/.env and checks the Together.ai and Tavily keys
+load_env(require=("TOGETHER_API_KEY", "TAVILY_API_KEY"))
+print("TOGETHER_API_KEY and TAVILY_API_KEY loaded successfully!")
 
 # ---------------------------------------------------
 # Assembling the state graph
 # ---------------------------------------------------
-graph_builder.add_node("chatbot", chatbot)
-
-tool_node = ToolNode(tools=[tool])
-graph_builder.add_node("tools", tool_node)
-
-graph_builder.add_conditional_edges(
-    "chatbot",
-    tools_condition)
-
-# Every time a tool is called, return to the chatbot
-graph_builder.add_edge("tools", "chatbot")
-
-# Defines the graph's entry point
-graph_builder.set_entry_point("chatbot")
-
-# Checkpoint
-memory = MemorySaver()
-
-# Compiles the graph
-graph = graph_builder.compile(checkpointer=memory)
+# Same chatbot <-> tools graph as the integrate-web example, plus:
+# - a checkpointer that stores each conversation by thread_id
+#   (in memory, or in SQLite when CHECKPOINT_DB=path/to/file.db is set, storing
+#   message deltas between checkpoints; CHECKPOINT_KEEP_LAST=50 prunes older ones);
+# - a `summarize` node at the start of each turn that keeps at most
+#   HISTORY_MAX_MESSAGES messages and folds older turns into a rolling summary;
+# - with LONG_TERM_MEMORY_DB=path/to/memories.db, a long-term memory shared by
+#   every thread of the same user_id: facts the user states ("my name is ...")
+#   are stored, and the most relevant ones are added to later prompts.
+# Clients are only created here, on first use (see src/langgraph_playground/graph.py)
+
+# Opt-in instrumentation: GRAPH_TRACE=trace.jsonl records per-node wall time, LLM
+# tokens, tool calls and checkpoint sizes per thread_id; METRICS_PORT=9464 also
+# exposes them, with the upstream retry/timeout counters, as Prometheus metrics
+# on http://localhost:9464/metrics
+metrics = None
+checkpointer = default_checkpointer()
+if os.getenv("GRAPH_TRACE") or os.getenv("METRICS_PORT"):
+    metrics = GraphMetrics(trace_path=os.getenv("GRAPH_TRACE"))
+    checkpointer = MeasuredCheckpointer(checkpointer, metrics)
+graph = build_graph("memory", checkpointer=checkpointer)
+if metrics:
+    graph = instrument(graph, metrics)
+    if os.getenv("METRICS_PORT"):
+        serve_prometheus(metrics, int(os.getenv("METRICS_PORT")), extra=(UPSTREAM_METRICS,))
 
 # ---------------------------------------------------
 # Function to execute the graph with user input
 # ---------------------------------------------------
-config = {"thread_id": "1"}
+config = {"thread_id": "1", "user_id": os.getenv("USER_ID", "default")}
 def stream_graph_updates(user_input: str):
-    # Gets the results from the graph stream with the necessary configuration
-    results = graph.stream(
+    # stream_mode="messages" yields (token, metadata) pairs as the LLM generates them,
+    # so the answer is printed as soon as the first token arrives
+    current_id = None
+    for chunk, metadata in graph.stream(
         {"messages": [{"role": "user", "content": user_input}]},
         config=config,
-        stream_mode='values'
-    )
-    
-    # Iterates through each result returned by the stream
-    for result in results:
-        # Checks if 'result' is a dict and contains the key "messages"
-        if isinstance(result, dict):
-            messages = result.get("messages", result)
-        # If it's a list, assumes it's the list of messages itself
-        elif isinstance(result, list):
-            messages = result
-        else:
-            messages = []
-        
-        # If there are no messages, skip to the next result
-        if not messages:
+        stream_mode="messages"
+    ):
+        # Only the chatbot node produces tokens; tool outputs are skipped
+        if metadata.get("langgraph_node") != "chatbot" or not chunk.content:
             continue
-        
-        # Gets the last message
-        last_msg = messages[-1]
-        # If the last message is a dict and has the "content" key, display its content
-        if isinstance(last_msg, dict) and "content" in last_msg:
-            print("Assistant:", last_msg["content"])
-        else:
-            # Otherwise, display the message directly (e.g., if it's a string)
-            print("Assistant:", last_msg)
+        # A new message id means a new LLM call (e.g. after the tools -> chatbot loop)
+        if chunk.id != current_id:
+            if current_id is not None:
+                print()
+            print("Assistant: ", end="", flush=True)
+            current_id = chunk.id
+        print(chunk.content, end="", flush=True)
+    if current_id is not None:
+        print()
 
 # ---------------------------------------------------
 # Execution loop via terminal
@@ -151,8 +83,15 @@ while True:
             print("Goodbye!")
             break
         stream_graph_updates(user_input)
-    except:
+    except EOFError:
+        # No interactive input (e.g. stdin closed): ask one sample question and stop
         user_input = "What do you know about LangGraph?"
         print("User: " + user_input)
         stream_graph_updates(user_input)
         break
+    except KeyboardInterrupt:
+        print("\nGoodbye!")
+        break
+    except Exception as exc:
+        # Upstream failures (timeout, retries exhausted, circuit open) end the turn, not the chat
+        print(f"\nError: {exc}")
@@ -2,144 +2,77 @@
 # Importações de bibliotecas padrão
 # ---------------------------------------------------
 import os
-import getpass
-from dotenv import load_dotenv  # Biblioteca para carregar variáveis de ambiente de um arquivo .env
+import sys
 
-# ---------------------------------------------------
-# Carregamento das chaves de API do projeto
-# ---------------------------------------------------
-# Define o caminho para o arquivo .env
-path_env = os.path.join(os.getcwd(), "config", ".env")
-load_dotenv(dotenv_path=path_env)
-
-# Função auxiliar para solicitar variáveis de ambiente pelo terminal, caso não estejam definidas
-def _set_env(var: str):
-    if not os.environ.get(var): 
-        os.environ[var] = getpass.getpass(f"{var}: ")
-
-# Verifica se a chave da Together.ai foi carregada corretamente
-if not os.getenv("TOGETHER_API_KEY"):
-    raise EnvironmentError("TOGETHER_API_KEY não encontrada. Verifique seu arquivo .env.")
-
-# Verifica se a chave da Tavily foi carregada corretamente
-if not os.getenv("TAVILY_API_KEY"):
-    raise EnvironmentError("TAVILY_API_KEY não encontrada. Verifique seu arquivo .env.")
-
-# Armazena as chaves em variáveis
-api_key = os.getenv("TOGETHER_API_KEY")
-print("Chave TOGETHER_API_KEY carregada com sucesso!" if api_key else "Erro ao carregar a chave.")
-
-api_key_1 = os.getenv("TAVILY_API_KEY")
-print("Chave TAVILY_API_KEY carregada com sucesso!" if api_key_1 else "Erro ao carregar a chave.")
+# Torna o pacote compartilhado `langgraph_playground` (em src/) importável
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# ---------------------------------------------------
-# Definição da ferramenta para o chatbot
-# ---------------------------------------------------
-from langchain_community.tools.tavily_search import TavilySearchResults
-
-tool = TavilySearchResults(max_results=2)
-tools = [tool]
-
-# Teste da ferramenta (pode ser removido em produção)
-tool.invoke("What's a 'node' in LangGraph?")
+from langgraph_playground.graph import build_graph, default_checkpointer, load_env
+from langgraph_playground.instrumentation import GraphMetrics, MeasuredCheckpointer, instrument, serve_prometheus
+from langgraph_playground.resilience import UPSTREAM_METRICS
 
 # ---------------------------------------------------
-# Tipagem e ferramentas para criação do grafo de estados
-# ---------------------------------------------------
-from typing import Annotated 
-from typing_extensions import TypedDict
-
-from langgraph.checkpoint.memory import MemorySaver
-from langgraph.graph import StateGraph
-from langgraph.graph.message import add_messages
-from langgraph.prebuilt import ToolNode, tools_condition
-
-# Define o tipo de estado que será passado entre os nós do grafo
-class State(TypedDict): 
-    messages: Annotated[list, add_messages]
-
-# Cria o construtor do grafo com base no tipo definido
-graph_builder = StateGraph(State)
-
-# ---------------------------------------------------
-# Definição do modelo de linguagem
-# ---------------------------------------------------
-from langchain_together import ChatTogether
-
-llm = ChatTogether(
-    model="meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo-classifier",
-    together_api_key=api_key,
-    temperature=0  # saída determinística: mesmo input gera mesmo output
-)
-
-# Conecta as ferramentas ao modelo
-llm_with_tools = llm.bind_tools(tools)
-
-# ---------------------------------------------------
-# Função do nó principal do chatbot
+# Carregamento das chaves de API do projeto
 # ---------------------------------------------------
-def chatbot(state: State):
-    return {"messages": [llm_with_tools.invoke(state["messages"])]} 
+# Carrega config/.env e verifica as chaves da Together.ai e da Tavily
+load_env(require=("TOGETHER_API_KEY", "TAVILY_API_KEY"))
+print("Chaves TOGETHER_API_KEY e TAVILY_API_KEY carregadas com sucesso!")
 
 # ---------------------------------------------------
 # Montagem do grafo de estados
 # ---------------------------------------------------
-graph_builder.add_node("chatbot", chatbot)
-
-tool_node = ToolNode(tools=[tool])
-graph_builder.add_node("tools", tool_node)
-
-graph_builder.add_conditional_edges(
-    "chatbot",
-    tools_condition)
-
-# Sempre que uma ferramenta for chamada, voltamos ao chatbot
-graph_builder.add_edge("tools", "chatbot")
-
-# Define o ponto de entrada do grafo
-graph_builder.set_entry_point("chatbot")
-
-# Ponto de verificação 
-memory = MemorySaver()
-
-# Compila o grafo
-graph = graph_builder.compile(checkpointer=memory)
+# Mesmo grafo chatbot <-> tools do exemplo integrate-web, mais:
+# - um checkpointer que guarda cada conversa por thread_id
+#   (em memória, ou em SQLite quando CHECKPOINT_DB=caminho/arquivo.db está definida,
+#   guardando só as diferenças de mensagens entre checkpoints; CHECKPOINT_KEEP_LAST=50
+#   apaga os mais antigos);
+# - um nó `summarize` no início de cada turno que mantém no máximo
+#   HISTORY_MAX_MESSAGES mensagens e resume os turnos antigos;
+# - com LONG_TERM_MEMORY_DB=caminho/memorias.db, uma memória de longo prazo
+#   compartilhada por todas as threads do mesmo user_id: os fatos que o usuário
+#   informa ("meu nome é ...") são guardados e os mais relevantes entram nos prompts seguintes.
+# Os clientes só são criados aqui, no primeiro uso (veja src/langgraph_playground/graph.py)
+
+# Instrumentação opcional: GRAPH_TRACE=trace.jsonl registra o tempo de cada nó, os
+# tokens da LLM, as chamadas de ferramenta e o tamanho dos checkpoints por thread_id;
+# METRICS_PORT=9464 também expõe as métricas, com os contadores de retry/timeout dos
+# provedores, no formato Prometheus em http://localhost:9464/metrics
+metrics = None
+checkpointer = default_checkpointer()
+if os.getenv("GRAPH_TRACE") or os.getenv("METRICS_PORT"):
+    metrics = GraphMetrics(trace_path=os.getenv("GRAPH_TRACE"))
+    checkpointer = MeasuredCheckpointer(checkpointer, metrics)
+graph = build_graph("memory", checkpointer=checkpointer)
+if metrics:
+    graph = instrument(graph, metrics)
+    if os.getenv("METRICS_PORT"):
+        serve_prometheus(metrics, int(os.getenv("METRICS_PORT")), extra=(UPSTREAM_METRICS,))
 
 # ---------------------------------------------------
 # Função para executar o grafo com entrada do usuário
 # ---------------------------------------------------
-config = {"thread_id": "1"}
+config = {"thread_id": "1", "user_id": os.getenv("USER_ID", "default")}
 def stream_graph_updates(user_input: str):
-    # Obtem os resultados do graph stream com a configuração necessária.
-    results = graph.stream(
+    # stream_mode="messages" retorna pares (token, metadata) conforme a LLM gera o texto,
+    # então a resposta é exibida assim que o primeiro token chega
+    current_id = None
+    for chunk, metadata in graph.stream(
         {"messages": [{"role": "user", "content": user_input}]},
         config=config,
-        stream_mode='values'
-    )
-    
-    # Percorre cada resultado retornado do stream
-    for result in results:
-        # Verifica se 'result' é um dicionário e se contém a chave "messages"
-        if isinstance(result, dict):
-            messages = result.get("messages", result)
-        # Se for uma lista, assume que é a própria lista de mensagens
-        elif isinstance(result, list):
-            messages = result
-        else:
-            messages = []
-        
-        # Se não houver mensagens, pula para o próximo resultado
-        if not messages:
+        stream_mode="messages"
+    ):
+        # Apenas o nó chatbot gera tokens; as saídas das ferramentas são ignoradas
+        if metadata.get("langgraph_node") != "chatbot" or not chunk.content:
             continue
-        
-        # Obtém a última mensagem
-        last_msg = messages[-1]
-        # Se a última mensagem for um dicionário e tiver a chave "content", exibe seu conteúdo
-        if isinstance(last_msg, dict) and "content" in last_msg:
-            print("Assistant:", last_msg["content"])
-        else:
-            # Caso contrário, exibe a mensagem diretamente (por exemplo, se for uma string)
-            print("Assistant:", last_msg)
+        # Um novo id de mensagem indica uma nova chamada à LLM (ex.: após o ciclo tools -> chatbot)
+        if chunk.id != current_id:
+            if current_id is not None:
+                print()
+            print("Assistant: ", end="", flush=True)
+            current_id = chunk.id
+        print(chunk.content, end="", flush=True)
+    if current_id is not None:
+        print()
 # ---------------------------------------------------
 # Loop de execução via terminal
 # ---------------------------------------------------
@@ -150,8 +83,15 @@ while True:
             print("Goodbye!")
             break
         stream_graph_updates(user_input)
-    except:
+    except EOFError:
+        # Sem entrada interativa (ex.: stdin fechado): faz uma pergunta de exemplo e encerra
         user_input = "What do you know about LangGraph?"
         print("User: " + user_input)
         stream_graph_updates(user_input)
         break
+    except KeyboardInterrupt:
+        print("\nGoodbye!")
+        break
+    except Exception as exc:
+        # Falhas dos provedores (timeout, tentativas esgotadas, circuito aberto) encerram o turno, não o chat
+        print(f"\nError: {exc}")
@@ -0,0 +1,60 @@
+# ---------------------------------------------------
+# HTTP / SSE server for the memory chatbot
+# ---------------------------------------------------
+# Serves langgraph_playground.server over uvicorn (`pip install uvicorn`):
+#
+#   python chat_bot_server.py --port 8000 --workers 2 --max-concurrency 32
+#
+#   curl -N -H "Accept: text/event-stream" -d '{"message": "Hi!"}' \
+#        http://localhost:8000/threads/my-thread
+#
+# Each worker is a separate process with its own graph; set CHECKPOINT_DB so
+# all of them read and write the same conversations. `--shards N` instead
+# runs one router process that sends every thread_id to the same one of N
+# graph processes (langgraph_playground.sharding), so conversations stay in
+# that process's memory without a shared database. `--fake` serves the
+# offline fake LLM and search tool (no API keys needed), e.g. for load tests.
+import argparse
+import os
+import sys
+
+# Makes the shared `langgraph_playground` package (in src/) importable, here
+# and in the worker processes
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(SRC)
+os.environ["PYTHONPATH"] = os.pathsep.join(filter(None, [SRC, os.getenv("PYTHONPATH")]))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the memory chatbot over HTTP/SSE")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="server processes")
+    parser.add_argument("--shards", type=int, default=0, help="graph processes behind one router (0 = no router)")
+    parser.add_argument("--max-concurrency", type=int, default=32, help="turns running at once per process")
+    parser.add_argument("--max-queue", type=int, default=256, help="requests waiting per process before 503")
+    parser.add_argument("--queue-timeout", type=float, default=30.0, help="seconds a request may wait before 503")
+    parser.add_argument("--fake", action="store_true", help="serve the offline fake LLM and search tool")
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError:
+        sys.exit("uvicorn is required to run the server: pip install uvicorn")
+
+    # The app factory reads its limits from the environment in every worker
+    os.environ["SERVER_MAX_CONCURRENCY"] = str(args.max_concurrency)
+    os.environ["SERVER_MAX_QUEUE"] = str(args.max_queue)
+    os.environ["SERVER_QUEUE_TIMEOUT"] = str(args.queue_timeout)
+    if args.fake:
+        os.environ["SERVER_FAKE_LLM"] = "1"
+    if args.shards:
+        os.environ["SERVER_SHARDS"] = str(args.shards)
+
+    uvicorn.run(
+        "langgraph_playground.sharding:create_router" if args.shards else "langgraph_playground.server:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=1 if args.shards else args.workers,  # the router owns the sessions' placement
+        lifespan="on",
+    )
@@ -0,0 +1,10 @@
+"""Shared building blocks for the LangGraph playground chatbots.
+
+The scripts under ``src/`` are thin entry points; this package holds the graph
+factory (``build_graph``) and the pieces it is made of (state definition,
+history policy, caches, tool node and runtime helpers).
+"""
+from langgraph_playground.graph import build_graph, load_env
+from langgraph_playground.state import State
+
+__all__ = ["State", "build_graph", "load_env"]
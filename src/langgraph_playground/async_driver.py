@@ -0,0 +1,38 @@
+# ---------------------------------------------------
+# Async driver: many thread_ids in one event loop
+# ---------------------------------------------------
+# Turns of the same thread_id run one after the other (they share a
+# checkpoint), while different thread_ids run concurrently. A semaphore caps
+# how many turns are in flight at once so the upstream APIs are not flooded.
+import asyncio
+
+
+async def run_turn(graph, thread_id: str, user_input: str) -> str:
+    """Run one user turn on ``thread_id`` and return the assistant's answer."""
+    config = {"configurable": {"thread_id": thread_id}}
+    state = await graph.ainvoke(
+        {"messages": [{"role": "user", "content": user_input}]},
+        config=config,
+    )
+    return state["messages"][-1].content
+
+
+async def run_sessions(graph, sessions: dict, max_concurrency: int = 100) -> dict:
+    """Drive several conversations concurrently.
+
+    ``sessions`` maps a thread_id to the list of user inputs for that
+    conversation. Returns a dict with the same keys and the list of answers.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_session(thread_id: str, user_inputs: list) -> list:
+        answers = []
+        for user_input in user_inputs:
+            async with semaphore:
+                answers.append(await run_turn(graph, thread_id, user_input))
+        return answers
+
+    results = await asyncio.gather(
+        *(run_session(thread_id, inputs) for thread_id, inputs in sessions.items())
+    )
+    return dict(zip(sessions.keys(), results))
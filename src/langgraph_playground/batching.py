@@ -0,0 +1,220 @@
+# ---------------------------------------------------
+# Micro-batching in front of the chat model
+# ---------------------------------------------------
+# Under bursty load many sessions reach the chatbot node at the same moment
+# and each one makes its own request. MicroBatchChatModel is a drop-in chat
+# model that holds calls for a short window (`max_wait`, or until
+# `max_batch_size` calls are waiting), then sends them upstream together with
+# the wrapped model's `batch` / `abatch`, and hands every caller its own result:
+#
+#     llm = MicroBatchChatModel(model=ChatTogether(...), max_wait=0.01)
+#     graph = build_graph("memory", llm=llm)      # or LLM_BATCH_WINDOW_MS=10
+#
+# - Only calls with the same bound tools / stop words / kwargs share a batch.
+# - Identical prompts in one batch (same normalization as the response cache)
+#   are sent once, e.g. many sessions opening with the same greeting.
+# - For the Together chat API, `batch` means concurrent requests over the
+#   shared connection pool; models with a native batch call get one request.
+#
+# No leader thread is needed: the first call of a batch waits out the window
+# and dispatches it, later calls just wait for their result. Token streaming
+# is not available through the wrapper (answers arrive whole).
+import asyncio
+import contextvars
+import json
+import threading
+from concurrent.futures import Future
+from typing import Any, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.load import dumps
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+
+from langgraph_playground.response_cache import cache_key
+
+
+class _Batch:
+    """Calls collected during one window (sync or async flavour)."""
+
+    def __init__(self, closed):
+        self.inputs: list = []
+        self.futures: list = []
+        self.closed = closed  # set once the batch is taken for dispatch
+
+
+class MicroBatchChatModel(BaseChatModel):
+    """Chat model that groups concurrent calls into batches for `model`."""
+
+    model: BaseChatModel
+    max_batch_size: int = 16
+    """Dispatch as soon as this many calls are waiting."""
+    max_wait: float = 0.01
+    """Seconds the first call of a batch waits for others to join."""
+
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _pending: dict = PrivateAttr(default_factory=dict)  # key -> open sync _Batch
+    _apending: dict = PrivateAttr(default_factory=dict)  # (loop, key) -> open async _Batch
+    _tasks: set = PrivateAttr(default_factory=set)  # running async batches
+    _stats: dict = PrivateAttr(
+        default_factory=lambda: {"requests": 0, "batches": 0, "upstream_calls": 0, "coalesced": 0}
+    )
+
+    @property
+    def _llm_type(self) -> str:
+        return f"micro-batch-{self.model._llm_type}"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model": self.model._identifying_params, "max_batch_size": self.max_batch_size}
+
+    @property
+    def stats(self) -> dict:
+        """Requests seen, batches and upstream calls made, duplicate prompts saved."""
+        with self._lock:
+            return dict(self._stats)
+
+    def bind_tools(self, tools: list, **kwargs: Any):
+        # Let the wrapped model format the tools, then carry its kwargs through
+        return self.bind(**self.model.bind_tools(tools, **kwargs).kwargs)
+
+    # --- Sync path ---
+    def _generate(
+        self,
+        messages: list,
+        stop: Optional[list] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        key = _batch_key(stop, kwargs)
+        future = Future()
+        with self._lock:
+            self._stats["requests"] += 1
+            batch = self._pending.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._pending[key] = _Batch(threading.Event())
+            batch.inputs.append(messages)
+            batch.futures.append(future)
+            full = len(batch.inputs) >= self.max_batch_size
+            if full:
+                self._close(self._pending, key, batch)
+
+        if full:
+            self._dispatch(batch, stop, kwargs)
+        elif leader:
+            batch.closed.wait(self.max_wait)
+            with self._lock:
+                mine = self._pending.get(key) is batch
+                if mine:
+                    self._close(self._pending, key, batch)
+            if mine:
+                self._dispatch(batch, stop, kwargs)
+        return _result(future.result())
+
+    def _dispatch(self, batch: _Batch, stop, kwargs: dict) -> None:
+        inputs, owners = self._dedupe(batch)
+        # Fresh context: the upstream calls must not report to this node's callbacks
+        results = contextvars.Context().run(
+            self.model.batch, inputs, {"max_concurrency": len(inputs)}, return_exceptions=True, stop=stop, **kwargs
+        )
+        for future, owner in zip(batch.futures, owners):
+            _settle(future, results[owner])
+
+    # --- Async path ---
+    async def _agenerate(
+        self,
+        messages: list,
+        stop: Optional[list] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        loop = asyncio.get_running_loop()
+        key = (loop, _batch_key(stop, kwargs))
+        future = loop.create_future()
+        with self._lock:
+            self._stats["requests"] += 1
+            batch = self._apending.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._apending[key] = _Batch(asyncio.Event())
+            batch.inputs.append(messages)
+            batch.futures.append(future)
+            full = len(batch.inputs) >= self.max_batch_size
+            if full:
+                self._close(self._apending, key, batch)
+
+        if full:
+            self._adispatch(batch, stop, kwargs)
+        elif leader:
+            try:
+                await asyncio.wait_for(batch.closed.wait(), self.max_wait)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                # Dispatch even if this caller was cancelled: others are waiting
+                with self._lock:
+                    mine = self._apending.get(key) is batch
+                    if mine:
+                        self._close(self._apending, key, batch)
+                if mine:
+                    self._adispatch(batch, stop, kwargs)
+        return _result(await future)
+
+    def _adispatch(self, batch: _Batch, stop, kwargs: dict) -> None:
+        inputs, owners = self._dedupe(batch)
+
+        async def run():
+            try:
+                results = await self.model.abatch(
+                    inputs, {"max_concurrency": len(inputs)}, return_exceptions=True, stop=stop, **kwargs
+                )
+            except BaseException as exc:  # e.g. cancelled: nobody may wait forever
+                results = [exc] * len(inputs)
+            for future, owner in zip(batch.futures, owners):
+                if not future.done():
+                    _settle(future, results[owner])
+
+        # Own task (and context), so a cancelled caller does not cancel the batch
+        task = asyncio.create_task(run(), context=contextvars.Context())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # --- Shared helpers ---
+    def _close(self, pending: dict, key, batch: _Batch) -> None:
+        """Take `batch` out of `pending` (caller holds the lock)."""
+        del pending[key]
+        batch.closed.set()
+        self._stats["batches"] += 1
+
+    def _dedupe(self, batch: _Batch) -> tuple:
+        """Unique prompts of the batch, and for each caller the index of its prompt."""
+        unique, inputs, owners = {}, [], []
+        for messages in batch.inputs:
+            prompt = cache_key(dumps(messages), "")  # ignores message ids, like the response cache
+            if prompt not in unique:
+                unique[prompt] = len(inputs)
+                inputs.append(messages)
+            owners.append(unique[prompt])
+        with self._lock:
+            self._stats["upstream_calls"] += len(inputs)
+            self._stats["coalesced"] += len(owners) - len(inputs)
+        return inputs, owners
+
+
+def _batch_key(stop: Optional[list], kwargs: dict) -> str:
+    return json.dumps([stop, kwargs], sort_keys=True, default=str)
+
+
+def _settle(future, result) -> None:
+    if isinstance(result, BaseException):
+        future.set_exception(result)
+    else:
+        future.set_result(result)
+
+
+def _result(message) -> ChatResult:
+    # Callers sharing a coalesced answer each get their own copy; the id is
+    # cleared so every run stamps its own
+    return ChatResult(generations=[ChatGeneration(message=message.model_copy(update={"id": None}))])
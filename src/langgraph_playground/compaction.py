@@ -0,0 +1,191 @@
+# ---------------------------------------------------
+# Compaction of tool output before it goes back to the LLM
+# ---------------------------------------------------
+# Search results are stored in the conversation and re-sent to the model on
+# every later turn, so their size is paid again and again. The `compact`
+# node runs between the tools node and the next chatbot call and rewrites
+# each new ToolMessage (same id, so add_messages replaces it in place):
+#
+#   1. parse the results and drop duplicates (same URL without query string
+#      or fragment, or the same text),
+#   2. split into sentences and drop boilerplate (cookie banners, newsletter
+#      and share prompts, navigation crumbs) and sentences already seen,
+#   3. keep the sentences that share the most words with the query, in their
+#      original order, until `max_tokens` is reached,
+#   4. move the full payload (content + artifact) to a `PayloadStore` and
+#      keep only its reference in the message (`artifact={"ref": ...}`).
+#
+#     store = PayloadStore("payloads.db")
+#     graph = build_graph("memory", compaction=ToolOutputCompactor(store))
+#     store.get(tool_message.artifact["ref"])       # full results, on demand
+#
+# Compaction is off unless passed in or TOOL_OUTPUT_TOKENS is set
+# (TOOL_PAYLOAD_DB for the SQLite store). The in-memory store only keeps the
+# last `max_entries` payloads of this process, while the checkpointed
+# messages keep their references for good: use a SQLite store for threads
+# that outlive the process.
+#
+# Output that is not a JSON list of results is only trimmed to the budget.
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+from langchain_core.messages import AIMessage, ToolMessage
+
+from langgraph_playground.prefetch import STOPWORDS
+
+BOILERPLATE = re.compile(
+    r"cookie|subscribe|newsletter|sign (up|in)|log ?in|all rights reserved|privacy policy|terms of "
+    r"(use|service)|click here|read more|share (this|on)|follow us|advertisement|skip to (main )?content|"
+    r"enable javascript|©|copyright",
+    re.IGNORECASE,
+)
+SENTENCE = re.compile(r"(?<=[.!?])\s+|\s*\n+\s*|\s+[|•·]\s+")
+
+
+class PayloadStore:
+    """Full tool payloads kept out of the conversation, addressed by content hash.
+
+    Args:
+        path: SQLite file, or None to keep the last `max_entries` in memory.
+        max_entries: Size of the in-memory store.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self.memory: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+        self.conn = None
+        if path:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS payloads (ref TEXT PRIMARY KEY, value TEXT, created_at REAL) WITHOUT ROWID"
+            )
+
+    def put(self, payload: Any) -> str:
+        value = json.dumps(payload, sort_keys=True, default=str)
+        ref = hashlib.sha256(value.encode()).hexdigest()[:16]
+        with self.lock:
+            if self.conn is not None:
+                self.conn.execute("INSERT OR IGNORE INTO payloads VALUES (?, ?, ?)", (ref, value, time.time()))
+                self.conn.commit()
+            else:
+                self.memory[ref] = value
+                self.memory.move_to_end(ref)
+                while len(self.memory) > self.max_entries:
+                    self.memory.popitem(last=False)
+        return ref
+
+    def get(self, ref: str) -> Optional[Any]:
+        with self.lock:
+            if self.conn is not None:
+                row = self.conn.execute("SELECT value FROM payloads WHERE ref = ?", (ref,)).fetchone()
+                value = row[0] if row else None
+            else:
+                value = self.memory.get(ref)
+        return json.loads(value) if value is not None else None
+
+
+def _tokens(text: str) -> int:
+    # Same ~4 characters per token estimate as count_tokens_approximately
+    return -(-len(text) // 4)
+
+
+def _words(text: str) -> set:
+    return set(re.findall(r"[a-z0-9]+", text.lower())) - STOPWORDS
+
+
+def _canonical_url(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.netloc.lower().removeprefix('www.')}{parts.path.rstrip('/')}"
+
+
+def compact_results(content: str, query: str, max_tokens: int = 300) -> str:
+    """Deduplicated, boilerplate-free, query-relevant passages within `max_tokens`."""
+    try:
+        results = json.loads(content)
+    except (TypeError, ValueError):
+        results = None
+    if not isinstance(results, list) or not all(isinstance(r, dict) for r in results):
+        # Not search results: keep the head within the budget
+        return content if _tokens(content) <= max_tokens else content[: max_tokens * 4]
+
+    # 1. Deduplicate results
+    seen_urls, seen_texts, sources = set(), set(), []
+    for result in results:
+        url, text = result.get("url", ""), " ".join(str(result.get("content", "")).split())
+        if _canonical_url(url) in seen_urls or text in seen_texts:
+            continue
+        seen_urls.add(_canonical_url(url))
+        seen_texts.add(text)
+        sources.append((url, result.get("title", ""), text))
+
+    # 2. Sentences without boilerplate or repeats, 3. scored against the query
+    query_words = _words(query)
+    seen_sentences, candidates = set(), []  # (score, source index, position, sentence)
+    for index, (_, _, text) in enumerate(sources):
+        for position, sentence in enumerate(SENTENCE.split(text)):
+            key = " ".join(sorted(_words(sentence)))
+            if len(sentence) < 20 or BOILERPLATE.search(sentence) or key in seen_sentences:
+                continue
+            seen_sentences.add(key)
+            candidates.append((len(_words(sentence) & query_words), index, position, sentence))
+
+    budget = max_tokens - sum(_tokens(f"[{i + 1}] {url}") for i, (url, _, _) in enumerate(sources))
+    kept = []
+    for score, index, position, sentence in sorted(candidates, key=lambda c: (-c[0], c[1], c[2])):
+        cost = _tokens(sentence)
+        if cost > budget:
+            continue
+        budget -= cost
+        kept.append((index, position, sentence))
+
+    lines = []
+    for i, (url, title, _) in enumerate(sources):
+        passages = " ".join(sentence for index, _, sentence in sorted(kept) if index == i)
+        if passages:
+            lines.append(f"[{i + 1}] {title + ' - ' if title else ''}{url}\n{passages}")
+    return "\n".join(lines) or content[: max_tokens * 4]
+
+
+class ToolOutputCompactor:
+    """Graph node that compacts the ToolMessages of the last tools step.
+
+    Args:
+        store: Where the full payloads go; an in-memory `PayloadStore` by default.
+        max_tokens: Approximate token budget per tool message.
+    """
+
+    def __init__(self, store: Optional[PayloadStore] = None, max_tokens: int = 300) -> None:
+        self.store = store if store is not None else PayloadStore()
+        self.max_tokens = max_tokens
+        self.stats = {"messages": 0, "tokens_before": 0, "tokens_after": 0}
+        self.lock = threading.Lock()
+
+    def __call__(self, state: dict) -> dict:
+        messages = state["messages"]
+        # The tool results of this step follow the last AI message
+        start = max(i for i, m in enumerate(messages) if isinstance(m, AIMessage))
+        queries = {call["id"]: call["args"].get("query", "") for call in messages[start].tool_calls}
+
+        compacted = []
+        for message in messages[start + 1:]:
+            if not isinstance(message, ToolMessage) or (isinstance(message.artifact, dict) and "ref" in message.artifact):
+                continue
+            content = message.content if isinstance(message.content, str) else json.dumps(message.content)
+            text = compact_results(content, queries.get(message.tool_call_id, ""), self.max_tokens)
+            ref = self.store.put({"content": message.content, "artifact": message.artifact})
+            compacted.append(message.model_copy(update={"content": text, "artifact": {"ref": ref}}))
+
+            with self.lock:
+                self.stats["messages"] += 1
+                self.stats["tokens_before"] += _tokens(content)
+                self.stats["tokens_after"] += _tokens(text)
+        return {"messages": compacted}
@@ -0,0 +1,201 @@
+# ---------------------------------------------------
+# Offline stand-ins for ChatTogether and TavilySearchResults
+# ---------------------------------------------------
+# Deterministic local models with configurable latency, used by the
+# benchmarks (and handy for trying the graphs without API keys):
+#
+#     llm = FakeChatModel(latency=0.2)        # instead of ChatTogether(...)
+#     tool = FakeSearchTool(latency=0.5)      # instead of TavilySearchResults(...)
+#
+# FakeChatModel supports bind_tools: when tools are bound and the user's
+# question looks like a search (see `search_keywords`) it answers with a tool
+# call, and after a ToolMessage it answers with text, which exercises the
+# chatbot -> tools -> chatbot loop exactly like the real model. Streaming is
+# emulated word by word so stream_mode="messages" also works.
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.tools import BaseTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import BaseModel, Field
+
+LOREM = (
+    "LangGraph models an application as a graph of nodes that read and update a "
+    "shared state while edges decide which node runs next"
+).split()
+
+
+PAGE_BOILERPLATE = (
+    "We use cookies to improve your experience. Accept all cookies?",
+    "Subscribe to our newsletter for weekly updates.",
+    "Home | Docs | Blog | Pricing | Sign in",
+    "Share this article on social media. Follow us for more.",
+    "© 2025 Example Media. All rights reserved.",
+)
+
+
+class FakeChatModel(BaseChatModel):
+    """Deterministic chat model with a fixed latency per call."""
+
+    model: str = "fake-llama"
+    latency: float = 0.05
+    """Seconds spent before the first token (network + prefill)."""
+    token_latency: float = 0.0
+    """Extra seconds per generated word when streaming."""
+    prefill_latency: float = 0.0
+    """Extra seconds per 1k prompt tokens (prefill grows with the prompt)."""
+    answer_words: int = 40
+    search_keywords: tuple = ("search", "latest", "news", "what", "who", "when", "where")
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model": self.model}
+
+    def bind_tools(self, tools: list, **kwargs: Any):
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    # --- Deterministic answer ---
+    def _reply(self, messages: list, tools: Optional[list]) -> AIMessage:
+        last = messages[-1]
+        text = last.content if isinstance(last.content, str) else str(last.content)
+        digest = hashlib.sha1(f"{len(messages)}:{text}".encode()).hexdigest()
+        usage = {"input_tokens": count_tokens_approximately(messages)}
+
+        if (
+            tools
+            and isinstance(last, HumanMessage)
+            and any(k in text.lower() for k in self.search_keywords)
+        ):
+            usage["output_tokens"] = 10
+            usage["total_tokens"] = usage["input_tokens"] + 10
+            return AIMessage(
+                content="",
+                tool_calls=[{
+                    "name": tools[0]["function"]["name"],
+                    "args": {"query": text},
+                    "id": f"call_{digest[:12]}",
+                }],
+                usage_metadata=usage,
+            )
+
+        prefix = "Based on the search results," if isinstance(last, ToolMessage) else "Sure!"
+        words = [LOREM[(int(digest, 16) + i) % len(LOREM)] for i in range(self.answer_words)]
+        content = " ".join([prefix, *words]) + "."
+        usage["output_tokens"] = len(words) + 2
+        usage["total_tokens"] = usage["input_tokens"] + usage["output_tokens"]
+        return AIMessage(content=content, usage_metadata=usage)
+
+    def _first_token_delay(self, message: AIMessage) -> float:
+        return self.latency + self.prefill_latency * message.usage_metadata["input_tokens"] / 1000
+
+    # --- BaseChatModel hooks ---
+    def _generate(self, messages, stop=None, run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs) -> ChatResult:
+        message = self._reply(messages, kwargs.get("tools"))
+        time.sleep(self._first_token_delay(message) + self.token_latency * len(message.content.split()))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs) -> ChatResult:
+        message = self._reply(messages, kwargs.get("tools"))
+        await asyncio.sleep(self._first_token_delay(message) + self.token_latency * len(message.content.split()))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _chunks(self, message: AIMessage):
+        if message.tool_calls:
+            yield AIMessageChunk(
+                content="",
+                tool_call_chunks=[
+                    {"name": c["name"], "args": json.dumps(c["args"]), "id": c["id"], "index": i}
+                    for i, c in enumerate(message.tool_calls)
+                ],
+                usage_metadata=message.usage_metadata,
+            )
+            return
+        words = message.content.split(" ")
+        for i, word in enumerate(words):
+            last = i == len(words) - 1
+            yield AIMessageChunk(
+                content=word if i == 0 else " " + word,
+                usage_metadata=message.usage_metadata if last else None,
+            )
+
+    def _stream(self, messages, stop=None, run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs):
+        message = self._reply(messages, kwargs.get("tools"))
+        time.sleep(self._first_token_delay(message))
+        for chunk in self._chunks(message):
+            # BaseChatModel forwards each chunk to the callbacks (on_llm_new_token)
+            time.sleep(self.token_latency)
+            yield ChatGenerationChunk(message=chunk)
+
+    async def _astream(self, messages, stop=None, run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs):
+        message = self._reply(messages, kwargs.get("tools"))
+        await asyncio.sleep(self._first_token_delay(message))
+        for chunk in self._chunks(message):
+            await asyncio.sleep(self.token_latency)
+            yield ChatGenerationChunk(message=chunk)
+
+
+class _SearchInput(BaseModel):
+    query: str = Field(description="search query to look up")
+
+
+class FakeSearchTool(BaseTool):
+    """Stand-in for TavilySearchResults: same name, schema and output shape."""
+
+    name: str = "tavily_search_results_json"
+    description: str = (
+        "A search engine optimized for comprehensive, accurate, and trusted results. "
+        "Useful for when you need to answer questions about current events. "
+        "Input should be a search query."
+    )
+    args_schema: type = _SearchInput
+    response_format: str = "content_and_artifact"
+    latency: float = 0.1
+    max_results: int = 2
+    page_sentences: int = 0
+    """Extra sentences per result, mixed with page boilerplate and a mirrored
+    duplicate result, to look like raw web pages (0 = short snippets)."""
+
+    def _page(self, query: str, i: int) -> str:
+        sentences = [f"{query} -- " + " ".join(LOREM) + "."]
+        for j in range(self.page_sentences):
+            words = LOREM[(i + j) % len(LOREM):] + LOREM[:(i + j) % len(LOREM)]
+            sentences.append(" ".join(words[: 8 + j % 9]).capitalize() + ".")
+            if j % 3 == 0:
+                sentences.append(PAGE_BOILERPLATE[j // 3 % len(PAGE_BOILERPLATE)])
+        return " ".join(sentences)
+
+    def _results(self, query: str) -> tuple:
+        digest = hashlib.sha1(query.encode()).hexdigest()[:8]
+        results = [
+            {
+                "title": f"Result {i + 1} for {query}",
+                "url": f"https://example.com/{digest}/{i}",
+                "content": self._page(query, i),
+                "score": round(1.0 - 0.1 * i, 2),
+            }
+            for i in range(self.max_results)
+        ]
+        if self.page_sentences:
+            mirror = dict(results[0], url=f"https://www.example.com/{digest}/0?utm_source=feed", score=0.5)
+            results.append(mirror)
+        return [{"url": r["url"], "content": r["content"]} for r in results], {"query": query, "results": results}
+
+    def _run(self, query: str, run_manager=None) -> tuple:
+        time.sleep(self.latency)
+        return self._results(query)
+
+    async def _arun(self, query: str, run_manager=None) -> tuple:
+        await asyncio.sleep(self.latency)
+        return self._results(query)
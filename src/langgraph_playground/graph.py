@@ -0,0 +1,403 @@
+# ---------------------------------------------------
+# Graph factory shared by the scripts, the web app and the benchmarks
+# ---------------------------------------------------
+# Every chatbot in src/ is one of three graphs:
+#
+#   "basic"  : START -> chatbot -> END
+#   "web"    : chatbot <-> tools (Tavily web search), routed by tools_condition;
+#              tool results pass through a `compact` node on the way back
+#   "memory" : "web" + a checkpointer (conversation per thread_id) and a
+#              `summarize` node that keeps the history bounded
+#
+# With a `ModelRouter` (routing.py) a `router` node runs before `chatbot` and
+# picks the model and whether the tools are bound for each turn; with
+# `tool_routing` alone it only decides whether the tools are bound.
+#
+#     from langgraph_playground.graph import build_graph, load_env
+#     load_env()
+#     graph = build_graph("memory")
+#
+# Nothing is built at import time: langchain_together and langchain_community
+# are only imported, and the API clients only created, when build_graph needs
+# the default LLM or tools. Passing `llm=` / `tools=` (e.g. the offline fakes)
+# skips them entirely. Nodes have both a sync and an async path, so the same
+# compiled graph works with invoke/stream and ainvoke/astream.
+#
+# The optional components a graph was built with (prefetcher, caches, router)
+# are returned by `components(graph)`, not stored on the compiled graph:
+# Pregel.copy() (behind with_config) passes every attribute of the graph back
+# to its constructor.
+import functools
+import os
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Optional
+
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langgraph.graph import END, START, StateGraph
+from langgraph.prebuilt import tools_condition
+
+from langgraph_playground.compaction import PayloadStore, ToolOutputCompactor
+from langgraph_playground.history import HistoryPolicy, SummaryState, summarize_history, with_summary
+from langgraph_playground.long_term_memory import LongTermMemory
+from langgraph_playground.parallel_tools import ParallelToolNode
+from langgraph_playground.prefetch import PrefetchedSearchTool, SearchPrefetcher, looks_like_search
+from langgraph_playground.routing import ModelRouter, Route, RoutedState, RoutedSummaryState
+from langgraph_playground.semantic_cache import SemanticCache
+from langgraph_playground.state import State
+
+DEFAULT_MODEL = "meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo-classifier"
+LARGE_MODEL = "meta-llama/Meta-Llama-3.1-70B-Instruct-Turbo"
+# USD per 1M tokens (input, output), Together list prices; adjust to your plan
+PRICES = {DEFAULT_MODEL: (0.18, 0.18), LARGE_MODEL: (0.88, 0.88)}
+VARIANTS = ("basic", "web", "memory")
+
+
+@dataclass
+class GraphComponents:
+    """Optional components wired into a graph by `build_graph` (None when unused)."""
+
+    prefetcher: Optional[SearchPrefetcher] = None
+    semantic_cache: Optional[SemanticCache] = None
+    long_term_memory: Optional[LongTermMemory] = None
+    router: Optional[ModelRouter] = None
+
+
+# StateGraph builder -> components; a compiled graph and its copies share the builder
+_COMPONENTS: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def components(graph) -> GraphComponents:
+    """The optional components of a graph built by `build_graph` (or of a copy of it)."""
+    builder = getattr(graph, "builder", None)
+    return (_COMPONENTS.get(builder) if builder is not None else None) or GraphComponents()
+
+
+# ---------------------------------------------------
+# Environment and default clients
+# ---------------------------------------------------
+def load_env(require: tuple = ("TOGETHER_API_KEY", "TAVILY_API_KEY")) -> None:
+    """Load `.env` and `config/.env` and check that the required keys exist."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    load_dotenv(dotenv_path=os.path.join(os.getcwd(), "config", ".env"))
+    missing = [var for var in require if not os.getenv(var)]
+    if missing:
+        raise EnvironmentError(f"{', '.join(missing)} not found. Check your .env file.")
+
+
+@functools.lru_cache(maxsize=None)
+def shared_http_client():
+    """Process-wide httpx client, so every LLM client reuses one connection pool.
+
+    Requests go through the TOGETHER upstream policy (deadline, jittered
+    retries, circuit breaker; see resilience.py).
+    """
+    import httpx
+
+    from langgraph_playground.resilience import TOGETHER, ResilientTransport
+
+    return httpx.Client(transport=ResilientTransport(TOGETHER), timeout=TOGETHER.policy.timeout)
+
+
+@functools.lru_cache(maxsize=None)
+def shared_async_http_client():
+    """Async counterpart of `shared_http_client`, for ainvoke/astream."""
+    import httpx
+
+    from langgraph_playground.resilience import TOGETHER, AsyncResilientTransport
+
+    return httpx.AsyncClient(transport=AsyncResilientTransport(TOGETHER), timeout=TOGETHER.policy.timeout)
+
+
+def default_llm(model: str = DEFAULT_MODEL):
+    """ChatTogether client used by the chatbots (imported on first use).
+
+    Set LLM_CACHE=1 to serve repeated questions from a `ResponseCache`
+    (LLM_CACHE_DB also persists it to that SQLite file), and
+    LLM_BATCH_WINDOW_MS to wrap the client in a `MicroBatchChatModel`.
+    """
+    from langchain_together import ChatTogether
+
+    cache = None
+    # Opt-in, like SEMANTIC_CACHE: a cached answer is stale if the world changed
+    if os.getenv("LLM_CACHE_DB") or os.getenv("LLM_CACHE") == "1":
+        from langgraph_playground.response_cache import ResponseCache
+
+        cache = ResponseCache(os.getenv("LLM_CACHE_DB"))
+
+    llm = ChatTogether(
+        model=model,
+        together_api_key=os.getenv("TOGETHER_API_KEY"),
+        temperature=0,  # deterministic output: same input yields same output
+        cache=cache,
+        # Keep-alive connections shared with any other client built in this process;
+        # retries happen in the transport, where they are counted
+        http_client=shared_http_client(),
+        http_async_client=shared_async_http_client(),
+        max_retries=0,
+    )
+    # Opt-in: group concurrent calls arriving within LLM_BATCH_WINDOW_MS
+    if window := os.getenv("LLM_BATCH_WINDOW_MS"):
+        from langgraph_playground.batching import MicroBatchChatModel
+
+        llm = MicroBatchChatModel(model=llm, max_wait=float(window) / 1000)
+    return llm
+
+
+def default_tools() -> list:
+    """Tavily web search behind a 10-minute cache (imported on first use)."""
+    from langchain_community.tools.tavily_search import TavilySearchResults
+
+    from langgraph_playground.resilience import ResilientTavilyAPIWrapper
+    from langgraph_playground.search_cache import CachedSearchTool
+
+    search = TavilySearchResults(max_results=2, api_wrapper=ResilientTavilyAPIWrapper())
+    return [CachedSearchTool(search, ttl=600)]
+
+
+def default_router() -> ModelRouter:
+    """Small/large ChatTogether routes for MODEL_ROUTING=1.
+
+    LLM_SMALL_MODEL / LLM_LARGE_MODEL pick the models, ROUTER_MAX_COMPLEXITY
+    (1.5) is the highest `complexity` score the small model takes.
+    """
+    routes = []
+    for name, model in (
+        ("small", os.getenv("LLM_SMALL_MODEL", DEFAULT_MODEL)),
+        ("large", os.getenv("LLM_LARGE_MODEL", LARGE_MODEL)),
+    ):
+        input_price, output_price = PRICES.get(model, (0.0, 0.0))
+        routes.append(Route(name, default_llm(model), input_price=input_price, output_price=output_price))
+    routes[0].max_complexity = float(os.getenv("ROUTER_MAX_COMPLEXITY", "1.5"))
+    return ModelRouter(routes)
+
+
+def default_checkpointer():
+    """SQLite file if CHECKPOINT_DB is set, in-memory otherwise.
+
+    Both serialize state with `MessageSerializer` (zstd-compressed when
+    CHECKPOINT_ZSTD_LEVEL is set). The SQLite saver stores message deltas
+    with a full snapshot every CHECKPOINT_SNAPSHOT_EVERY (16) checkpoints,
+    and keeps the newest CHECKPOINT_KEEP_LAST checkpoints per thread when set.
+    """
+    from langgraph_playground.serialization import MessageSerializer
+
+    level = os.getenv("CHECKPOINT_ZSTD_LEVEL")
+    serde = MessageSerializer(compress_level=int(level) if level else None)
+    if path := os.getenv("CHECKPOINT_DB"):
+        from langgraph_playground.sqlite_checkpointer import SqliteCheckpointer
+
+        keep_last = os.getenv("CHECKPOINT_KEEP_LAST")
+        return SqliteCheckpointer(
+            path,
+            serde=serde,
+            snapshot_every=int(os.getenv("CHECKPOINT_SNAPSHOT_EVERY", "16")),
+            keep_last=int(keep_last) if keep_last else None,
+        )
+    from langgraph.checkpoint.memory import MemorySaver
+
+    return MemorySaver(serde=serde)
+
+
+# ---------------------------------------------------
+# Factory
+# ---------------------------------------------------
+def build_graph(
+    variant: str = "memory",
+    *,
+    checkpointer=None,
+    llm=None,
+    tools=None,
+    history_policy=None,
+    prefetch=None,
+    compaction=None,
+    semantic_cache=None,
+    long_term_memory=None,
+    router=None,
+    tool_routing=None,
+):
+    """Build and compile one of the chatbot graphs.
+
+    Args:
+        variant: "basic", "web" or "memory".
+        checkpointer: Saver passed to compile(). "memory" defaults to
+            `default_checkpointer()`; the other variants have none unless given.
+        llm: Chat model; defaults to `default_llm()`.
+        tools: Tools for "web"/"memory"; defaults to `default_tools()`.
+            Ignored by "basic".
+        history_policy: `HistoryPolicy` for the summarize node. "memory"
+            defaults to the last HISTORY_MAX_MESSAGES (20) messages.
+        prefetch: Start likely web searches alongside the first LLM call
+            (see prefetch.py); defaults to SEARCH_PREFETCH=1. The prefetcher
+            is available as `components(graph).prefetcher`.
+        compaction: `ToolOutputCompactor` run between the tools node and the
+            chatbot; defaults to one with a TOOL_OUTPUT_TOKENS token budget per
+            tool message when that is set (payloads in TOOL_PAYLOAD_DB, or in
+            memory), else none. False keeps tool output as is.
+        semantic_cache: `SemanticCache` consulted before the chatbot calls
+            the model; defaults to one when SEMANTIC_CACHE=1, else none.
+            Available as `components(graph).semantic_cache`.
+        long_term_memory: `LongTermMemory` shared by all threads of a user
+            (`configurable.user_id`): facts the user states are stored, and the
+            most relevant ones are added to each prompt (turns without a
+            user_id skip it). Defaults to one on LONG_TERM_MEMORY_DB when set.
+            Available as `components(graph).long_term_memory`.
+        router: `ModelRouter` choosing the model and the tool binding of each
+            turn in a `router` node before the chatbot; defaults to
+            `default_router()` when MODEL_ROUTING=1, else none (every turn on
+            `llm` with the tools bound). `llm` still writes the summaries.
+            Available as `components(graph).router`.
+        tool_routing: Without a router, bind the tools to `llm` only on turns
+            whose message needs a search (`SearchIntent`); defaults to
+            TOOL_ROUTING=1. Implemented as a one-route router ("llm").
+    """
+    if variant not in VARIANTS:
+        raise ValueError(f"Unknown graph variant {variant!r}, expected one of {VARIANTS}")
+
+    llm = llm if llm is not None else default_llm()
+    if variant == "basic":
+        tools = []
+    elif tools is None:
+        tools = default_tools()
+    if variant == "memory":
+        if checkpointer is None:
+            checkpointer = default_checkpointer()
+        if history_policy is None:
+            history_policy = HistoryPolicy(max_messages=int(os.getenv("HISTORY_MAX_MESSAGES", "20")))
+
+    prefetcher = None
+    if prefetch is None:
+        prefetch = os.getenv("SEARCH_PREFETCH") == "1"
+    if prefetch and tools:
+        # The first tool taking a `query` is the web search
+        search = next((t for t in tools if "query" in t.args), None)
+        if search is not None:
+            prefetcher = SearchPrefetcher(search)
+            tools = [PrefetchedSearchTool(t, prefetcher) if t is search else t for t in tools]
+
+    if router is None and os.getenv("MODEL_ROUTING") == "1":
+        router = default_router()
+    if tool_routing is None:
+        tool_routing = os.getenv("TOOL_ROUTING") == "1"
+    if router is None and tool_routing and tools:
+        router = ModelRouter([Route("llm", llm)])
+    # With a router each route binds the tools itself, per turn
+    if router:
+        router.bind(tools)
+        model = None
+    else:
+        model = llm.bind_tools(tools) if tools else llm
+    prompt = with_summary if history_policy else (lambda state: state["messages"])
+
+    def maybe_prefetch(state: State, config: RunnableConfig) -> None:
+        last = state["messages"][-1]
+        if isinstance(last, HumanMessage) and isinstance(last.content, str) and looks_like_search(last.content):
+            prefetcher.start(config.get("configurable", {}).get("thread_id"), last.content)
+
+    if semantic_cache is None and os.getenv("SEMANTIC_CACHE") == "1":
+        semantic_cache = SemanticCache()
+    if long_term_memory is None and os.getenv("LONG_TERM_MEMORY_DB"):
+        long_term_memory = LongTermMemory(os.getenv("LONG_TERM_MEMORY_DB"))
+
+    def context(state: State, config: RunnableConfig) -> tuple:
+        """`(messages for the model, whether they carry recalled user facts)`."""
+        messages = prompt(state)
+        if not long_term_memory:
+            return messages, False
+        recalled = long_term_memory.prompt(messages, config)
+        long_term_memory.remember(state["messages"], config)
+        return recalled, recalled is not messages
+
+    def turn_model(state: State) -> tuple:
+        """`(route label or None, model)` for this chatbot call."""
+        return router.model(state.get("route")) if router else (None, model)
+
+    # Chatbot node: receives the state and returns the new AI message.
+    # Answers built on a user's recalled facts are personal: the semantic
+    # cache neither serves nor stores them. It sees the prompt (summary
+    # included), so it only caches the opening question of a conversation
+    def chatbot(state: State, config: RunnableConfig):
+        messages, personal = context(state, config)
+        cache = semantic_cache if not personal else None
+        if cache and (answer := cache.lookup(messages)):
+            return {"messages": [answer]}
+        label, turn_llm = turn_model(state)
+        if prefetcher and (label is None or label.endswith("+tools")):
+            maybe_prefetch(state, config)
+        start = time.perf_counter()
+        answer = turn_llm.invoke(messages)
+        if router:
+            router.record(label, time.perf_counter() - start, answer)
+        if cache:
+            cache.store(messages, answer)
+        return {"messages": [answer]}
+
+    async def achatbot(state: State, config: RunnableConfig):
+        messages, personal = context(state, config)
+        cache = semantic_cache if not personal else None
+        if cache and (answer := cache.lookup(messages)):
+            return {"messages": [answer]}
+        label, turn_llm = turn_model(state)
+        if prefetcher and (label is None or label.endswith("+tools")):
+            maybe_prefetch(state, config)
+        start = time.perf_counter()
+        answer = await turn_llm.ainvoke(messages)
+        if router:
+            router.record(label, time.perf_counter() - start, answer)
+        if cache:
+            cache.store(messages, answer)
+        return {"messages": [answer]}
+
+    if history_policy:
+        schema = RoutedSummaryState if router else SummaryState
+    else:
+        schema = RoutedState if router else State
+    graph_builder = StateGraph(schema)
+    graph_builder.add_node("chatbot", RunnableLambda(chatbot, afunc=achatbot, name="chatbot"))
+
+    # The model (and tool binding) is chosen once per turn, right before the chatbot
+    entry = "chatbot"
+    if router:
+        graph_builder.add_node("router", router.node)
+        graph_builder.add_edge("router", "chatbot")
+        entry = "router"
+
+    # Each turn starts by folding old messages into the rolling summary
+    if history_policy:
+        graph_builder.add_node("summarize", summarize_history(llm, history_policy))
+        graph_builder.add_edge(START, "summarize")
+        graph_builder.add_edge("summarize", entry)
+    else:
+        graph_builder.add_edge(START, entry)
+
+    if tools:
+        graph_builder.add_node("tools", ParallelToolNode(tools=tools, timeout=30, max_concurrency=8))
+        graph_builder.add_conditional_edges("chatbot", tools_condition)
+        # Every time a tool is called, return to the chatbot (through the
+        # compaction step, which shrinks the results before the model sees them)
+        # Opt-in: a compacted message keeps only a reference to the full
+        # results, which outlive the process only in a SQLite PayloadStore
+        if compaction is None and os.getenv("TOOL_OUTPUT_TOKENS"):
+            store = PayloadStore(os.getenv("TOOL_PAYLOAD_DB"))
+            compaction = ToolOutputCompactor(store, max_tokens=int(os.getenv("TOOL_OUTPUT_TOKENS")))
+        if compaction:
+            graph_builder.add_node("compact", RunnableLambda(compaction, name="compact"))
+            graph_builder.add_edge("tools", "compact")
+            graph_builder.add_edge("compact", "chatbot")
+        else:
+            graph_builder.add_edge("tools", "chatbot")
+    else:
+        graph_builder.add_edge("chatbot", END)
+
+    graph = graph_builder.compile(checkpointer=checkpointer)
+    _COMPONENTS[graph_builder] = GraphComponents(
+        prefetcher=prefetcher,
+        semantic_cache=semantic_cache or None,
+        long_term_memory=long_term_memory or None,
+        router=router or None,
+    )
+    return graph
@@ -0,0 +1,122 @@
+# ---------------------------------------------------
+# Bounded conversation history with a rolling summary
+# ---------------------------------------------------
+# Without a policy every turn appends to State.messages and the whole list is
+# sent to the LLM, so prompt size grows with the conversation. A `summarize`
+# node placed before `chatbot` keeps only the recent window (last N messages
+# and/or a token budget), folds the older messages into `summary` and removes
+# them from the state:
+#
+#     graph_builder.add_node("summarize", summarize_history(llm, HistoryPolicy(max_messages=20)))
+#     graph_builder.add_edge("summarize", "chatbot")
+#     graph_builder.set_entry_point("summarize")
+#
+# and the chatbot node sends `with_summary(state)` instead of state["messages"].
+from dataclasses import dataclass, field
+from typing import Optional
+
+from langchain_core.messages import HumanMessage, RemoveMessage, SystemMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.runnables import RunnableLambda
+
+from langgraph_playground.state import State
+
+
+# State of the graphs that use a history policy
+class SummaryState(State):
+    summary: str
+
+
+SUMMARY_PROMPT = (
+    "Summarize the conversation below in a few sentences, keeping names, facts "
+    "and decisions the user may refer to later.\n\n"
+    "Current summary:\n{summary}\n\nNew messages:\n{messages}"
+)
+
+
+@dataclass
+class HistoryPolicy:
+    """How much of the conversation is sent to the LLM as-is.
+
+    ``max_messages`` and ``max_tokens`` can be combined; the stricter one
+    wins. The window always starts at a user message, so an AI tool call is
+    never separated from its ToolMessage results.
+    """
+
+    max_messages: Optional[int] = 20
+    max_tokens: Optional[int] = None
+
+    def split(self, messages: list) -> tuple:
+        """Return ``(older, recent)``; ``older`` is what should be summarized."""
+        start = 0
+        if self.max_messages is not None:
+            start = max(0, len(messages) - self.max_messages)
+        if self.max_tokens is not None:
+            sizes = [count_tokens_approximately([m]) for m in messages]
+            total = sum(sizes[start:])
+            while start < len(messages) and total > self.max_tokens:
+                total -= sizes[start]
+                start += 1
+        if start == 0:
+            return [], messages
+        # The window starts at the next user message; if the budget would
+        # drop the current question too, it starts at the latest one
+        humans = [i for i, m in enumerate(messages) if isinstance(m, HumanMessage)]
+        later = [i for i in humans if i >= start]
+        if later:
+            start = later[0]
+        elif humans:
+            start = humans[-1]
+        return messages[:start], messages[start:]
+
+
+def summarize_history(llm, policy: HistoryPolicy):
+    """Build the `summarize` node: fold messages outside the window into the summary."""
+
+    def prepare(state: SummaryState):
+        older, _ = policy.split(state["messages"])
+        if not older:
+            return older, None
+        transcript = "\n".join(f"{m.type}: {m.content}" for m in older if m.content)
+        prompt = SUMMARY_PROMPT.format(summary=state.get("summary") or "(none)", messages=transcript)
+        return older, [HumanMessage(prompt)]
+
+    def update(older: list, summary: str):
+        return {
+            "summary": summary,
+            "messages": [RemoveMessage(id=m.id) for m in older],
+        }
+
+    def summarize(state: SummaryState):
+        older, prompt = prepare(state)
+        return update(older, llm.invoke(prompt).content) if older else {}
+
+    async def asummarize(state: SummaryState):
+        older, prompt = prepare(state)
+        return update(older, (await llm.ainvoke(prompt)).content) if older else {}
+
+    # Same node for graph.invoke and graph.ainvoke
+    return RunnableLambda(summarize, afunc=asummarize, name="summarize")
+
+
+def with_summary(state: SummaryState) -> list:
+    """Messages to send to the LLM: the rolling summary (if any) plus the window."""
+    if summary := state.get("summary"):
+        return [SystemMessage(f"Summary of the earlier conversation: {summary}")] + state["messages"]
+    return state["messages"]
+
+
+@dataclass
+class PromptTokenMeter:
+    """Records the (approximate) prompt tokens of every LLM request."""
+
+    samples: list = field(default_factory=list)
+
+    def record(self, messages: list) -> int:
+        tokens = count_tokens_approximately(messages)
+        self.samples.append(tokens)
+        return tokens
+
+    @property
+    def mean(self) -> float:
+        return sum(self.samples) / len(self.samples) if self.samples else 0.0
@@ -0,0 +1,331 @@
+# ---------------------------------------------------
+# Opt-in latency / token instrumentation for a compiled graph
+# ---------------------------------------------------
+# Shows where a turn's time goes (chatbot, tools, summarize, checkpoint
+# writes, LangGraph's own scheduling) without attaching a profiler:
+#
+#     metrics = GraphMetrics(trace_path="trace.jsonl")
+#     saver = MeasuredCheckpointer(default_checkpointer(), metrics)
+#     graph = instrument(build_graph("memory", checkpointer=saver), metrics)
+#     ...
+#     print(metrics.to_prometheus())          # or serve_prometheus(metrics, 9464)
+#
+# Everything is collected through a LangChain callback handler (node runs are
+# the direct children of the graph run; LLM usage comes from on_llm_end) and a
+# thin wrapper around the checkpointer, passed to build_graph, that measures
+# each put: its time and the bytes the wrapped saver serialized for it (for
+# a delta checkpointer, the delta, not the full state). Per-thread
+# totals are kept in `metrics.threads`; the Prometheus output is aggregated by
+# node/tool to keep label cardinality bounded. Each event is also appended as
+# one JSON line to `trace_path` when given.
+import json
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langgraph.checkpoint.base import BaseCheckpointSaver
+
+
+def _thread_total() -> dict:
+    return {
+        "turns": 0,
+        "turn_seconds": 0.0,
+        "node_seconds": defaultdict(float),
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "tool_calls": 0,
+        "checkpoint_writes": 0,
+        "checkpoint_bytes": 0,
+    }
+
+
+class GraphMetrics:
+    """Thread-safe store for the collected metrics."""
+
+    def __init__(self, trace_path: Optional[str] = None) -> None:
+        self.lock = threading.Lock()
+        self.trace_path = trace_path
+        self._trace = open(trace_path, "a", encoding="utf-8") if trace_path else None
+        self.node_count = defaultdict(int)
+        self.node_seconds = defaultdict(float)
+        self.tokens = defaultdict(int)  # (node, "prompt" | "completion") -> tokens
+        self.tool_calls = defaultdict(int)
+        self.turns = 0
+        self.turn_seconds = 0.0
+        self.overhead_seconds = 0.0
+        self.checkpoint_writes = 0
+        self.checkpoint_seconds = 0.0
+        self.checkpoint_bytes = 0
+        self.threads = defaultdict(_thread_total)
+
+    def record(self, event: str, thread_id: Optional[str], **fields: Any) -> None:
+        """Update the aggregates for one event and append it to the trace."""
+        with self.lock:
+            thread = self.threads[thread_id or "-"]
+            if event == "node":
+                self.node_count[fields["node"]] += 1
+                self.node_seconds[fields["node"]] += fields["seconds"]
+                thread["node_seconds"][fields["node"]] += fields["seconds"]
+            elif event == "llm":
+                self.tokens[(fields["node"], "prompt")] += fields["prompt_tokens"]
+                self.tokens[(fields["node"], "completion")] += fields["completion_tokens"]
+                thread["prompt_tokens"] += fields["prompt_tokens"]
+                thread["completion_tokens"] += fields["completion_tokens"]
+            elif event == "tool":
+                self.tool_calls[fields["tool"]] += 1
+                thread["tool_calls"] += 1
+            elif event == "turn":
+                self.turns += 1
+                self.turn_seconds += fields["seconds"]
+                self.overhead_seconds += fields["overhead_seconds"]
+                thread["turns"] += 1
+                thread["turn_seconds"] += fields["seconds"]
+            elif event == "checkpoint":
+                self.checkpoint_writes += 1
+                self.checkpoint_seconds += fields["seconds"]
+                self.checkpoint_bytes += fields["bytes"]
+                thread["checkpoint_writes"] += 1
+                thread["checkpoint_bytes"] = fields["bytes"]
+            if self._trace:
+                line = {"ts": time.time(), "event": event, "thread_id": thread_id, **fields}
+                self._trace.write(json.dumps(line) + "\n")
+                self._trace.flush()
+
+    def to_prometheus(self) -> str:
+        """Render the aggregates in the Prometheus text exposition format."""
+        with self.lock:
+            lines = [
+                "# HELP langgraph_node_duration_seconds Wall time spent in each graph node.",
+                "# TYPE langgraph_node_duration_seconds summary",
+            ]
+            for node in sorted(self.node_count):
+                lines.append(f'langgraph_node_duration_seconds_sum{{node="{node}"}} {self.node_seconds[node]:.6f}')
+                lines.append(f'langgraph_node_duration_seconds_count{{node="{node}"}} {self.node_count[node]}')
+            lines += [
+                "# HELP langgraph_turn_duration_seconds Wall time of whole graph runs.",
+                "# TYPE langgraph_turn_duration_seconds summary",
+                f"langgraph_turn_duration_seconds_sum {self.turn_seconds:.6f}",
+                f"langgraph_turn_duration_seconds_count {self.turns}",
+                "# HELP langgraph_scheduler_overhead_seconds_total Turn time not spent inside any node.",
+                "# TYPE langgraph_scheduler_overhead_seconds_total counter",
+                f"langgraph_scheduler_overhead_seconds_total {self.overhead_seconds:.6f}",
+                "# HELP langgraph_llm_tokens_total LLM tokens by node and kind.",
+                "# TYPE langgraph_llm_tokens_total counter",
+            ]
+            for (node, kind), value in sorted(self.tokens.items()):
+                lines.append(f'langgraph_llm_tokens_total{{node="{node}",kind="{kind}"}} {value}')
+            lines += [
+                "# HELP langgraph_tool_calls_total Tool invocations by tool name.",
+                "# TYPE langgraph_tool_calls_total counter",
+            ]
+            for tool, value in sorted(self.tool_calls.items()):
+                lines.append(f'langgraph_tool_calls_total{{tool="{tool}"}} {value}')
+            lines += [
+                "# HELP langgraph_checkpoint_writes_total Checkpoints saved.",
+                "# TYPE langgraph_checkpoint_writes_total counter",
+                f"langgraph_checkpoint_writes_total {self.checkpoint_writes}",
+                "# HELP langgraph_checkpoint_write_seconds_total Time spent in checkpointer.put.",
+                "# TYPE langgraph_checkpoint_write_seconds_total counter",
+                f"langgraph_checkpoint_write_seconds_total {self.checkpoint_seconds:.6f}",
+                "# HELP langgraph_checkpoint_bytes_total Serialized size of the saved checkpoints.",
+                "# TYPE langgraph_checkpoint_bytes_total counter",
+                f"langgraph_checkpoint_bytes_total {self.checkpoint_bytes}",
+            ]
+        return "\n".join(lines) + "\n"
+
+    def close(self) -> None:
+        if self._trace:
+            self._trace.close()
+            self._trace = None
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """Turns LangGraph/LangChain callback events into GraphMetrics records."""
+
+    run_inline = True
+
+    def __init__(self, metrics: GraphMetrics) -> None:
+        self.metrics = metrics
+        self.graph_runs: dict = {}  # root run id -> [start, thread_id, node seconds]
+        self.node_runs: dict = {}  # node run id -> (start, node, root run id)
+        self.llm_runs: dict = {}  # llm run id -> (node, thread_id)
+
+    def on_chain_start(self, serialized, inputs, *, run_id: UUID, parent_run_id: Optional[UUID] = None,
+                       metadata: Optional[dict] = None, **kwargs: Any) -> None:
+        metadata = metadata or {}
+        if parent_run_id is None:
+            self.graph_runs[run_id] = [time.perf_counter(), metadata.get("thread_id"), 0.0]
+        elif parent_run_id in self.graph_runs and metadata.get("langgraph_node"):
+            self.node_runs[run_id] = (time.perf_counter(), metadata["langgraph_node"], parent_run_id)
+
+    def on_chain_end(self, outputs, *, run_id: UUID, **kwargs: Any) -> None:
+        now = time.perf_counter()
+        if run_id in self.node_runs:
+            start, node, root = self.node_runs.pop(run_id)
+            graph_run = self.graph_runs.get(root)
+            if graph_run is not None and node != "__start__":
+                graph_run[2] += now - start
+                self.metrics.record("node", graph_run[1], node=node, seconds=now - start)
+        elif run_id in self.graph_runs:
+            start, thread_id, node_seconds = self.graph_runs.pop(run_id)
+            self.metrics.record(
+                "turn", thread_id, seconds=now - start, overhead_seconds=max(0.0, now - start - node_seconds)
+            )
+
+    def on_chain_error(self, error, *, run_id: UUID, **kwargs: Any) -> None:
+        self.node_runs.pop(run_id, None)
+        self.graph_runs.pop(run_id, None)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata: Optional[dict] = None,
+                            **kwargs: Any) -> None:
+        metadata = metadata or {}
+        self.llm_runs[run_id] = (metadata.get("langgraph_node"), metadata.get("thread_id"))
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any) -> None:
+        node, thread_id = self.llm_runs.pop(run_id, (None, None))
+        prompt_tokens = completion_tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                prompt_tokens += usage.get("input_tokens", 0)
+                completion_tokens += usage.get("output_tokens", 0)
+        if not prompt_tokens and response.llm_output:
+            usage = response.llm_output.get("token_usage") or {}
+            prompt_tokens = usage.get("prompt_tokens", 0)
+            completion_tokens = usage.get("completion_tokens", 0)
+        self.metrics.record(
+            "llm", thread_id, node=node or "-", prompt_tokens=prompt_tokens, completion_tokens=completion_tokens
+        )
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs: Any) -> None:
+        self.llm_runs.pop(run_id, None)
+
+    def on_tool_start(self, serialized, input_str, *, run_id: UUID, metadata: Optional[dict] = None,
+                      **kwargs: Any) -> None:
+        self.metrics.record("tool", (metadata or {}).get("thread_id"), tool=serialized.get("name", "-"))
+
+
+class _CountingSerde:
+    """Serializer proxy adding up, per thread, the bytes it produces."""
+
+    def __init__(self, inner) -> None:
+        self.inner = inner
+        self.local = threading.local()
+
+    def reset(self) -> None:
+        self.local.bytes = 0
+
+    @property
+    def bytes(self) -> int:
+        return getattr(self.local, "bytes", 0)
+
+    def dumps_typed(self, obj: Any) -> tuple:
+        type_, data = self.inner.dumps_typed(obj)
+        self.local.bytes = self.bytes + len(data)
+        return type_, data
+
+    def __getattr__(self, name: str):
+        # loads_typed, dumps, loads... are not counted
+        return getattr(self.inner, name)
+
+
+class MeasuredCheckpointer(BaseCheckpointSaver):
+    """Delegates to another checkpointer and records the size and time of each put.
+
+    The size is what the wrapped saver serialized during the put (counted
+    through its serde), so nothing is serialized twice. Pass the wrapper to
+    `build_graph(checkpointer=...)` before the graph is compiled.
+    """
+
+    def __init__(self, inner: BaseCheckpointSaver, metrics: GraphMetrics) -> None:
+        self.counter = _CountingSerde(inner.serde)
+        inner.serde = self.counter
+        super().__init__(serde=self.counter)
+        self.inner = inner
+        self.metrics = metrics
+
+    def _record(self, config, seconds: float) -> None:
+        self.metrics.record(
+            "checkpoint", config["configurable"].get("thread_id"), bytes=self.counter.bytes, seconds=seconds
+        )
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        self.counter.reset()
+        start = time.perf_counter()
+        result = self.inner.put(config, checkpoint, metadata, new_versions)
+        self._record(config, time.perf_counter() - start)
+        return result
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        # The savers in this repo serialize synchronously inside aput, on this thread
+        self.counter.reset()
+        start = time.perf_counter()
+        result = await self.inner.aput(config, checkpoint, metadata, new_versions)
+        self._record(config, time.perf_counter() - start)
+        return result
+
+    def get_tuple(self, config):
+        return self.inner.get_tuple(config)
+
+    async def aget_tuple(self, config):
+        return await self.inner.aget_tuple(config)
+
+    def list(self, config, **kwargs):
+        return self.inner.list(config, **kwargs)
+
+    def alist(self, config, **kwargs):
+        return self.inner.alist(config, **kwargs)
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        return self.inner.put_writes(config, writes, task_id, task_path)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        return await self.inner.aput_writes(config, writes, task_id, task_path)
+
+    def get_next_version(self, current, channel):
+        return self.inner.get_next_version(current, channel)
+
+    def __getattr__(self, name: str):
+        # Anything specific to the wrapped saver (flush, close...) passes through
+        return getattr(self.inner, name)
+
+
+def instrument(graph, metrics: GraphMetrics):
+    """Return ``graph`` bound to a callback handler that reports into ``metrics``.
+
+    The original compiled graph is left untouched, so instrumentation can be
+    switched on per process (e.g. behind an environment variable). Checkpoint
+    writes are only measured when the graph was built with a
+    `MeasuredCheckpointer` on the same ``metrics``.
+    """
+    return graph.with_config(callbacks=[MetricsCallbackHandler(metrics)])
+
+
+def serve_prometheus(
+    metrics: GraphMetrics, port: int = 9464, host: str = "0.0.0.0", *, extra: tuple = ()
+) -> ThreadingHTTPServer:
+    """Expose ``/metrics`` on a background thread (stdlib only).
+
+    ``extra`` adds other sources with a ``to_prometheus()`` method, e.g.
+    ``resilience.UPSTREAM_METRICS``.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = "".join(source.to_prometheus() for source in (metrics, *extra)).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,252 @@
+# ---------------------------------------------------
+# Long-term memory shared by all threads of a user
+# ---------------------------------------------------
+# The checkpointer remembers one conversation per thread_id; a new thread
+# starts from nothing, and inside a thread old facts only survive as part of
+# the (summarized) history. `LongTermMemory` keeps facts across threads:
+#
+#   1. after each user message, `extract_facts` keeps the statements the user
+#      makes about themselves ("my name is Ana", "I work with Rust",
+#      "remember that ...", and the PT-BR equivalents),
+#   2. each fact is embedded (`HashingEmbedder`, see semantic_cache.py) and
+#      stored in a SQLite table (vector as a float32 blob) under the user's
+#      namespace; near-duplicates only refresh the existing entry,
+#   3. before each chatbot call the top-k facts most similar to the current
+#      question are added to the prompt as a system message.
+#
+#     memory = LongTermMemory("memories.db")
+#     graph = build_graph("memory", long_term_memory=memory)   # or LONG_TERM_MEMORY_DB=...
+#     graph.invoke(inputs, {"configurable": {"thread_id": "t1", "user_id": "ana"}})
+#
+# Search is a matrix-vector product over the namespace's vectors, loaded from
+# SQLite once and kept in memory. The prompt grows by at most `top_k` short
+# facts, however many are stored. Turns without a user_id are neither
+# remembered nor given recalled facts: there is no user to scope them to, and
+# a shared fallback namespace would leak one caller's facts into another's prompt.
+import re
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig
+
+from langgraph_playground.semantic_cache import HashingEmbedder
+
+FACT = re.compile(
+    r"\b(my|mine|i am|i'm|i work|i live|i like|i love|i prefer|i use|i have|i've|i don't|i do not|"
+    r"call me|remember|meu|minha|meus|minhas|eu sou|eu moro|eu trabalho|eu gosto|eu prefiro|eu uso|"
+    r"eu tenho|me chamo|lembre)\b",
+    re.IGNORECASE,
+)
+SENTENCE = re.compile(r"(?<=[.!?;])\s+|\s*\n+\s*")
+MEMORY_PROMPT = "Facts the user shared in earlier conversations (use them only if relevant):\n{facts}"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memories (
+    namespace TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    used_at REAL NOT NULL,
+    PRIMARY KEY (namespace, id)
+) WITHOUT ROWID;
+"""
+
+
+def extract_facts(text: str, max_chars: int = 300) -> list:
+    """Statements the user makes about themselves (questions are not facts)."""
+    facts = []
+    for sentence in SENTENCE.split(text.strip()):
+        sentence = sentence.strip()
+        if 8 <= len(sentence) <= max_chars and not sentence.endswith("?") and FACT.search(sentence):
+            facts.append(sentence)
+    return facts
+
+
+class _Namespace:
+    """In-memory view of one namespace: ids, texts and a vector matrix.
+
+    The matrix grows by doubling, so adding a fact is amortized O(1);
+    `vectors` is the filled part.
+    """
+
+    def __init__(self, dim: int) -> None:
+        self.ids: list = []
+        self.texts: list = []
+        self.buffer = np.zeros((16, dim), dtype=np.float32)
+        self.next_id = 0
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self.buffer[: len(self.ids)]
+
+    def append(self, id_: int, text: str, vector: np.ndarray) -> None:
+        if len(self.ids) == len(self.buffer):
+            self.buffer = np.concatenate([self.buffer, np.zeros_like(self.buffer)])
+        self.buffer[len(self.ids)] = vector
+        self.ids.append(id_)
+        self.texts.append(text)
+        self.next_id = max(self.next_id, id_ + 1)
+
+    def remove(self, index: int) -> None:
+        # Move the last row into the hole (order does not matter for search)
+        last = len(self.ids) - 1
+        self.buffer[index] = self.buffer[last]
+        self.ids[index], self.texts[index] = self.ids[last], self.texts[last]
+        del self.ids[last], self.texts[last]
+
+
+class LongTermMemory:
+    """Cross-thread store of user facts with top-k vector retrieval.
+
+    Args:
+        path: SQLite file, or None to keep the memories in this process only.
+        embedder: Anything with `dim` and `embed(text) -> unit vector`;
+            `HashingEmbedder()` by default.
+        top_k: Facts added to each prompt.
+        min_score: Minimum cosine similarity for a fact to be retrieved.
+        duplicate_score: Similarity above which a new fact refreshes an
+            existing one instead of being added.
+        max_per_namespace: Facts kept per user; the least recently used go first.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        embedder=None,
+        *,
+        top_k: int = 3,
+        min_score: float = 0.25,
+        duplicate_score: float = 0.85,
+        max_per_namespace: int = 10_000,
+    ) -> None:
+        self.embedder = embedder or HashingEmbedder()
+        self.top_k = top_k
+        self.min_score = min_score
+        self.duplicate_score = duplicate_score
+        self.max_per_namespace = max_per_namespace
+        self.conn = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+        self.namespaces: dict = {}  # namespace -> _Namespace, loaded on first use
+        self.lock = threading.Lock()
+        self.stats = {"searches": 0, "retrieved": 0, "added": 0, "refreshed": 0, "search_seconds": 0.0}
+
+    @staticmethod
+    def namespace(config: Optional[RunnableConfig]) -> Optional[str]:
+        """The user's namespace, or None when the turn has no user_id."""
+        user_id = (config or {}).get("configurable", {}).get("user_id")
+        return str(user_id) if user_id else None
+
+    def _load(self, namespace: str) -> _Namespace:
+        ns = self.namespaces.get(namespace)
+        if ns is None:
+            ns = self.namespaces[namespace] = _Namespace(self.embedder.dim)
+            rows = self.conn.execute(
+                "SELECT id, text, vector FROM memories WHERE namespace = ? ORDER BY id", (namespace,)
+            ).fetchall()
+            for id_, text, vector in rows:
+                ns.append(id_, text, np.frombuffer(vector, dtype=np.float32))
+        return ns
+
+    # --- Memory API ---
+    def add(self, namespace: str, text: str) -> None:
+        """Store one fact (or refresh its near-duplicate)."""
+        vector = self.embedder.embed(text).astype(np.float32)
+        now = time.time()
+        with self.lock:
+            ns = self._load(namespace)
+            if ns.ids:
+                scores = ns.vectors @ vector
+                best = int(np.argmax(scores))
+                if scores[best] >= self.duplicate_score:
+                    # Same fact restated (maybe updated): keep the newest wording
+                    ns.texts[best] = text
+                    ns.buffer[best] = vector
+                    self.conn.execute(
+                        "UPDATE memories SET text = ?, vector = ?, used_at = ? WHERE namespace = ? AND id = ?",
+                        (text, vector.tobytes(), now, namespace, ns.ids[best]),
+                    )
+                    self.conn.commit()
+                    self.stats["refreshed"] += 1
+                    return
+            new_id = ns.next_id
+            ns.append(new_id, text, vector)
+            self.conn.execute(
+                "INSERT INTO memories VALUES (?, ?, ?, ?, ?, ?)", (namespace, new_id, text, vector.tobytes(), now, now)
+            )
+            if len(ns.ids) > self.max_per_namespace:
+                self._evict(namespace, ns)
+            self.conn.commit()
+            self.stats["added"] += 1
+
+    def _evict(self, namespace: str, ns: _Namespace) -> None:
+        (oldest,) = self.conn.execute(
+            "SELECT id FROM memories WHERE namespace = ? ORDER BY used_at, id LIMIT 1", (namespace,)
+        ).fetchone()
+        self.conn.execute("DELETE FROM memories WHERE namespace = ? AND id = ?", (namespace, oldest))
+        ns.remove(ns.ids.index(oldest))
+
+    def search(self, namespace: str, query: str, k: Optional[int] = None) -> list:
+        """Up to `k` (default `top_k`) stored facts most similar to `query`, best first."""
+        k = self.top_k if k is None else k
+        start = time.perf_counter()
+        vector = self.embedder.embed(query)
+        with self.lock:
+            ns = self._load(namespace)
+            self.stats["searches"] += 1
+            if not ns.ids or k <= 0:
+                self.stats["search_seconds"] += time.perf_counter() - start
+                return []
+            scores = ns.vectors @ vector
+            top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+            top = [int(i) for i in top[np.argsort(-scores[top])] if scores[i] >= self.min_score]
+            facts = [ns.texts[i] for i in top]
+            if top:
+                self.conn.executemany(
+                    "UPDATE memories SET used_at = ? WHERE namespace = ? AND id = ?",
+                    [(time.time(), namespace, ns.ids[i]) for i in top],
+                )
+                self.conn.commit()
+            self.stats["retrieved"] += len(facts)
+            self.stats["search_seconds"] += time.perf_counter() - start
+        return facts
+
+    def count(self, namespace: str) -> int:
+        with self.lock:
+            return len(self._load(namespace).ids)
+
+    # --- Graph integration ---
+    def prompt(self, messages: list, config: Optional[RunnableConfig]) -> list:
+        """`messages` preceded by the facts relevant to the latest user message."""
+        namespace = self.namespace(config)
+        question = next((m.content for m in reversed(messages) if isinstance(m, HumanMessage)), None)
+        if namespace is None or not isinstance(question, str):
+            return messages
+        facts = self.search(namespace, question)
+        if not facts:
+            return messages
+        memo = SystemMessage(MEMORY_PROMPT.format(facts="\n".join(f"- {fact}" for fact in facts)))
+        # After the summary (if any), before the conversation
+        head = 1 if messages and isinstance(messages[0], SystemMessage) else 0
+        return messages[:head] + [memo] + messages[head:]
+
+    def remember(self, messages: list, config: Optional[RunnableConfig]) -> None:
+        """Store the facts stated in the latest message, if it is the user's."""
+        namespace = self.namespace(config)
+        last = messages[-1] if messages else None
+        if namespace is not None and isinstance(last, HumanMessage) and isinstance(last.content, str):
+            for fact in extract_facts(last.content):
+                self.add(namespace, fact)
+
+    def report(self) -> str:
+        s = self.stats
+        mean_ms = s["search_seconds"] / s["searches"] * 1000 if s["searches"] else 0.0
+        return (
+            f"long-term memory: {s['added']} facts added, {s['refreshed']} refreshed, "
+            f"{s['searches']} searches ({mean_ms:.3f} ms each), {s['retrieved']} facts retrieved"
+        )
@@ -0,0 +1,101 @@
+# ---------------------------------------------------
+# Parallel tool execution with timeouts and a concurrency cap
+# ---------------------------------------------------
+# When the model emits several tool calls in one AIMessage (e.g. two web
+# searches), the `tools` node sits on the critical path. ParallelToolNode is a
+# ToolNode that runs all calls of the message at the same time -- on a thread
+# pool for the sync path, with asyncio.gather for the async path -- so the step
+# costs max(latency) instead of sum(latency). On top of ToolNode it adds:
+#
+# - `max_concurrency`: at most this many calls of one message run at once,
+#   started in call order as slots free up;
+# - `timeout`: a call still running `timeout` seconds after it started (time
+#   spent waiting for a slot does not count) becomes an error ToolMessage, so
+#   one slow upstream does not hold back the whole turn.
+#
+# Results keep the order of the tool calls in the AIMessage.
+import asyncio
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Any, Optional
+
+from langchain_core.messages import ToolMessage
+from langchain_core.runnables.config import ContextThreadPoolExecutor, get_config_list
+from langgraph.prebuilt import ToolNode
+
+
+def _timeout_message(call: dict, timeout: float) -> ToolMessage:
+    return ToolMessage(
+        content=f"Error: tool call timed out after {timeout:g}s",
+        name=call["name"],
+        tool_call_id=call["id"],
+        status="error",
+    )
+
+
+class ParallelToolNode(ToolNode):
+    """ToolNode with a per-call timeout and a cap on concurrent calls."""
+
+    def __init__(
+        self,
+        tools: list,
+        *,
+        timeout: Optional[float] = 30.0,
+        max_concurrency: int = 8,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(tools, **kwargs)
+        self.timeout = timeout
+        self.max_concurrency = max(1, max_concurrency)
+
+    def _func(self, input, config, *, store) -> Any:
+        tool_calls, input_type = self._parse_input(input, store)
+        config_list = get_config_list(config, len(tool_calls))
+        # Context-aware pool: callbacks (and stream_mode="messages") keep working.
+        # One thread per call, so that a call that timed out (its thread cannot
+        # be stopped) gives its slot back instead of blocking the next one
+        executor = ContextThreadPoolExecutor(max_workers=max(1, len(tool_calls)))
+        outputs: list = [None] * len(tool_calls)
+        waiting = list(range(len(tool_calls)))
+        running: dict = {}  # future -> (index, deadline)
+        try:
+            while waiting or running:
+                while waiting and len(running) < self.max_concurrency:
+                    i = waiting.pop(0)
+                    future = executor.submit(self._run_one, tool_calls[i], input_type, config_list[i])
+                    # The call's clock starts when it gets its slot
+                    running[future] = (i, None if self.timeout is None else time.monotonic() + self.timeout)
+                deadlines = [deadline for _, deadline in running.values() if deadline is not None]
+                remaining = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+                done, _ = wait(running, timeout=remaining, return_when=FIRST_COMPLETED)
+                now = time.monotonic()
+                for future, (i, deadline) in list(running.items()):
+                    if future in done:
+                        outputs[i] = future.result()
+                    elif deadline is not None and deadline <= now:
+                        outputs[i] = _timeout_message(tool_calls[i], self.timeout)
+                    else:
+                        continue
+                    del running[future]
+        finally:
+            # Do not wait for calls that timed out; their threads finish on their own
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return self._combine_tool_outputs(outputs, input_type)
+
+    async def _afunc(self, input, config, *, store) -> Any:
+        tool_calls, input_type = self._parse_input(input, store)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_one(call):
+            # The timeout starts once the call holds a slot
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(
+                        self._arun_one(call, input_type, config), self.timeout
+                    )
+                except asyncio.TimeoutError:
+                    return _timeout_message(call, self.timeout)
+
+        outputs = await asyncio.gather(*(run_one(call) for call in tool_calls))
+        return self._combine_tool_outputs(outputs, input_type)
@@ -0,0 +1,195 @@
+# ---------------------------------------------------
+# Speculative web search, started alongside the first LLM call
+# ---------------------------------------------------
+# A search turn normally costs LLM -> search -> LLM, one after the other.
+# With prefetching, the chatbot node looks at the user's message before
+# calling the model and, when it reads like a search (`looks_like_search`),
+# starts that search on a worker thread right away. If the model then asks
+# for a search with a matching query, the tools node takes the running (or
+# finished) prefetch instead of starting from zero:
+#
+#     graph = build_graph("web", prefetch=True)        # or SEARCH_PREFETCH=1
+#     ...
+#     print(components(graph).prefetcher.report())
+#
+# A model query "matches" when most of its words appear in the prefetched
+# query (`min_overlap`). Prefetches are kept per thread_id, one per turn
+# (runs without a thread_id are not prefetched); a prefetch the model never
+# asks for is counted as unused, and one that failed is searched again. Measured: prefetch
+# hit rate (of the searches the model made) and the seconds saved, i.e. the
+# part of each search that had already run when the model asked for it.
+import asyncio
+import functools
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import BaseTool
+
+from langgraph_playground.search_cache import failed_search, normalize_query
+
+SEARCH_HINTS = (
+    "latest", "news", "today", "current", "currently", "recent", "now", "this week",
+    "this year", "price", "weather", "score", "release", "search", "look up", "who won",
+)
+YEAR = re.compile(r"\b(19|20)\d\d\b")
+STOPWORDS = frozenset("a an and are do does for how i in is it me of on the to what when where which who why you".split())
+
+
+@functools.lru_cache(maxsize=None)
+def _hint_pattern(hints: tuple) -> re.Pattern:
+    # Whole words (plurals included): "now" must not match "know" or "snow"
+    return re.compile(r"\b(?:" + "|".join(re.escape(hint) for hint in hints) + r")(?:e?s)?\b")
+
+
+def looks_like_search(text: str, hints: tuple = SEARCH_HINTS) -> bool:
+    """Cheap guess of whether answering `text` needs fresh web results."""
+    text = text.lower()
+    return bool(YEAR.search(text)) or bool(hints and _hint_pattern(hints).search(text))
+
+
+def _words(query: str) -> set:
+    return {w.strip(",.;:!?'\"()") for w in normalize_query(query).split()} - STOPWORDS - {""}
+
+
+class SearchPrefetcher:
+    """Runs speculative searches and hands them to the matching tool calls."""
+
+    def __init__(self, tool: BaseTool, *, min_overlap: float = 0.6, max_workers: int = 8, max_pending: int = 1024):
+        self.tool = tool
+        self.min_overlap = min_overlap
+        self.max_pending = max_pending
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self.pending: OrderedDict = OrderedDict()  # thread key -> (query, future, started)
+        self.lock = threading.Lock()
+        self.stats = {"prefetched": 0, "hits": 0, "misses": 0, "unused": 0, "failed": 0, "saved_seconds": 0.0}
+
+    def start(self, key: Optional[str], query: str) -> None:
+        """Start searching `query` for the conversation `key`.
+
+        Does nothing without a key: concurrent runs without a thread_id
+        would otherwise take each other's searches.
+        """
+        if key is None:
+            return
+        started = time.perf_counter()
+        call = {"type": "tool_call", "name": self.tool.name, "args": {"query": query}, "id": "prefetch"}
+        future = self.executor.submit(self._search, call, started)
+        with self.lock:
+            self.stats["prefetched"] += 1
+            if self.pending.pop(key, None) is not None:
+                self.stats["unused"] += 1  # previous turn's prefetch was never asked for
+            self.pending[key] = (query, future, started)
+            while len(self.pending) > self.max_pending:
+                self.pending.popitem(last=False)
+                self.stats["unused"] += 1
+
+    def _search(self, call: dict, started: float) -> tuple:
+        message = self.tool.invoke(call)
+        return (message.content, message.artifact), time.perf_counter() - started
+
+    def take(self, key: Optional[str], query: str) -> Optional[tuple]:
+        """`(future, started)` of the prefetch for `key` if it matches `query`, else None."""
+        with self.lock:
+            entry = self.pending.pop(key, None)
+            if entry is not None and self._matches(entry[0], query):
+                self.stats["hits"] += 1
+                return entry[1], entry[2]
+            self.stats["misses"] += 1
+            if entry is not None:
+                self.stats["unused"] += 1
+            return None
+
+    def _matches(self, prefetched: str, query: str) -> bool:
+        wanted = _words(query)
+        return bool(wanted) and len(wanted & _words(prefetched)) / len(wanted) >= self.min_overlap
+
+    def record_failed(self) -> None:
+        """The prefetch handed out failed: count the search as a miss."""
+        with self.lock:
+            self.stats["hits"] -= 1
+            self.stats["misses"] += 1
+            self.stats["failed"] += 1
+
+    def record_saved(self, asked_at: float, started: float, duration: float) -> None:
+        """Seconds of the search already done when the model asked for it."""
+        with self.lock:
+            self.stats["saved_seconds"] += min(duration, max(0.0, asked_at - started))
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of the model's searches served by a prefetch."""
+        searches = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / searches if searches else 0.0
+
+    def report(self) -> str:
+        s = self.stats
+        return (
+            f"prefetch: {s['prefetched']} started, {s['hits']} hits / {s['hits'] + s['misses']} searches "
+            f"({self.hit_rate:.0%}), {s['unused']} unused, {s['failed']} failed, {s['saved_seconds']:.2f}s saved"
+        )
+
+
+class PrefetchedSearchTool(BaseTool):
+    """Search tool that first looks for a matching prefetch of this conversation."""
+
+    tool: BaseTool
+    prefetcher: Any
+    response_format: str = "content_and_artifact"
+
+    def __init__(self, tool: BaseTool, prefetcher: SearchPrefetcher, **kwargs: Any) -> None:
+        super().__init__(
+            tool=tool,
+            prefetcher=prefetcher,
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            **kwargs,
+        )
+
+    def _take(self, kwargs: dict, config: RunnableConfig) -> Optional[tuple]:
+        key = config.get("configurable", {}).get("thread_id")
+        return self.prefetcher.take(key, kwargs.get("query", ""))
+
+    def _prefetched(self, result: Optional[tuple], asked_at: float, started: float) -> Optional[tuple]:
+        """The prefetched `(content, artifact)`, or None if the prefetch failed."""
+        if result is None or failed_search(result[0]):
+            self.prefetcher.record_failed()
+            return None
+        value, duration = result
+        self.prefetcher.record_saved(asked_at, started, duration)
+        return value
+
+    def _call(self, kwargs: dict) -> dict:
+        return {"type": "tool_call", "name": self.tool.name, "args": kwargs, "id": "prefetch-miss"}
+
+    def _run(self, config: RunnableConfig, run_manager=None, **kwargs: Any) -> tuple:
+        asked_at = time.perf_counter()
+        if entry := self._take(kwargs, config):
+            future, started = entry
+            try:
+                result = future.result()
+            except Exception:
+                result = None
+            if (value := self._prefetched(result, asked_at, started)) is not None:
+                return value
+        # No usable prefetch: search for real
+        message = self.tool.invoke(self._call(kwargs))
+        return message.content, message.artifact
+
+    async def _arun(self, config: RunnableConfig, run_manager=None, **kwargs: Any) -> tuple:
+        asked_at = time.perf_counter()
+        if entry := self._take(kwargs, config):
+            future, started = entry
+            try:
+                result = await asyncio.wrap_future(future)
+            except Exception:
+                result = None
+            if (value := self._prefetched(result, asked_at, started)) is not None:
+                return value
+        message = await self.tool.ainvoke(self._call(kwargs))
+        return message.content, message.artifact
@@ -0,0 +1,363 @@
+# ---------------------------------------------------
+# Resilient upstream calls: pooling, deadlines, retries, circuit breaking
+# ---------------------------------------------------
+# Both providers go through an `Upstream` (one per provider, process-wide):
+#
+#   TOGETHER: ChatTogether's httpx client uses `ResilientTransport`, so every
+#             HTTP request of the OpenAI-compatible SDK (streaming included)
+#             is retried / short-circuited below the SDK (its own retries off)
+#   TAVILY  : `ResilientTavilyAPIWrapper` sends searches through one pooled
+#             `requests.Session` instead of a new connection per call
+#
+# Each call gets a per-attempt timeout and an overall deadline. Only failures
+# where the request was never processed are retried: connect-phase errors
+# (DNS, refused connection, connect/pool timeout) and 429/5xx answers, after
+# the Retry-After the upstream asks for, or full-jitter exponential backoff
+# without one. Read timeouts and dropped connections are not retried: the
+# completion POST may already be running upstream, and a retry would bill
+# and run it twice. Every failure (retried or not) feeds a circuit
+# breaker: after `failure_threshold` in a row the upstream is considered down
+# and calls fail fast with `CircuitOpenError` for `reset_timeout` seconds,
+# then a single probe decides whether it closes again (a probe that never
+# finishes, e.g. cancelled, reopens it for another `reset_timeout`). Calls,
+# retries, timeouts, failures and short-circuits are counted in `UPSTREAM_METRICS`
+# (Prometheus text via `to_prometheus()`, also served by `serve_prometheus`).
+import asyncio
+import email.utils
+import functools
+import random
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import httpx
+import requests
+from langchain_community.utilities.tavily_search import TAVILY_API_URL, TavilySearchAPIWrapper
+from urllib3.exceptions import MaxRetryError
+
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+TIMEOUT_ERRORS = (httpx.TimeoutException, requests.Timeout)
+UPSTREAM_ERRORS = (httpx.TransportError, requests.RequestException)
+# Raised before the request was sent: safe to retry even for a POST
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout, requests.ConnectTimeout)
+
+
+def is_connect_error(exc: BaseException) -> bool:
+    """True if `exc` happened while connecting, before the request went out."""
+    if isinstance(exc, CONNECT_ERRORS):
+        return True
+    # requests wraps connect failures (DNS, refused) in a MaxRetryError; errors
+    # on an open connection (reset, aborted read) come through unwrapped
+    return isinstance(exc, requests.ConnectionError) and bool(exc.args) and isinstance(exc.args[0], MaxRetryError)
+
+
+def retry_after(response) -> Optional[float]:
+    """Seconds from the Retry-After header (delta-seconds or HTTP date), if any."""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the upstream while its circuit is open."""
+
+
+@dataclass
+class RetryPolicy:
+    """How often and how long to try one upstream call."""
+
+    attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    timeout: float = 30.0
+    """Seconds for one attempt (applied as the HTTP client timeout)."""
+    deadline: float = 90.0
+    """Seconds for the whole call, retries and backoff included."""
+
+    def backoff(self, attempt: int) -> float:
+        """Full jitter: uniform in [0, min(max_delay, base_delay * 2^attempt)]."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+class CircuitBreaker:
+    """Closed -> open after `failure_threshold` failures -> half-open probe."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self.lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"  # let exactly one probe through
+                return True
+            return self.state == "closed"
+
+    def success(self) -> None:
+        with self.lock:
+            self.state, self.failures = "closed", 0
+
+    def failure(self) -> None:
+        with self.lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state, self.opened_at = "open", time.monotonic()
+
+    def abandon(self) -> None:
+        """A call ended without an outcome (cancelled, unexpected error).
+
+        Nothing is counted, but an unfinished probe reopens the circuit for
+        another `reset_timeout`; otherwise no later call could probe again.
+        """
+        with self.lock:
+            if self.state == "half_open":
+                self.state, self.opened_at = "open", time.monotonic()
+
+
+class UpstreamMetrics:
+    """Thread-safe counters per upstream: calls, retries, timeouts, failures, short_circuits."""
+
+    EVENTS = ("calls", "retries", "timeouts", "failures", "short_circuits")
+
+    def __init__(self) -> None:
+        self.counts: dict = defaultdict(int)  # (upstream, event) -> count
+        self.lock = threading.Lock()
+
+    def count(self, upstream: str, event: str) -> None:
+        with self.lock:
+            self.counts[upstream, event] += 1
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            upstreams = sorted({name for name, _ in self.counts})
+            return {name: {event: self.counts[name, event] for event in self.EVENTS} for name in upstreams}
+
+    def to_prometheus(self) -> str:
+        lines = []
+        for event in self.EVENTS:
+            lines += [
+                f"# HELP upstream_{event}_total Upstream {event.replace('_', ' ')} per provider.",
+                f"# TYPE upstream_{event}_total counter",
+            ]
+            for name, counts in self.snapshot().items():
+                lines.append(f'upstream_{event}_total{{upstream="{name}"}} {counts[event]}')
+        return "\n".join(lines) + "\n"
+
+
+UPSTREAM_METRICS = UpstreamMetrics()
+
+
+class Upstream:
+    """Retry + circuit breaker + metrics around the calls to one provider."""
+
+    def __init__(
+        self,
+        name: str,
+        policy: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        metrics: UpstreamMetrics = UPSTREAM_METRICS,
+    ) -> None:
+        self.name = name
+        self.policy = policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.metrics = metrics
+
+    def _admit(self) -> None:
+        self.metrics.count(self.name, "calls")
+        if not self.breaker.allow():
+            self.metrics.count(self.name, "short_circuits")
+            raise CircuitOpenError(f"{self.name} is unavailable (circuit open), failing fast")
+
+    def _should_retry(self, attempt: int, started: float, outcome) -> Optional[float]:
+        """Backoff before the next attempt, or None to give up with `outcome`.
+
+        `outcome` is an exception or a retryable (429/5xx) response; the
+        upstream's Retry-After replaces the backoff when it sends one.
+        """
+        if isinstance(outcome, TIMEOUT_ERRORS):
+            self.metrics.count(self.name, "timeouts")
+        if isinstance(outcome, BaseException):
+            if not is_connect_error(outcome):
+                return None
+            delay = self.policy.backoff(attempt)
+        else:
+            delay = retry_after(outcome)
+            if delay is None:
+                delay = self.policy.backoff(attempt)
+        if attempt + 1 >= self.policy.attempts:
+            return None
+        if time.monotonic() - started + delay >= self.policy.deadline:
+            return None
+        self.metrics.count(self.name, "retries")
+        return delay
+
+    def _finish(self, failed: bool) -> bool:
+        if failed:
+            self.metrics.count(self.name, "failures")
+            self.breaker.failure()
+        else:
+            self.breaker.success()
+        return True
+
+    def call(self, attempt_fn: Callable, close: Callable = lambda response: response.close()):
+        """Run `attempt_fn()` (returns a response) with retries.
+
+        Retryable responses (429/5xx) are closed with `close` before the
+        next attempt; the last one is returned as is for the caller to raise.
+        """
+        self._admit()
+        started = time.monotonic()
+        attempt = 0
+        finished = False
+        try:
+            while True:
+                try:
+                    response = attempt_fn()
+                except UPSTREAM_ERRORS as exc:
+                    delay = self._should_retry(attempt, started, exc)
+                    if delay is None:
+                        finished = self._finish(failed=True)
+                        raise
+                else:
+                    if response.status_code not in RETRY_STATUS:
+                        finished = self._finish(failed=False)
+                        return response
+                    delay = self._should_retry(attempt, started, response)
+                    if delay is None:
+                        finished = self._finish(failed=True)
+                        return response
+                    close(response)
+                time.sleep(delay)
+                attempt += 1
+        finally:
+            if not finished:
+                self.breaker.abandon()
+
+    async def acall(self, attempt_fn: Callable):
+        """Async `call`: `attempt_fn()` returns an awaitable httpx response."""
+        self._admit()
+        started = time.monotonic()
+        attempt = 0
+        finished = False
+        try:
+            while True:
+                try:
+                    response = await attempt_fn()
+                except UPSTREAM_ERRORS as exc:
+                    delay = self._should_retry(attempt, started, exc)
+                    if delay is None:
+                        finished = self._finish(failed=True)
+                        raise
+                else:
+                    if response.status_code not in RETRY_STATUS:
+                        finished = self._finish(failed=False)
+                        return response
+                    delay = self._should_retry(attempt, started, response)
+                    if delay is None:
+                        finished = self._finish(failed=True)
+                        return response
+                    await response.aclose()
+                await asyncio.sleep(delay)
+                attempt += 1
+        finally:
+            # Cancelled, or an error that is not the upstream's
+            if not finished:
+                self.breaker.abandon()
+
+
+TOGETHER = Upstream("together")
+TAVILY = Upstream("tavily", RetryPolicy(timeout=15.0, deadline=30.0))
+
+
+# --- httpx (ChatTogether) ---
+POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30)
+
+
+class ResilientTransport(httpx.BaseTransport):
+    """Pooled httpx transport whose requests go through an `Upstream`."""
+
+    def __init__(self, upstream: Upstream, transport: Optional[httpx.BaseTransport] = None) -> None:
+        self.upstream = upstream
+        self.transport = transport or httpx.HTTPTransport(limits=POOL_LIMITS)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self.upstream.call(lambda: self.transport.handle_request(request))
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncResilientTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of `ResilientTransport`."""
+
+    def __init__(self, upstream: Upstream, transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        self.upstream = upstream
+        self.transport = transport or httpx.AsyncHTTPTransport(limits=POOL_LIMITS)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self.upstream.acall(lambda: self.transport.handle_async_request(request))
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+# --- requests (Tavily) ---
+@functools.lru_cache(maxsize=None)
+def shared_requests_session() -> requests.Session:
+    """Process-wide `requests.Session` with a keep-alive pool."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=32)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class ResilientTavilyAPIWrapper(TavilySearchAPIWrapper):
+    """Tavily API wrapper over the pooled session, with the TAVILY upstream policy."""
+
+    def raw_results(
+        self,
+        query: str,
+        max_results: Optional[int] = 5,
+        search_depth: Optional[str] = "advanced",
+        include_domains: Optional[list] = [],
+        exclude_domains: Optional[list] = [],
+        include_answer: Optional[bool] = False,
+        include_raw_content: Optional[bool] = False,
+        include_images: Optional[bool] = False,
+    ) -> dict:
+        params = {
+            "api_key": self.tavily_api_key.get_secret_value(),
+            "query": query,
+            "max_results": max_results,
+            "search_depth": search_depth,
+            "include_domains": include_domains,
+            "exclude_domains": exclude_domains,
+            "include_answer": include_answer,
+            "include_raw_content": include_raw_content,
+            "include_images": include_images,
+        }
+        session = shared_requests_session()
+        response = TAVILY.call(
+            lambda: session.post(f"{TAVILY_API_URL}/search", json=params, timeout=TAVILY.policy.timeout)
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def raw_results_async(self, *args, **kwargs) -> dict:
+        # The pooled session is synchronous; a worker thread keeps the loop free
+        return await asyncio.to_thread(self.raw_results, *args, **kwargs)
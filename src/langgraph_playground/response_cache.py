@@ -0,0 +1,207 @@
+# ---------------------------------------------------
+# Response cache for deterministic LLM calls
+# ---------------------------------------------------
+# All the chatbots use temperature=0, so the same message history always
+# gets the same answer. ResponseCache implements LangChain's BaseCache, which
+# chat models consult before calling the provider:
+#
+#     llm = ChatTogether(..., temperature=0, cache=ResponseCache(".cache/llm.db"))
+#     llm_with_tools = llm.bind_tools(tools)   # bound tools are part of the key
+#
+# `default_llm()` (graph.py) only attaches one when LLM_CACHE=1 (memory) or
+# LLM_CACHE_DB (memory + SQLite) is set.
+#
+# The key is a SHA-256 of the normalized messages (type, content, tool calls;
+# run-specific ids and response metadata are dropped) plus LangChain's
+# llm_string (model name, temperature, bound tools...). Lookups hit an
+# in-memory LRU first and then an optional SQLite file with a TTL and a size
+# cap (least recently used rows are evicted first). Disk entries are stored
+# with the compact message serializer (serialization.py); rows written as
+# LangChain JSON by older versions are still read.
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from langchain_core._api import suppress_langchain_beta_warning
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import ChatGeneration
+
+from langgraph_playground.serialization import MessageSerializer
+
+# Message fields that identify a run rather than the conversation
+_VOLATILE_FIELDS = {"id", "response_metadata", "usage_metadata", "additional_kwargs"}
+
+
+def _normalize(node: Any) -> Any:
+    if isinstance(node, dict):
+        return {
+            k: _normalize(v)
+            for k, v in sorted(node.items())
+            if k not in _VOLATILE_FIELDS and k != "tool_call_id"
+        }
+    if isinstance(node, list):
+        return [_normalize(v) for v in node]
+    return node
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    """Hash of the serialized messages (normalized) plus the model settings."""
+    messages = _normalize(json.loads(prompt))
+    payload = json.dumps([messages, llm_string], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+_SERDE = MessageSerializer()
+
+
+def _encode(generations: list):
+    """Compact bytes for chat generations, LangChain JSON text for anything else."""
+    if all(type(g) is ChatGeneration for g in generations):
+        type_, data = _SERDE.dumps_typed([[g.message, g.generation_info] for g in generations])
+        if type_ == "msgpack-lc":
+            return data
+    return dumps(generations)
+
+
+def _decode(value) -> list:
+    if isinstance(value, bytes):
+        pairs = _SERDE.loads_typed(("msgpack-lc", value))
+        return [ChatGeneration(message=message, generation_info=info) for message, info in pairs]
+    with suppress_langchain_beta_warning():
+        return loads(value)
+
+
+def _strip_ids(generations: list) -> list:
+    # A cached message must not reuse the id of the original answer, otherwise
+    # add_messages would treat it as an update of that message
+    return [g.model_copy(update={"message": g.message.model_copy(update={"id": None})}) for g in generations]
+
+
+class ResponseCache(BaseCache):
+    """Two-tier (memory LRU + SQLite) cache of chat model generations.
+
+    Args:
+        path: SQLite file for the disk tier, or None for memory only.
+        max_entries: Size of the in-memory LRU.
+        ttl: Seconds an entry stays valid (None = forever).
+        max_disk_bytes: Approximate cap for the disk tier.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        *,
+        max_entries: int = 1024,
+        ttl: Optional[float] = 24 * 3600,
+        max_disk_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_disk_bytes = max_disk_bytes
+        self.memory: OrderedDict = OrderedDict()  # key -> (created_at, generations)
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self.lock = threading.Lock()
+        self.conn = None
+        if path:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)"
+            )
+            self.conn.commit()
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl is not None and now - created_at > self.ttl
+
+    def _remember(self, key: str, created_at: float, generations: list) -> None:
+        self.memory[key] = (created_at, generations)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    # --- BaseCache interface ---
+    def lookup(self, prompt: str, llm_string: str) -> Optional[list]:
+        key = cache_key(prompt, llm_string)
+        now = time.time()
+        with self.lock:
+            if key in self.memory:
+                created_at, generations = self.memory[key]
+                if not self._expired(created_at, now):
+                    self.memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return _strip_ids(generations)
+                del self.memory[key]
+            if self.conn is not None:
+                row = self.conn.execute(
+                    "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row and not self._expired(row[1], now):
+                    self.conn.execute(
+                        "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                    )
+                    self.conn.commit()
+                    generations = _decode(row[0])
+                    self._remember(key, row[1], generations)
+                    self.stats["disk_hits"] += 1
+                    return _strip_ids(generations)
+            self.stats["misses"] += 1
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: list) -> None:
+        key = cache_key(prompt, llm_string)
+        now = time.time()
+        generations = _strip_ids(return_val)
+        with self.lock:
+            self._remember(key, now, generations)
+            if self.conn is None:
+                return
+            value = _encode(generations)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now),
+            )
+            self._evict_disk(now)
+            self.conn.commit()
+
+    def clear(self, **kwargs: Any) -> None:
+        with self.lock:
+            self.memory.clear()
+            if self.conn is not None:
+                self.conn.execute("DELETE FROM responses")
+                self.conn.commit()
+
+    # --- Disk tier eviction ---
+    def _evict_disk(self, now: float) -> None:
+        if self.ttl is not None:
+            self.conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        # Drop least recently used rows until the cache is back under the cap
+        freed = 0
+        doomed = []
+        for key, size in self.conn.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            if total - freed <= self.max_disk_bytes:
+                break
+            doomed.append((key,))
+            freed += size
+        self.conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    @property
+    def hit_rate(self) -> float:
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
@@ -0,0 +1,310 @@
+# ---------------------------------------------------
+# Routing: which model answers a turn, and whether it gets the tools
+# ---------------------------------------------------
+# Without routing every turn goes to one model with the search tool bound.
+# A `router` node placed before `chatbot` scores the user's message once per
+# turn and picks:
+#
+#   - the model: the first route whose `max_complexity` covers the message's
+#     `complexity` score (word count, reasoning/coding keywords, code, several
+#     questions), so routes are listed from small/fast to large,
+#   - whether the tools are bound: only when the message needs a web search
+#     (`SearchIntent`: rules, then a small local classifier); otherwise the
+#     model gets no tool schema and cannot start a search round trip.
+#
+#     router = ModelRouter([
+#         Route("small", ChatTogether(model="...-8B-..."), max_complexity=1.5, input_price=0.18, output_price=0.18),
+#         Route("large", ChatTogether(model="...-70B-..."), input_price=0.88, output_price=0.88),
+#     ])
+#     graph = build_graph("memory", router=router)      # or MODEL_ROUTING=1
+#     print(router.report())
+#
+# Tool routing alone keeps the one model and only gates the tools:
+#
+#     graph = build_graph("web", tool_routing=True)        # or TOOL_ROUTING=1
+#
+# The decision is stored in the state (`route`, e.g. "small+tools") so the
+# chatbot calls after a search use the same model. The report gives, per
+# route, the turns routed to it, the model calls, their p50/p95 latency,
+# tokens and cost (prices in USD per 1M tokens), next to what the same
+# tokens would cost on the last (largest) route.
+import math
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+from langchain_core.messages import HumanMessage
+
+from langgraph_playground.history import SummaryState
+from langgraph_playground.semantic_cache import HashingEmbedder
+from langgraph_playground.state import State
+
+# Each match adds 1 to the complexity score
+HARD = re.compile(
+    r"\b(why|how (does|do|would|should|can)|explain|compare|comparison|difference|versus|vs\.?|"
+    r"trade-?offs?|pros and cons|step by step|analy[sz]e|analysis|design|architecture|prove|derive|"
+    r"debug|refactor|implement|optimi[sz]e|evaluate|plan|strategy|"
+    r"por ?que|explique|compare|diferença|analise|análise|passo a passo|implemente|otimize|projete)\b",
+    re.IGNORECASE,
+)
+CODE = re.compile(r"```|\b(def|class|import|return|select|function|lambda|traceback|exception)\b", re.IGNORECASE)
+
+
+def complexity(text: str) -> float:
+    """Cheap estimate of how hard a message is to answer (0 = trivial)."""
+    score = len(text.split()) / 40  # a 40-word message counts as one hard keyword
+    score += len(HARD.findall(text))
+    if CODE.search(text):
+        score += 2
+    score += 0.5 * max(0, text.count("?") - 1)
+    return score
+
+
+# ---------------------------------------------------
+# Search intent: should this turn get the tools bound?
+# ---------------------------------------------------
+# Rules decide the clear cases, in this order: an explicit request to search
+# -> tools; small talk -> no tools; a question about fresh facts (dates,
+# news, prices, "latest", ...) -> tools; a request about the conversation
+# itself (summarize, translate, ...) or about code -> no tools. Anything else
+# goes to a nearest-centroid classifier over hashed embeddings of the labelled
+# examples below (no model download, microseconds per message).
+EXPLICIT_SEARCH = re.compile(
+    r"\b(search|look up|lookup|google|browse|find online|on the web|pesquise|procure|busque)\b", re.IGNORECASE
+)
+FRESH = re.compile(
+    r"\b(latest|news|today|tonight|yesterday|tomorrow|current|currently|recent|recently|right now|now|"
+    r"this (week|month|year)|prices?|cost of|weather|forecast|scores?|who won|released?|releases|stocks?|"
+    r"exchange rate|elections?|hoje|ontem|amanhã|agora|atual|atualmente|recentes?|últim[oa]s?|notícias?|"
+    r"preços?|cotação|clima|previsão|placar|lançamento)\b|\b(19|20)\d\d\b",
+    re.IGNORECASE,
+)
+ABOUT_CONVERSATION = re.compile(
+    r"\b(summari[sz]e|rephrase|rewrite|translate|shorten|in one sentence|what did (i|you)|you (said|told)|"
+    r"my name|resuma|traduza|reescreva|meu nome)\b",
+    re.IGNORECASE,
+)
+SMALL_TALK = frozenset(
+    "hi hello hey thanks thank you ok okay great cool nice awesome perfect sure yes no bye goodbye good morning "
+    "afternoon evening night that s all it so much very olá oi obrigado obrigada valeu tchau bom boa dia tarde "
+    "noite tudo bem muito sim não".split()
+)
+SEARCH_EXAMPLES = (
+    "who is the ceo of openai", "population of brazil", "when does the next iphone come out",
+    "how much does a tesla model 3 cost", "what happened in the stock market", "best restaurants in lisbon",
+    "how many github stars does langgraph have", "is the python website down", "who is the president of france",
+    "what time is the match", "flights from lisbon to london", "new features in python 3.13",
+    "when is the next solar eclipse", "how old is elon musk", "opening hours of the louvre",
+    "dollar to euro exchange rate", "quem é o presidente do brasil", "quanto custa um iphone",
+    "resultado do jogo do flamengo", "melhores restaurantes em são paulo",
+)
+CHAT_EXAMPLES = (
+    "what is a stategraph", "explain how recursion works", "write a poem about the sea",
+    "how do i reverse a list in python", "difference between a list and a tuple", "give me an example with two nodes",
+    "what does a checkpointer do", "help me write an email to my boss", "tell me a joke",
+    "what is the capital of portugal", "how does a hash map work", "define machine learning",
+    "what is photosynthesis", "convert 10 miles to kilometers", "suggest a name for my cat",
+    "how do edges work in langgraph", "o que é um grafo", "explique o que é recursão", "escreva um poema",
+    "como funciona uma lista em python",
+)
+
+
+class SearchIntent:
+    """Predicate deciding whether a message needs the search tool.
+
+    Args:
+        embedder: Anything with `dim` and `embed(text) -> unit vector` for the
+            classifier; `HashingEmbedder()` by default.
+        search_examples: Messages that need a web search.
+        chat_examples: Messages the model answers on its own.
+        margin: How much closer to the search examples than to the chat
+            examples a message must be to get the tools (higher = fewer
+            searches).
+    """
+
+    def __init__(
+        self,
+        embedder=None,
+        *,
+        search_examples: tuple = SEARCH_EXAMPLES,
+        chat_examples: tuple = CHAT_EXAMPLES,
+        margin: float = 0.0,
+    ) -> None:
+        self.embedder = embedder or HashingEmbedder()
+        self.margin = margin
+        self.centroids = np.stack([self._centroid(search_examples), self._centroid(chat_examples)])
+        self.lock = threading.Lock()
+        self.stats: dict = {}  # reason -> count
+
+    def _centroid(self, examples: tuple) -> np.ndarray:
+        centroid = np.mean([self.embedder.embed(text) for text in examples], axis=0)
+        return centroid / np.linalg.norm(centroid)
+
+    def decide(self, text: str) -> tuple:
+        """`(needs search, reason)`; the reason names the rule or the classifier."""
+        if EXPLICIT_SEARCH.search(text):
+            return True, "asked_to_search"
+        words = re.findall(r"\w+", text.lower())
+        if not words or set(words) <= SMALL_TALK:
+            return False, "small_talk"
+        if FRESH.search(text):
+            return True, "fresh_facts"
+        if ABOUT_CONVERSATION.search(text) or CODE.search(text):
+            return False, "conversation_or_code"
+        search, chat = self.centroids @ self.embedder.embed(text)
+        if search - chat > self.margin:
+            return True, "classifier_search"
+        return False, "classifier_chat"
+
+    def __call__(self, text: str) -> bool:
+        search, reason = self.decide(text)
+        with self.lock:
+            self.stats[reason] = self.stats.get(reason, 0) + 1
+        return search
+
+    def report(self) -> str:
+        decisions = ", ".join(f"{reason} {count}" for reason, count in sorted(self.stats.items())) or "none"
+        return f"search intent: {decisions}"
+
+
+def _percentile(ordered: list, q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+# State of the graphs with a route node
+class RoutedState(State):
+    route: str
+
+
+class RoutedSummaryState(SummaryState):
+    route: str
+
+
+@dataclass
+class Route:
+    """One model the router can send a turn to."""
+
+    name: str
+    llm: Any
+    max_complexity: float = math.inf
+    """Highest `complexity` score this route takes (the last route takes the rest)."""
+    input_price: float = 0.0
+    """USD per 1M prompt tokens."""
+    output_price: float = 0.0
+    """USD per 1M completion tokens."""
+
+    def cost(self, input_tokens: int, output_tokens: int) -> float:
+        return (input_tokens * self.input_price + output_tokens * self.output_price) / 1e6
+
+
+class ModelRouter:
+    """Per-turn choice of model and tool binding, with per-route metrics.
+
+    Args:
+        routes: Routes from small/fast to large; the last one must take any
+            complexity.
+        tools_when: Predicate on the user's message deciding whether tools
+            are bound; `SearchIntent()` by default.
+        latency_window: Latest calls per route the p50/p95 are computed on.
+    """
+
+    def __init__(self, routes: list, *, tools_when=None, latency_window: int = 1024) -> None:
+        if not routes:
+            raise ValueError("ModelRouter needs at least one route")
+        self.routes = {route.name: route for route in routes}
+        self.order = list(routes)
+        self.tools_when = tools_when or SearchIntent()
+        self.latency_window = latency_window
+        self.models: dict = {}  # label -> runnable, filled by `bind`
+        self.lock = threading.Lock()
+        self.stats: dict = {}  # label -> counters
+
+    def bind(self, tools: list) -> None:
+        """Prepare each route's model with and without the tools bound."""
+        for route in self.order:
+            self.models[route.name] = route.llm
+            if tools:
+                self.models[f"{route.name}+tools"] = route.llm.bind_tools(tools)
+
+    # --- Decision ---
+    def choose(self, messages: list) -> str:
+        """Label of the route for the turn ending with `messages` ("small", "large+tools", ...)."""
+        last = next((m for m in reversed(messages) if isinstance(m, HumanMessage)), None)
+        text = last.content if last is not None and isinstance(last.content, str) else ""
+        score = complexity(text)
+        route = next((r for r in self.order if score <= r.max_complexity), self.order[-1])
+        label = route.name
+        if f"{label}+tools" in self.models and self.tools_when(text):
+            label += "+tools"
+        with self.lock:
+            self._counters(label)["turns"] += 1
+        return label
+
+    def node(self, state: dict) -> dict:
+        """The `router` graph node."""
+        return {"route": self.choose(state["messages"])}
+
+    def model(self, label: Optional[str]) -> tuple:
+        """`(label, model)` to call for a turn routed to `label`."""
+        # A state written before routing was enabled has no route: largest model, tools bound
+        if label not in self.models:
+            last = self.order[-1].name
+            label = f"{last}+tools" if f"{last}+tools" in self.models else last
+        return label, self.models[label]
+
+    # --- Metrics ---
+    def _counters(self, label: str) -> dict:
+        return self.stats.setdefault(
+            label,
+            {
+                "turns": 0, "calls": 0, "input_tokens": 0, "output_tokens": 0,
+                # Bounded: a long-running server would otherwise keep every call's latency
+                "latencies": deque(maxlen=self.latency_window),
+            },
+        )
+
+    def record(self, label: str, seconds: float, answer) -> None:
+        """Account one model call of `label` (latency and token usage)."""
+        usage = getattr(answer, "usage_metadata", None) or {}
+        with self.lock:
+            s = self._counters(label)
+            s["calls"] += 1
+            s["latencies"].append(seconds)
+            s["input_tokens"] += usage.get("input_tokens", 0)
+            s["output_tokens"] += usage.get("output_tokens", 0)
+
+    def summary(self) -> dict:
+        """Per-route turns, calls, p50/p95 latency (s, latest `latency_window` calls), tokens and cost (USD)."""
+        largest = self.order[-1]
+        rows = {}
+        with self.lock:
+            for label, s in sorted(self.stats.items()):
+                route = self.routes[label.split("+")[0]]
+                latencies = sorted(s["latencies"])
+                rows[label] = {
+                    "turns": s["turns"],
+                    "calls": s["calls"],
+                    "p50": _percentile(latencies, 0.50),
+                    "p95": _percentile(latencies, 0.95),
+                    "input_tokens": s["input_tokens"],
+                    "output_tokens": s["output_tokens"],
+                    "cost": route.cost(s["input_tokens"], s["output_tokens"]),
+                    "cost_on_largest": largest.cost(s["input_tokens"], s["output_tokens"]),
+                }
+        return rows
+
+    def report(self) -> str:
+        rows = self.summary()
+        lines = [f"{'route':>14}{'turns':>7}{'calls':>7}{'p50 ms':>9}{'p95 ms':>9}{'tokens in':>11}{'out':>8}{'cost $':>11}"]
+        for label, r in rows.items():
+            lines.append(
+                f"{label:>14}{r['turns']:>7}{r['calls']:>7}{r['p50'] * 1000:>9.0f}{r['p95'] * 1000:>9.0f}"
+                f"{r['input_tokens']:>11}{r['output_tokens']:>8}{r['cost']:>11.6f}"
+            )
+        cost = sum(r["cost"] for r in rows.values())
+        baseline = sum(r["cost_on_largest"] for r in rows.values())
+        lines.append(f"total ${cost:.6f} vs ${baseline:.6f} with every call on {self.order[-1].name!r}")
+        return "\n".join(lines)
@@ -0,0 +1,156 @@
+# ---------------------------------------------------
+# TTL cache + request coalescing for the web search tool
+# ---------------------------------------------------
+# Wraps any tool (TavilySearchResults in the chatbots) with the same name,
+# description and argument schema, so the LLM and ToolNode see no difference:
+#
+#     tool = CachedSearchTool(TavilySearchResults(max_results=2), ttl=600)
+#
+# Results are cached per normalized query ("What is  LangGraph?" and
+# "what is langgraph" share an entry) with a TTL and LRU eviction. While a
+# search is in flight, identical calls from other sessions wait for it
+# instead of hitting the API again (single-flight).
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any
+
+from langchain_core.tools import BaseTool
+from pydantic import PrivateAttr
+
+
+def normalize_query(value: Any) -> Any:
+    """Lowercase, collapse whitespace and drop trailing punctuation of strings."""
+    if isinstance(value, str):
+        return " ".join(value.lower().split()).strip(" ?!.")
+    return value
+
+
+class CachedSearchTool(BaseTool):
+    """Caching, coalescing proxy around another tool."""
+
+    tool: BaseTool
+    ttl: float = 600.0
+    max_entries: int = 256
+    response_format: str = "content_and_artifact"
+
+    _cache: OrderedDict = PrivateAttr(default_factory=OrderedDict)
+    _inflight: dict = PrivateAttr(default_factory=dict)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _stats: dict = PrivateAttr(default_factory=lambda: {"hits": 0, "misses": 0, "coalesced": 0})
+
+    def __init__(self, tool: BaseTool, **kwargs: Any) -> None:
+        super().__init__(
+            tool=tool,
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            **kwargs,
+        )
+
+    @property
+    def stats(self) -> dict:
+        return dict(self._stats)
+
+    # --- Cache bookkeeping (callers hold self._lock) ---
+    def _key(self, kwargs: dict) -> str:
+        return json.dumps({k: normalize_query(v) for k, v in kwargs.items()}, sort_keys=True)
+
+    def _get(self, key: str):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return value
+
+    def _put(self, key: str, value: tuple) -> None:
+        self._cache[key] = (time.monotonic(), value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def _claim(self, key: str) -> tuple:
+        """Return ``(cached_value, future, is_leader)`` for ``key``."""
+        with self._lock:
+            value = self._get(key)
+            if value is not None:
+                self._stats["hits"] += 1
+                return value, None, False
+            future = self._inflight.get(key)
+            if future is not None:
+                self._stats["coalesced"] += 1
+                return None, future, False
+            self._stats["misses"] += 1
+            future = self._inflight[key] = Future()
+            return None, future, True
+
+    def _settle(self, key: str, future: Future, value=None, error=None) -> None:
+        with self._lock:
+            if error is None and not failed_search(value):
+                self._put(key, value)
+            del self._inflight[key]
+        if error is None:
+            future.set_result(value)
+        elif isinstance(error, Exception):
+            future.set_exception(error)
+        else:
+            # The leader was cancelled (step timeout, client gone): its
+            # followers were not, so they get an ordinary error
+            future.set_exception(RuntimeError(f"search cancelled: {type(error).__name__}"))
+
+    def _tool_call(self, kwargs: dict) -> dict:
+        # Calling the wrapped tool with a ToolCall returns a ToolMessage, which
+        # carries both the content and the raw artifact
+        return {"type": "tool_call", "name": self.tool.name, "args": kwargs, "id": "cached-search"}
+
+    # --- Tool entry points ---
+    def _run(self, run_manager=None, **kwargs: Any) -> tuple:
+        key = self._key(kwargs)
+        value, future, leader = self._claim(key)
+        if value is not None:
+            return value
+        if not leader:
+            return future.result()
+        try:
+            message = self.tool.invoke(self._tool_call(kwargs))
+        except BaseException as error:
+            # Always settle: an unsettled future would hold the key forever
+            self._settle(key, future, error=error)
+            raise
+        value = (message.content, message.artifact)
+        self._settle(key, future, value)
+        return value
+
+    async def _arun(self, run_manager=None, **kwargs: Any) -> tuple:
+        key = self._key(kwargs)
+        value, future, leader = self._claim(key)
+        if value is not None:
+            return value
+        if not leader:
+            return await asyncio.wrap_future(future)
+        try:
+            message = await self.tool.ainvoke(self._tool_call(kwargs))
+        except BaseException as error:
+            self._settle(key, future, error=error)
+            raise
+        value = (message.content, message.artifact)
+        self._settle(key, future, value)
+        return value
+
+
+def failed_search(value: tuple) -> bool:
+    """True if a `(content, artifact)` search result is really an error.
+
+    TavilySearchResults reports errors (timeouts, open circuit, HTTP errors)
+    as `(repr(error), {})` instead of raising; those must not be cached or
+    reused.
+    """
+    content, artifact = value
+    return not artifact
@@ -0,0 +1,181 @@
+# ---------------------------------------------------
+# Semantic response cache in front of the chatbot node
+# ---------------------------------------------------
+# The exact-key ResponseCache misses paraphrases ("what is a node in
+# LangGraph" / "explain LangGraph nodes"). This cache embeds the user's
+# question with a hashing vectorizer (CPU only, no model download), keeps the
+# vectors in a NumPy matrix and answers from the most similar stored question
+# when the cosine similarity reaches `threshold`:
+#
+#     cache = SemanticCache(threshold=0.8, ttl=3600)
+#     graph = build_graph("memory", semantic_cache=cache)   # or SEMANTIC_CACHE=1
+#     print(cache.report())
+#
+# False hits are worse than misses, so a question is neither served nor
+# stored when:
+#   - the turn involves tools (the model asked for a search, or the last
+#     message is not the user's) or the question looks time-sensitive
+#     (`looks_like_search`),
+#   - it is not the first message of the conversation: earlier turns or the
+#     rolling summary shape the answer, and the entry would serve it to other
+#     threads and users (the graph passes the prompt, summary included),
+#   - it refers to the conversation ("my", "it", "that", "again", ...), so the
+#     answer depends on history the vector does not see,
+#   - the numbers differ ("Python 3.11" vs "Python 3.12" never match).
+# Entries expire after `ttl` seconds; when full, the least recently used
+# entry is replaced.
+import re
+import threading
+import time
+import zlib
+from typing import Optional
+
+import numpy as np
+from langchain_core.messages import AIMessage, HumanMessage
+
+from langgraph_playground.prefetch import STOPWORDS, looks_like_search
+
+QUESTION_WORDS = frozenset("explain tell describe about please can could would give define meaning mean".split())
+CONTEXT_WORDS = frozenset(
+    "my mine it its that this these those them they he she his her their above previous "
+    "earlier again before last said your".split()
+)
+TOKEN = re.compile(r"[a-z0-9]+(?:\.[0-9]+)*")
+
+
+def _stem(word: str) -> str:
+    """Plural to singular, roughly: queries -> query, nodes -> node, class stays."""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+class HashingEmbedder:
+    """Signed feature hashing of stemmed words and adjacent word pairs, L2-normalized."""
+
+    def __init__(self, dim: int = 2048, bigram_weight: float = 0.5) -> None:
+        self.dim = dim
+        self.bigram_weight = bigram_weight
+
+    def terms(self, text: str) -> list:
+        return [_stem(w) for w in TOKEN.findall(text.lower()) if w not in STOPWORDS and w not in QUESTION_WORDS]
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        terms = self.terms(text)
+        features = [(t, 1.0) for t in terms]
+        # Neighbouring pairs, order-free: "node in LangGraph" ~ "LangGraph nodes"
+        features += [(" ".join(sorted(pair)), self.bigram_weight) for pair in zip(terms, terms[1:])]
+        for feature, weight in features:
+            h = zlib.crc32(feature.encode())
+            vector[h % self.dim] += weight if h & 0x80000000 else -weight
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class SemanticCache:
+    """Cosine-similarity cache of chatbot answers keyed by the user's question.
+
+    Args:
+        embedder: Anything with `dim` and `embed(text) -> unit vector`;
+            `HashingEmbedder()` by default.
+        threshold: Minimum cosine similarity for a hit.
+        max_entries: Capacity of the index (LRU beyond it).
+        ttl: Seconds an answer stays valid (None = forever).
+    """
+
+    def __init__(self, embedder=None, *, threshold: float = 0.8, max_entries: int = 1024, ttl: Optional[float] = 3600):
+        self.embedder = embedder or HashingEmbedder()
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.vectors = np.zeros((max_entries, self.embedder.dim), dtype=np.float32)
+        self.created = np.full(max_entries, -np.inf)
+        self.accessed = np.full(max_entries, -np.inf)  # -inf marks a free slot
+        self.entries: list = [None] * max_entries  # (question, numbers, answer)
+        self.lock = threading.Lock()
+        self.stats = {"lookups": 0, "hits": 0, "misses": 0, "stores": 0, "lookup_seconds": 0.0}
+        self.skipped: dict = {}  # reason -> count
+
+    # --- Safeguards ---
+    @staticmethod
+    def _skip_reason(messages: list) -> Optional[str]:
+        """Why this turn must bypass the cache, or None if its question is cacheable."""
+        last = messages[-1] if messages else None
+        if not isinstance(last, HumanMessage) or not isinstance(last.content, str):
+            return "tool_turn"
+        if len(messages) > 1:
+            return "has_history"
+        if looks_like_search(last.content):
+            return "time_sensitive"
+        if CONTEXT_WORDS & set(TOKEN.findall(last.content.lower())):
+            return "refers_to_context"
+        return None
+
+    @staticmethod
+    def _numbers(text: str) -> frozenset:
+        return frozenset(re.findall(r"\d+(?:\.\d+)*", text))
+
+    # --- Cache API ---
+    def lookup(self, messages: list) -> Optional[AIMessage]:
+        """A copy of the cached answer to a paraphrase of this turn's question, or None."""
+        if reason := self._skip_reason(messages):
+            with self.lock:
+                self.skipped[reason] = self.skipped.get(reason, 0) + 1
+            return None
+        question = messages[-1].content
+        start = time.perf_counter()
+        vector = self.embedder.embed(question)
+        now = time.monotonic()
+        with self.lock:
+            self.stats["lookups"] += 1
+            if self.ttl is not None:
+                expired = self.created < now - self.ttl
+                self.accessed[expired] = -np.inf
+            scores = self.vectors @ vector
+            scores[self.accessed == -np.inf] = -1.0
+            best = int(np.argmax(scores))
+            entry = self.entries[best]
+            hit = scores[best] >= self.threshold and entry[1] == self._numbers(question)
+            if hit:
+                self.accessed[best] = now
+                self.stats["hits"] += 1
+            else:
+                self.stats["misses"] += 1
+            self.stats["lookup_seconds"] += time.perf_counter() - start
+        if not hit:
+            return None
+        similarity = {"similarity": round(float(scores[best]), 3), "question": entry[0]}
+        return entry[2].model_copy(update={"id": None, "response_metadata": {"semantic_cache": similarity}})
+
+    def store(self, messages: list, answer: AIMessage) -> None:
+        """Remember `answer` for this turn's question (plain text answers only)."""
+        if answer.tool_calls or not isinstance(answer.content, str) or not answer.content:
+            return
+        if self._skip_reason(messages):
+            return
+        question = messages[-1].content
+        vector = self.embedder.embed(question)
+        now = time.monotonic()
+        with self.lock:
+            slot = int(np.argmin(self.accessed))  # a free slot, else the least recently used
+            self.vectors[slot] = vector
+            self.created[slot] = self.accessed[slot] = now
+            self.entries[slot] = (question, self._numbers(question), answer.model_copy(update={"id": None}))
+            self.stats["stores"] += 1
+
+    # --- Reporting ---
+    @property
+    def hit_rate(self) -> float:
+        return self.stats["hits"] / self.stats["lookups"] if self.stats["lookups"] else 0.0
+
+    def report(self) -> str:
+        s = self.stats
+        mean_ms = s["lookup_seconds"] / s["lookups"] * 1000 if s["lookups"] else 0.0
+        skipped = ", ".join(f"{reason} {count}" for reason, count in sorted(self.skipped.items())) or "none"
+        return (
+            f"semantic cache: {s['hits']}/{s['lookups']} hits ({self.hit_rate:.0%}), "
+            f"{mean_ms:.3f} ms per lookup, {s['stores']} stored, skipped: {skipped}"
+        )
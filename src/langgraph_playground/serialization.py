@@ -0,0 +1,145 @@
+# ---------------------------------------------------
+# Compact binary serializer for the message list
+# ---------------------------------------------------
+# LangGraph's default serializer (JsonPlusSerializer) writes each message as
+# msgpack of `(module, class, model_dump(), method)`: every field name and
+# every default value, for every message, in every checkpoint, and a
+# pydantic model_dump / model_validate_json round trip per message.
+#
+# `MessageSerializer` is a drop-in `SerializerProtocol` that keeps msgpack
+# but encodes Human/AI/Tool/System messages positionally against a fixed
+# schema (no field names, trailing defaults dropped, tool calls as
+# [name, args, id]) and rebuilds them without validation. Anything else
+# falls back to LangGraph's encoding, so the output still round-trips
+# arbitrary state. Blobs above `compress_min_bytes` can also be compressed
+# with zstd:
+#
+#     serde = MessageSerializer(compress_level=3)
+#     saver = SqliteCheckpointer("checkpoints.db", serde=serde)
+#     type_, data = serde.dumps_typed(state["messages"])   # ("msgpack-lc+zstd", b"...")
+#
+# Blobs get their own type tags ("msgpack-lc", "msgpack-lc+zstd"), and the
+# tags of the default serializer are still read, so existing databases keep
+# working.
+from typing import Any, Optional
+
+import ormsgpack
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer, _msgpack_default, _msgpack_ext_hook, _option
+
+EXT_MESSAGE = 64  # LangGraph's own ext codes are 0-5
+
+_COMMON = (("content", ""), ("id", None), ("name", None), ("additional_kwargs", {}), ("response_metadata", {}))
+# (code, class, fields in order with their defaults); "type" is implied by the class
+SCHEMAS = (
+    (1, HumanMessage, _COMMON + (("example", False),)),
+    (
+        2,
+        AIMessage,
+        _COMMON + (("tool_calls", []), ("usage_metadata", None), ("invalid_tool_calls", []), ("example", False)),
+    ),
+    (3, ToolMessage, _COMMON + (("tool_call_id", None), ("artifact", None), ("status", "success"))),
+    (4, SystemMessage, _COMMON),
+)
+
+
+def _covers(cls: type, fields: tuple) -> bool:
+    # A LangChain upgrade that adds a field must not silently drop it
+    return set(cls.model_fields) == {name for name, _ in fields} | {"type"}
+
+
+_BY_CLASS = {cls: (code, fields) for code, cls, fields in SCHEMAS if _covers(cls, fields)}
+_BY_CODE = {code: (cls, fields, cls.model_fields["type"].default) for cls, (code, fields) in _BY_CLASS.items()}
+
+
+def _pack_tool_calls(calls: list) -> list:
+    # [name, args, id] when the call is exactly what the schema expects
+    return [
+        [c["name"], c["args"], c["id"]] if c.keys() == {"name", "args", "id", "type"} and c["type"] == "tool_call" else c
+        for c in calls
+    ]
+
+
+def _unpack_tool_calls(calls: list) -> list:
+    return [
+        {"name": c[0], "args": c[1], "id": c[2], "type": "tool_call"} if isinstance(c, list) else c for c in calls
+    ]
+
+
+class MessageSerializer(JsonPlusSerializer):
+    """JsonPlusSerializer with a positional msgpack schema for chat messages.
+
+    Args:
+        compress_level: zstd level, or None for no compression.
+        compress_min_bytes: Smaller blobs are never compressed.
+    """
+
+    def __init__(self, *, compress_level: Optional[int] = None, compress_min_bytes: int = 1024) -> None:
+        super().__init__()
+        self.compress_level = compress_level
+        self.compress_min_bytes = compress_min_bytes
+        self._compressor = self._decompressor = None
+        if compress_level is not None:
+            import zstandard
+
+            self._compressor = zstandard.ZstdCompressor(level=compress_level)
+            self._decompressor = zstandard.ZstdDecompressor()
+
+    # --- msgpack hooks ---
+    def _default(self, obj: Any) -> Any:
+        schema = _BY_CLASS.get(type(obj))
+        if schema is None:
+            return _msgpack_default(obj)
+        code, fields = schema
+        values = [
+            _pack_tool_calls(obj.tool_calls) if name == "tool_calls" else getattr(obj, name) for name, _ in fields
+        ]
+        # Trailing defaults are implied
+        end = len(values)
+        while end > 1 and values[end - 1] == fields[end - 1][1]:
+            end -= 1
+        return ormsgpack.Ext(EXT_MESSAGE, self._pack([code, *values[:end]]))
+
+    def _ext_hook(self, code: int, data: bytes) -> Any:
+        if code != EXT_MESSAGE:
+            return _msgpack_ext_hook(code, data)
+        code, *values = self._unpack(data)
+        cls, fields, type_ = _BY_CODE[code]
+        kwargs = {name: value for (name, _), value in zip(fields, values)}
+        kwargs["type"] = type_  # every field given: model_construct resolves no defaults
+        for name, default in fields[len(values):]:
+            kwargs[name] = default.copy() if isinstance(default, (dict, list)) else default
+        if "tool_calls" in kwargs:
+            kwargs["tool_calls"] = _unpack_tool_calls(kwargs["tool_calls"])
+        # The values were validated when the message was created
+        return cls.model_construct(**kwargs)
+
+    def _pack(self, obj: Any) -> bytes:
+        return ormsgpack.packb(obj, default=self._default, option=_option)
+
+    def _unpack(self, data: bytes) -> Any:
+        return ormsgpack.unpackb(data, ext_hook=self._ext_hook, option=ormsgpack.OPT_NON_STR_KEYS)
+
+    # --- SerializerProtocol ---
+    def dumps_typed(self, obj: Any) -> tuple:
+        if obj is None or isinstance(obj, (bytes, bytearray)):
+            return super().dumps_typed(obj)
+        try:
+            data = self._pack(obj)
+        except ormsgpack.MsgpackEncodeError:
+            return super().dumps_typed(obj)  # e.g. invalid UTF-8: JSON fallback
+        if self._compressor is not None and len(data) >= self.compress_min_bytes:
+            return "msgpack-lc+zstd", self._compressor.compress(data)
+        return "msgpack-lc", data
+
+    def loads_typed(self, data: tuple) -> Any:
+        type_, payload = data
+        if type_ == "msgpack-lc+zstd":
+            if self._decompressor is None:
+                import zstandard
+
+                self._decompressor = zstandard.ZstdDecompressor()
+            return self._unpack(self._decompressor.decompress(payload))
+        if type_ == "msgpack-lc":
+            return self._unpack(payload)
+        return super().loads_typed(data)
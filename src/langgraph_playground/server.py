@@ -0,0 +1,304 @@
+# ---------------------------------------------------
+# ASGI front-end: the shared graph over HTTP and Server-Sent Events
+# ---------------------------------------------------
+# A dependency-free ASGI app (any ASGI server runs it, e.g. uvicorn):
+#
+#   POST /threads/{thread_id}   {"message": "...", "user_id": "..." (optional)}
+#       Accept: text/event-stream -> SSE: `token` events as the chatbot writes,
+#           `tool_call` / `tool_result` around searches, then `done`
+#       otherwise                 -> JSON {"thread_id": ..., "answer": ...}
+#   GET  /healthz               -> active / queued / served / rejected counters
+#
+# One process holds one compiled graph and runs up to `max_concurrency` turns
+# at a time on its event loop; more processes come from the ASGI server's
+# workers (use CHECKPOINT_DB so they share conversations). Requests beyond the
+# running ones wait in a bounded queue: when `max_queue` requests are already
+# waiting, or a request waits longer than `queue_timeout`, it is rejected
+# with 503 + Retry-After instead of piling up. Turns of the same thread_id
+# run one after the other, since they share a checkpoint.
+import asyncio
+import json
+import os
+import re
+
+try:
+    from asyncio import timeout  # Python 3.11+
+except ImportError:
+    from async_timeout import timeout
+
+THREAD_PATH = re.compile(r"^/threads/([A-Za-z0-9_.:-]{1,128})/?$")
+
+
+class Rejected(Exception):
+    """Request refused before it reaches the graph (mapped to an HTTP error)."""
+
+    def __init__(self, status: int, detail: str):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+class GraphServer:
+    """ASGI app serving one compiled graph.
+
+    Args:
+        graph: Compiled graph with a checkpointer. Built with
+            `build_graph("memory")` at startup when not given.
+        max_concurrency: Turns running at the same time in this process.
+        max_queue: Requests allowed to wait for a slot; more are rejected.
+        queue_timeout: Seconds a request may wait for a slot before a 503.
+        max_body: Largest accepted request body, in bytes.
+    """
+
+    def __init__(
+        self,
+        graph=None,
+        *,
+        max_concurrency: int = 32,
+        max_queue: int = 256,
+        queue_timeout: float = 30.0,
+        max_body: int = 64 * 1024,
+    ):
+        self._graph = graph
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.max_body = max_body
+        self._slots = None  # created on the serving event loop
+        self._thread_locks: dict = {}  # thread_id -> [lock, users]
+        self.stats = {"active": 0, "queued": 0, "served": 0, "rejected": 0, "failed": 0}
+
+    @property
+    def graph(self):
+        if self._graph is None:
+            from langgraph_playground.graph import build_graph, load_env
+
+            load_env()
+            self._graph = build_graph("memory")
+        return self._graph
+
+    # --- ASGI entry point ---
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        path, method = scope["path"], scope["method"]
+        try:
+            if path == "/healthz" and method == "GET":
+                await self._json(send, 200, {"status": "ok", **self.stats})
+            elif match := THREAD_PATH.match(path):
+                if method != "POST":
+                    raise Rejected(405, "use POST")
+                await self._run(scope, receive, send, match.group(1))
+            else:
+                raise Rejected(404, "not found")
+        except Rejected as exc:
+            headers = [(b"retry-after", b"1")] if exc.status == 503 else []
+            await self._json(send, exc.status, {"error": exc.detail}, headers)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    # Build the graph (and its clients) before the first request
+                    await asyncio.to_thread(lambda: self.graph)
+                except Exception as exc:
+                    await send({"type": "lifespan.startup.failed", "message": str(exc)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    # --- Admission: bounded queue, concurrency slots, one turn per thread ---
+    async def _admit(self, thread_id: str):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        if self.stats["queued"] >= self.max_queue:
+            self.stats["rejected"] += 1
+            raise Rejected(503, "server busy, request queue is full")
+
+        entry = self._thread_locks.setdefault(thread_id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        self.stats["queued"] += 1
+        try:
+            # A timeout scope, not wait_for: a free slot is taken without
+            # suspending, so a burst does not briefly count as queued
+            async with timeout(self.queue_timeout):
+                await entry[0].acquire()
+                try:
+                    await self._slots.acquire()
+                except BaseException:
+                    entry[0].release()
+                    raise
+        except BaseException as exc:
+            self._release_thread(thread_id)
+            if isinstance(exc, asyncio.TimeoutError):
+                self.stats["rejected"] += 1
+                raise Rejected(503, "server busy, timed out waiting for a worker") from None
+            raise
+        finally:
+            self.stats["queued"] -= 1
+        self.stats["active"] += 1
+
+    def _release(self, thread_id: str):
+        self.stats["active"] -= 1
+        self._slots.release()
+        self._thread_locks[thread_id][0].release()
+        self._release_thread(thread_id)
+
+    def _release_thread(self, thread_id: str):
+        entry = self._thread_locks[thread_id]
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self._thread_locks[thread_id]
+
+    # --- POST /threads/{thread_id} ---
+    async def _run(self, scope, receive, send, thread_id: str):
+        inputs, config = turn_request(thread_id, await self._read_body(receive))
+        streaming = b"text/event-stream" in dict(scope["headers"]).get(b"accept", b"")
+
+        await self._admit(thread_id)
+        try:
+            if streaming:
+                await self._stream(send, receive, inputs, config)
+            else:
+                state = await self.graph.ainvoke(inputs, config)
+                await self._json(send, 200, {"thread_id": thread_id, "answer": state["messages"][-1].content})
+            self.stats["served"] += 1
+        except Exception:
+            self.stats["failed"] += 1
+            raise
+        finally:
+            self._release(thread_id)
+
+    async def _read_body(self, receive) -> bytes:
+        body = b""
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                raise Rejected(400, "client disconnected")
+            body += message.get("body", b"")
+            if len(body) > self.max_body:
+                raise Rejected(413, f"request body larger than {self.max_body} bytes")
+            if not message.get("more_body"):
+                return body
+
+    async def _stream(self, send, receive, inputs: dict, config: dict):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/event-stream"),
+                (b"cache-control", b"no-cache"),
+                (b"x-accel-buffering", b"no"),
+            ],
+        })
+
+        # Stop generating (and release the slot) as soon as the client goes away
+        disconnected = asyncio.create_task(self._wait_disconnect(receive))
+        events = self._events(inputs, config)
+        try:
+            async for event, data in events:
+                if disconnected.done():
+                    return
+                # `send` waits on the transport, so slow readers slow the run down
+                # instead of buffering an unbounded backlog in memory
+                await send({"type": "http.response.body", "body": sse(event, data), "more_body": True})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        except Exception as exc:
+            if not disconnected.done():
+                await send({"type": "http.response.body", "body": sse("error", {"error": str(exc)}), "more_body": False})
+            raise
+        finally:
+            disconnected.cancel()
+            # Stops the graph run now instead of when the generator is collected
+            await events.aclose()
+
+    async def _events(self, inputs: dict, config: dict):
+        """Turn one graph run into (event, data) pairs for the SSE stream."""
+        answer = ""
+        stream = self.graph.astream(inputs, config, stream_mode=["messages", "updates"])
+        try:
+            async for mode, payload in stream:
+                if mode == "messages":
+                    chunk, metadata = payload
+                    if metadata["langgraph_node"] == "chatbot" and isinstance(chunk.content, str) and chunk.content:
+                        yield "token", {"id": chunk.id, "content": chunk.content}
+                    continue
+                for message in payload.get("chatbot", {}).get("messages", []):
+                    if message.tool_calls:
+                        for call in message.tool_calls:
+                            yield "tool_call", {"name": call["name"], "args": call["args"]}
+                    elif message.content:
+                        answer = message.content
+                for message in payload.get("tools", {}).get("messages", []):
+                    yield "tool_result", {"name": message.name, "status": message.status}
+            yield "done", {"answer": answer}
+        finally:
+            await stream.aclose()
+
+    @staticmethod
+    async def _wait_disconnect(receive):
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    @staticmethod
+    async def _json(send, status: int, payload: dict, headers: list = ()):
+        body = json.dumps(payload).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()), *headers],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def turn_request(thread_id: str, body: bytes) -> tuple:
+    """`(inputs, config)` of one turn from a POST body, or Rejected(400)."""
+    try:
+        payload = json.loads(body)
+        message = payload["message"]
+    except (ValueError, KeyError, TypeError):
+        raise Rejected(400, 'expected a JSON body {"message": "..."}') from None
+    if not isinstance(message, str) or not message.strip():
+        raise Rejected(400, "message must be a non-empty string")
+    user_id = payload.get("user_id")
+    if user_id is not None and not isinstance(user_id, str):
+        raise Rejected(400, "user_id must be a string")
+
+    inputs = {"messages": [{"role": "user", "content": message}]}
+    config = {"configurable": {"thread_id": thread_id}}
+    if user_id:
+        # Namespace of the long-term memory (shared by this user's threads)
+        config["configurable"]["user_id"] = user_id
+    return inputs, config
+
+
+def sse(event: str, data: dict) -> bytes:
+    """Encode one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+
+def create_app() -> GraphServer:
+    """App factory for ASGI servers, configured from the environment.
+
+    SERVER_MAX_CONCURRENCY, SERVER_MAX_QUEUE and SERVER_QUEUE_TIMEOUT set the
+    limits; SERVER_FAKE_LLM=1 serves the offline fakes instead of the real APIs.
+    """
+    graph = None
+    if os.getenv("SERVER_FAKE_LLM") == "1":
+        from langgraph_playground.fakes import FakeChatModel, FakeSearchTool
+        from langgraph_playground.graph import build_graph
+
+        graph = build_graph("memory", llm=FakeChatModel(), tools=[FakeSearchTool()])
+    return GraphServer(
+        graph,
+        max_concurrency=int(os.getenv("SERVER_MAX_CONCURRENCY", "32")),
+        max_queue=int(os.getenv("SERVER_MAX_QUEUE", "256")),
+        queue_timeout=float(os.getenv("SERVER_QUEUE_TIMEOUT", "30")),
+    )
@@ -0,0 +1,488 @@
+# ---------------------------------------------------
+# Sharded runtime: sessions spread over worker processes by thread_id
+# ---------------------------------------------------
+# One Python process runs one graph on one core. `ShardRouter` starts a pool
+# of worker processes, each with its own graph and checkpointer (a
+# `GraphServer`, see server.py), and sends every turn to the worker that owns
+# its thread_id on a consistent-hash ring. A session always lands on the
+# same worker, so its checkpoint stays in that process's memory:
+#
+#     router = ShardRouter(workers=4)                   # ASGI app, same API as GraphServer
+#     await router.start()
+#     answer = await router.run("thread-1", "Hi!")
+#     await router.add_worker()                          # ~1/5 of the sessions move
+#     await router.remove_worker("w0")                   # w0's sessions move, then it stops
+#
+# Rebalancing is graceful: when the ring changes, the sessions whose owner
+# changed are paused (their next turns wait), turns already running on them
+# finish, their latest checkpoint is copied from the old worker to the new
+# one (serialized with the checkpointer's serde), and only then do they
+# resume on the new owner. Sessions that do not move are never paused.
+#
+# Workers talk to the router over multiprocessing pipes. The router only
+# knows the sessions it has routed since it started. With a shared
+# CHECKPOINT_DB, pass `migrate=False`: nothing is copied and a moved session
+# simply continues from the database on its new worker.
+import asyncio
+import bisect
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import threading
+from collections import Counter
+from typing import Callable, Optional
+
+from langgraph_playground.server import GraphServer, Rejected, create_app, sse, turn_request
+
+
+class HashRing:
+    """Consistent hashing with `vnodes` virtual points per node."""
+
+    def __init__(self, nodes: tuple = (), vnodes: int = 64) -> None:
+        self.vnodes = vnodes
+        self._hashes: list = []
+        self._nodes: list = []
+        for node in nodes:
+            self.add(node)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+    @property
+    def nodes(self) -> set:
+        return set(self._nodes)
+
+    def add(self, node: str) -> None:
+        for i in range(self.vnodes):
+            h = self._hash(f"{node}#{i}")
+            index = bisect.bisect(self._hashes, h)
+            self._hashes.insert(index, h)
+            self._nodes.insert(index, node)
+
+    def remove(self, node: str) -> None:
+        kept = [(h, n) for h, n in zip(self._hashes, self._nodes) if n != node]
+        self._hashes = [h for h, _ in kept]
+        self._nodes = [n for _, n in kept]
+
+    def copy(self) -> "HashRing":
+        ring = HashRing(vnodes=self.vnodes)
+        ring._hashes, ring._nodes = list(self._hashes), list(self._nodes)
+        return ring
+
+    def node_for(self, key: str) -> str:
+        if not self._hashes:
+            raise LookupError("the hash ring has no nodes")
+        return self._nodes[bisect.bisect(self._hashes, self._hash(key)) % len(self._hashes)]
+
+
+# ---------------------------------------------------
+# Worker process
+# ---------------------------------------------------
+def _forget(checkpointer, thread_id: str) -> None:
+    """Delete a thread's checkpoints after it moved to another worker."""
+    if hasattr(checkpointer, "delete_thread"):
+        checkpointer.delete_thread(thread_id)
+    elif hasattr(checkpointer, "storage"):  # MemorySaver
+        checkpointer.storage.pop(thread_id, None)
+        for table in (checkpointer.writes, checkpointer.blobs):
+            for key in [k for k in table if k[0] == thread_id]:
+                del table[key]
+
+
+class _WorkerLoop:
+    """Serves the router's requests in a worker process, on one event loop."""
+
+    def __init__(self, conn, server: GraphServer) -> None:
+        self.conn = conn
+        self.server = server
+        self.tasks: dict = {}  # request id -> task
+        self.stopping: Optional[asyncio.Future] = None
+
+    def send(self, *message) -> None:
+        self.conn.send(message)
+
+    async def serve(self) -> None:
+        loop = asyncio.get_running_loop()
+        self.stopping = loop.create_future()
+        threading.Thread(target=self._read, args=(loop,), daemon=True).start()
+        self.send("ready", 0, None)
+        await self.stopping
+        # Finish the turns already running before exiting
+        if self.tasks:
+            await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+
+    def _read(self, loop) -> None:
+        while True:
+            try:
+                message = self.conn.recv()
+            except (EOFError, OSError):
+                message = ("stop", None)  # the router is gone
+            loop.call_soon_threadsafe(self._dispatch, message)
+            if message[0] == "stop":
+                return
+
+    def _dispatch(self, message: tuple) -> None:
+        kind, rid, *args = message
+        if kind == "stop":
+            if not self.stopping.done():
+                self.stopping.set_result(None)
+            if rid is not None:
+                self.send("done", rid, None)
+        elif kind == "cancel":
+            if task := self.tasks.get(args[0]):
+                task.cancel()
+        else:
+            task = asyncio.ensure_future(getattr(self, f"_{kind}")(rid, *args))
+            self.tasks[rid] = task
+            task.add_done_callback(lambda _: self.tasks.pop(rid, None))
+
+    async def _turn(self, rid: int, inputs: dict, config: dict, stream: bool) -> None:
+        server, thread_id = self.server, config["configurable"]["thread_id"]
+        try:
+            await server._admit(thread_id)
+        except Rejected as exc:
+            self.send("error", rid, exc.status, exc.detail)
+            return
+        try:
+            if stream:
+                async for event, data in server._events(inputs, config):
+                    self.send("event", rid, event, data)
+                self.send("done", rid, None)
+            else:
+                state = await server.graph.ainvoke(inputs, config)
+                self.send("done", rid, {"thread_id": thread_id, "answer": state["messages"][-1].content})
+            server.stats["served"] += 1
+        except asyncio.CancelledError:
+            self.send("error", rid, 499, "cancelled")
+        except Exception as exc:
+            server.stats["failed"] += 1
+            self.send("error", rid, 500, str(exc))
+        finally:
+            server._release(thread_id)
+
+    async def _stats(self, rid: int) -> None:
+        self.send("done", rid, dict(self.server.stats))
+
+    async def _export(self, rid: int, thread_ids: list) -> None:
+        checkpointer, items = self.server.graph.checkpointer, []
+        for thread_id in thread_ids:
+            saved = checkpointer.get_tuple({"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}})
+            if saved is not None:
+                checkpoint = {**saved.checkpoint, "pending_sends": []}
+                items.append((thread_id, checkpointer.serde.dumps_typed(checkpoint),
+                              checkpointer.serde.dumps_typed(saved.metadata)))
+        self.send("done", rid, items)
+
+    async def _import(self, rid: int, items: list) -> None:
+        checkpointer = self.server.graph.checkpointer
+        for thread_id, checkpoint, metadata in items:
+            checkpoint = checkpointer.serde.loads_typed(checkpoint)
+            config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+            checkpointer.put(config, checkpoint, checkpointer.serde.loads_typed(metadata), checkpoint["channel_versions"])
+        self.send("done", rid, len(items))
+
+    async def _drop(self, rid: int, thread_ids: list) -> None:
+        for thread_id in thread_ids:
+            _forget(self.server.graph.checkpointer, thread_id)
+        self.send("done", rid, len(thread_ids))
+
+
+def _worker_main(conn, server_factory: Callable) -> None:
+    server = server_factory()
+    server.graph  # build the graph (and its clients) before reporting ready
+    asyncio.run(_WorkerLoop(conn, server).serve())
+
+
+# ---------------------------------------------------
+# Router
+# ---------------------------------------------------
+class _Worker:
+    """Router-side handle of one worker process."""
+
+    def __init__(self, name: str, ctx, server_factory: Callable) -> None:
+        self.name = name
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child, server_factory), name=f"shard-{name}", daemon=True)
+        self.process.start()
+        child.close()
+        self.threads: set = set()  # sessions routed here
+        self.pending: dict = {}  # request id -> Future (or Queue for streams)
+        self.ready: Optional[asyncio.Future] = None
+
+
+class ShardRouter(GraphServer):
+    """ASGI front-end that shards sessions over worker processes.
+
+    Args:
+        workers: Worker processes started by `start()`.
+        server_factory: Picklable callable building each worker's
+            `GraphServer` (graph + admission limits); `create_app` by default.
+        vnodes: Virtual nodes per worker on the hash ring.
+        migrate: Copy the checkpoints of moved sessions between workers;
+            False when every worker reads the same database.
+        max_body: Largest accepted request body, in bytes.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        *,
+        server_factory: Callable = create_app,
+        vnodes: int = 64,
+        migrate: bool = True,
+        max_body: int = 64 * 1024,
+    ) -> None:
+        super().__init__(max_body=max_body)
+        self.initial_workers = workers
+        self.server_factory = server_factory
+        self.migrate = migrate
+        self.ring = HashRing(vnodes=vnodes)
+        self.workers: dict = {}  # name -> _Worker
+        self._ctx = multiprocessing.get_context("spawn")  # no forking of a threaded process
+        self._names = itertools.count()
+        self._ids = itertools.count(1)
+        self._gates: dict = {}  # thread_id -> Event set when its move is over
+        self._inflight: Counter = Counter()
+        self._membership = asyncio.Lock()
+        self.stats = {"routed": 0, "moved": 0}
+
+    # --- Pool membership ---
+    async def start(self) -> None:
+        await asyncio.gather(*(self._spawn() for _ in range(self.initial_workers - len(self.workers))))
+        for name in self.workers:
+            if name not in self.ring.nodes:
+                self.ring.add(name)
+
+    async def _spawn(self) -> _Worker:
+        loop = asyncio.get_running_loop()
+        worker = _Worker(f"w{next(self._names)}", self._ctx, self.server_factory)
+        worker.ready = loop.create_future()
+        self.workers[worker.name] = worker
+        threading.Thread(target=self._read, args=(worker, loop), daemon=True).start()
+        await worker.ready
+        return worker
+
+    async def add_worker(self) -> str:
+        """Start one more worker and move the sessions it now owns to it."""
+        async with self._membership:
+            worker = await self._spawn()
+            ring = self.ring.copy()
+            ring.add(worker.name)
+            await self._rebalance(ring)
+            return worker.name
+
+    async def remove_worker(self, name: str) -> None:
+        """Move a worker's sessions to the others, then stop it."""
+        async with self._membership:
+            ring = self.ring.copy()
+            ring.remove(name)
+            await self._rebalance(ring)
+            await self._stop_worker(self.workers[name])
+
+    async def stop(self) -> None:
+        await asyncio.gather(*(self._stop_worker(w) for w in list(self.workers.values())))
+
+    async def _stop_worker(self, worker: _Worker) -> None:
+        if worker.process.is_alive():
+            await self._request(worker, "stop")
+        await asyncio.to_thread(worker.process.join, 10)
+        self.workers.pop(worker.name, None)
+        if worker.name in self.ring.nodes:
+            self.ring.remove(worker.name)
+
+    async def _rebalance(self, ring: HashRing) -> None:
+        moves: dict = {}  # (source, destination) -> [thread_id]
+        for worker in self.workers.values():
+            for thread_id in worker.threads:
+                if (owner := ring.node_for(thread_id)) != worker.name:
+                    moves.setdefault((worker.name, owner), []).append(thread_id)
+        moving = [t for thread_ids in moves.values() for t in thread_ids]
+        gate = asyncio.Event()
+        for thread_id in moving:
+            self._gates[thread_id] = gate
+        self.ring = ring  # sessions that stay put are routed as before
+        try:
+            # Turns that started before the switch finish on the old owner
+            while any(self._inflight[t] for t in moving):
+                await asyncio.sleep(0.005)
+            for (source, destination), thread_ids in moves.items():
+                source, destination = self.workers[source], self.workers[destination]
+                if self.migrate:
+                    items = await self._request(source, "export", thread_ids)
+                    await self._request(destination, "import", items)
+                    await self._request(source, "drop", thread_ids)
+                source.threads.difference_update(thread_ids)
+                destination.threads.update(thread_ids)
+            self.stats["moved"] += len(moving)
+        finally:
+            for thread_id in moving:
+                del self._gates[thread_id]
+            gate.set()
+
+    # --- Pipe I/O ---
+    def _read(self, worker: _Worker, loop) -> None:
+        while True:
+            try:
+                message = worker.conn.recv()
+            except (EOFError, OSError):
+                loop.call_soon_threadsafe(self._exited, worker)
+                return
+            loop.call_soon_threadsafe(self._deliver, worker, message)
+
+    def _deliver(self, worker: _Worker, message: tuple) -> None:
+        kind, rid, *args = message
+        if kind == "ready":
+            worker.ready.set_result(None)
+            return
+        target = worker.pending.get(rid)
+        if isinstance(target, asyncio.Queue):
+            target.put_nowait((kind, *args))
+            if kind != "event":
+                del worker.pending[rid]
+            return
+        del worker.pending[rid]
+        if kind == "done":
+            target.set_result(args[0])
+        else:
+            target.set_exception(Rejected(*args))
+
+    def _exited(self, worker: _Worker) -> None:
+        # Anything still waiting on this worker fails; its sessions are lost
+        # unless the checkpointer is shared (CHECKPOINT_DB)
+        for target in worker.pending.values():
+            if isinstance(target, asyncio.Queue):
+                target.put_nowait(("error", 503, f"worker {worker.name} exited"))
+            elif not target.done():
+                target.set_exception(Rejected(503, f"worker {worker.name} exited"))
+        worker.pending.clear()
+        if worker.ready is not None and not worker.ready.done():
+            worker.ready.set_exception(RuntimeError(f"worker {worker.name} failed to start"))
+        if self.workers.pop(worker.name, None) is not None and worker.name in self.ring.nodes:
+            self.ring.remove(worker.name)
+
+    def _send(self, worker: _Worker, kind: str, target, *args) -> int:
+        rid = next(self._ids)
+        worker.pending[rid] = target
+        try:
+            worker.conn.send((kind, rid, *args))
+        except (BrokenPipeError, OSError):
+            del worker.pending[rid]
+            raise Rejected(503, f"worker {worker.name} is not running") from None
+        return rid
+
+    async def _request(self, worker: _Worker, kind: str, *args):
+        future = asyncio.get_running_loop().create_future()
+        self._send(worker, kind, future, *args)
+        return await future
+
+    # --- Turns ---
+    async def _route(self, thread_id: str) -> _Worker:
+        while (gate := self._gates.get(thread_id)) is not None:
+            await gate.wait()  # the session is moving to another worker
+        try:
+            worker = self.workers[self.ring.node_for(thread_id)]
+        except LookupError:
+            raise Rejected(503, "no workers available") from None
+        worker.threads.add(thread_id)
+        self._inflight[thread_id] += 1
+        self.stats["routed"] += 1
+        return worker
+
+    def _done(self, thread_id: str) -> None:
+        self._inflight[thread_id] -= 1
+        if not self._inflight[thread_id]:
+            del self._inflight[thread_id]
+
+    async def run(self, thread_id: str, message: str, user_id: Optional[str] = None) -> dict:
+        """Run one turn on the owning worker; returns {"thread_id", "answer"}."""
+        body = {"message": message, **({"user_id": user_id} if user_id else {})}
+        inputs, config = turn_request(thread_id, json.dumps(body).encode())
+        return await self._turn(inputs, config)
+
+    async def _turn(self, inputs: dict, config: dict) -> dict:
+        thread_id = config["configurable"]["thread_id"]
+        worker = await self._route(thread_id)
+        try:
+            return await self._request(worker, "turn", inputs, config, False)
+        finally:
+            self._done(thread_id)
+
+    # --- HTTP (same API as GraphServer) ---
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == "/healthz" and scope["method"] == "GET":
+            await self._json(send, 200, await self.health())
+            return
+        await super().__call__(scope, receive, send)
+
+    async def health(self) -> dict:
+        workers = {}
+        for name, worker in list(self.workers.items()):
+            stats = await self._request(worker, "stats")
+            workers[name] = {"pid": worker.process.pid, "sessions": len(worker.threads), **stats}
+        return {"status": "ok" if workers else "no workers", **self.stats, "workers": workers}
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.start()
+                except Exception as exc:
+                    await send({"type": "lifespan.startup.failed", "message": str(exc)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.stop()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _run(self, scope, receive, send, thread_id: str):
+        inputs, config = turn_request(thread_id, await self._read_body(receive))
+        if b"text/event-stream" not in dict(scope["headers"]).get(b"accept", b""):
+            await self._json(send, 200, await self._turn(inputs, config))
+            return
+
+        worker = await self._route(thread_id)
+        events: asyncio.Queue = asyncio.Queue()
+        rid = self._send(worker, "turn", events, inputs, config, True)
+        disconnected = asyncio.create_task(self._wait_disconnect(receive))
+        started = False
+        try:
+            while True:
+                kind, *args = await events.get()
+                if kind == "error" and not started:
+                    raise Rejected(*args)  # e.g. the worker's queue is full: 503
+                if not started:
+                    await send({
+                        "type": "http.response.start",
+                        "status": 200,
+                        "headers": [
+                            (b"content-type", b"text/event-stream"),
+                            (b"cache-control", b"no-cache"),
+                            (b"x-accel-buffering", b"no"),
+                        ],
+                    })
+                    started = True
+                if disconnected.done():
+                    worker.conn.send(("cancel", None, rid))
+                    return
+                if kind == "event":
+                    await send({"type": "http.response.body", "body": sse(*args), "more_body": True})
+                    continue
+                tail = sse("error", {"error": args[1]}) if kind == "error" else b""
+                await send({"type": "http.response.body", "body": tail, "more_body": False})
+                return
+        finally:
+            disconnected.cancel()
+            self._done(thread_id)
+
+
+def create_router() -> ShardRouter:
+    """App factory for ASGI servers: SERVER_SHARDS workers, each built by `create_app`.
+
+    Checkpoints are migrated on rebalance unless CHECKPOINT_DB is shared.
+    """
+    return ShardRouter(int(os.getenv("SERVER_SHARDS", "2")), migrate=not os.getenv("CHECKPOINT_DB"))
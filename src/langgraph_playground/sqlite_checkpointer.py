@@ -0,0 +1,496 @@
+# ---------------------------------------------------
+# Durable SQLite checkpointer
+# ---------------------------------------------------
+# Drop-in replacement for MemorySaver:
+#
+#     graph = graph_builder.compile(checkpointer=SqliteCheckpointer("checkpoints.db"))
+#
+# Conversation state survives restarts and lives on disk instead of in a
+# Python dict. The database runs in WAL mode (readers never block the writer)
+# and both tables are clustered on (thread_id, checkpoint_ns, checkpoint_id),
+# so "latest checkpoint of a thread" is a single index seek. Writes are
+# grouped: each put_writes call is one executemany, and `commit_every` lets
+# several supersteps share one transaction.
+#
+# Every superstep writes a checkpoint holding the whole state, so a thread of
+# N messages costs O(N^2) bytes on disk. Two options bound that:
+#
+#   snapshot_every=16 : list channels (`messages`) are stored as a delta
+#                       against the parent checkpoint (length of the shared
+#                       prefix + the new tail); every 16th checkpoint of a
+#                       chain is a full base snapshot. Reading walks back to
+#                       the nearest base, at most 16 rows, and the latest
+#                       state of recently used threads is kept in memory.
+#   keep_last=50      : retention per thread_id. Checkpoints older than the
+#                       50 newest are deleted with their writes; the cut is
+#                       made at a base snapshot, so at most `snapshot_every`
+#                       extra checkpoints survive and nothing is re-encoded.
+import random
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterator, Sequence
+from contextlib import AbstractAsyncContextManager, AbstractContextManager
+from typing import Any, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.types import TASKS, ChannelProtocol
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata_type TEXT,
+    metadata BLOB,
+    delta INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT,
+    value BLOB,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+) WITHOUT ROWID;
+"""
+_COLUMNS = (
+    "thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id,"
+    " type, checkpoint, metadata_type, metadata, delta"
+)
+
+
+def _common_prefix(old: list, new: list) -> int:
+    n = min(len(old), len(new))
+    i = 0
+    while i < n and (old[i] is new[i] or old[i] == new[i]):
+        i += 1
+    return i
+
+
+def _apply_deltas(parent_values: dict, checkpoint: dict) -> dict:
+    """Full channel values of a delta checkpoint, given its parent's values."""
+    values = dict(checkpoint["channel_values"])
+    for channel, (prefix, tail) in checkpoint.pop("channel_deltas").items():
+        values[channel] = list(parent_values[channel][:prefix]) + list(tail)
+    return values
+
+
+class SqliteCheckpointer(
+    BaseCheckpointSaver[str], AbstractContextManager, AbstractAsyncContextManager
+):
+    """Checkpoint saver that persists LangGraph state in a SQLite file.
+
+    Args:
+        path: Database file (``":memory:"`` works for throwaway runs).
+        serde: Serializer for checkpoints and writes. Defaults to LangGraph's.
+        commit_every: Number of put/put_writes calls grouped in one
+            transaction. 1 commits every superstep; larger values trade a
+            small durability window for fewer fsyncs.
+        snapshot_every: Store list channels as deltas against the parent
+            checkpoint, with a full snapshot every `snapshot_every`
+            checkpoints. 0 stores every checkpoint in full.
+        keep_last: Checkpoints kept per thread_id and namespace (at least
+            this many; older ones are pruned). None keeps all of them.
+        cache_threads: Threads whose latest state is kept in memory to
+            encode and decode deltas without reading the chain back.
+    """
+
+    def __init__(
+        self,
+        path: str = "checkpoints.db",
+        *,
+        serde: Optional[SerializerProtocol] = None,
+        commit_every: int = 1,
+        snapshot_every: int = 0,
+        keep_last: Optional[int] = None,
+        cache_threads: int = 1024,
+    ) -> None:
+        super().__init__(serde=serde)
+        # LangGraph calls the checkpointer from its executor threads
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        # Databases created before delta storage lack the column
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(checkpoints)")}
+        if "delta" not in columns:
+            self.conn.execute("ALTER TABLE checkpoints ADD COLUMN delta INTEGER NOT NULL DEFAULT 0")
+        self.conn.commit()
+        self.lock = threading.Lock()
+        self.commit_every = max(1, commit_every)
+        self._uncommitted = 0
+        self.snapshot_every = snapshot_every
+        self.keep_last = keep_last
+        self.cache_threads = cache_threads
+        # (thread_id, checkpoint_ns) -> (checkpoint_id, channel_values, chain depth)
+        self._latest: OrderedDict = OrderedDict()
+
+    # --- Connection management ---
+    def _maybe_commit(self) -> None:
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self.conn.commit()
+            self._uncommitted = 0
+
+    def flush(self) -> None:
+        """Commit any writes still held in the current batch."""
+        with self.lock:
+            self.conn.commit()
+            self._uncommitted = 0
+
+    def close(self) -> None:
+        self.flush()
+        self.conn.close()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    # --- Delta chains ---
+    def _remember(self, key: tuple, checkpoint_id: str, values: dict, depth: int) -> None:
+        # Shallow copies: the graph builds new lists on update, but never share them
+        values = {k: list(v) if isinstance(v, list) else v for k, v in values.items()}
+        self._latest[key] = (checkpoint_id, values, depth)
+        self._latest.move_to_end(key)
+        while len(self._latest) > self.cache_threads:
+            self._latest.popitem(last=False)
+
+    def _channel_values(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> dict:
+        """Full channel values of a stored checkpoint, rebuilt from its base snapshot."""
+        cached = self._latest.get((thread_id, checkpoint_ns))
+        chain = []  # delta checkpoints, newest first
+        cursor = checkpoint_id
+        while True:
+            if cached and cached[0] == cursor:
+                values = cached[1]
+                break
+            row = self.conn.execute(
+                "SELECT parent_checkpoint_id, type, checkpoint, delta FROM checkpoints"
+                " WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                (thread_id, checkpoint_ns, cursor),
+            ).fetchone()
+            if row is None:
+                raise LookupError(f"Checkpoint {cursor} of thread {thread_id!r} is missing from its delta chain")
+            parent_id, type_, blob, delta = row
+            checkpoint = self.serde.loads_typed((type_, blob))
+            if not delta:
+                values = checkpoint["channel_values"]
+                break
+            chain.append(checkpoint)
+            cursor = parent_id
+        for checkpoint in reversed(chain):
+            values = _apply_deltas(values, checkpoint)
+        return values
+
+    def _encode(self, key: tuple, parent_id: Optional[str], values: dict) -> tuple:
+        """`(stored channel values, channel deltas or None, chain depth)` for a new checkpoint."""
+        cached = self._latest.get(key)
+        if not (self.snapshot_every and parent_id and cached and cached[0] == parent_id):
+            return values, None, 0
+        if cached[2] + 1 >= self.snapshot_every:
+            return values, None, 0  # time for a new base snapshot
+        stored, deltas = {}, {}
+        for channel, value in values.items():
+            old = cached[1].get(channel)
+            prefix = _common_prefix(old, value) if isinstance(value, list) and isinstance(old, list) else 0
+            if prefix:
+                deltas[channel] = [prefix, value[prefix:]]
+            else:
+                stored[channel] = value
+        if not deltas:
+            return values, None, 0
+        return stored, deltas, cached[2] + 1
+
+    def prune(self, thread_id: str, checkpoint_ns: str = "") -> int:
+        """Apply `keep_last` to one thread; returns the number of checkpoints deleted."""
+        if not self.keep_last:
+            return 0
+        params = (thread_id, checkpoint_ns)
+        boundary = self.conn.execute(
+            "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+            " ORDER BY checkpoint_id DESC LIMIT 1 OFFSET ?",
+            params + (self.keep_last - 1,),
+        ).fetchone()
+        if boundary is None:
+            return 0
+        # Cut at the newest base snapshot at or before the boundary, so every
+        # kept delta still has its base
+        base = self.conn.execute(
+            "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+            " AND checkpoint_id <= ? AND delta = 0 ORDER BY checkpoint_id DESC LIMIT 1",
+            params + (boundary[0],),
+        ).fetchone()
+        if base is None:
+            return 0
+        deleted = self.conn.execute(
+            "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+            params + (base[0],),
+        ).rowcount
+        if deleted:
+            self.conn.execute(
+                "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+                params + (base[0],),
+            )
+        return deleted
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete every checkpoint and write of a thread (all namespaces)."""
+        with self.lock:
+            self.conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+            self.conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+            self.conn.commit()
+            self._uncommitted = 0
+            for key in [k for k in self._latest if k[0] == thread_id]:
+                del self._latest[key]
+
+    # --- Reading ---
+    def _parent_sends(self, thread_id: str, checkpoint_ns: str, parent_id: Optional[str]) -> list:
+        if not parent_id:
+            return []
+        rows = self.conn.execute(
+            "SELECT type, value FROM writes"
+            " WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? AND channel = ?"
+            " ORDER BY task_path, task_id, idx",
+            (thread_id, checkpoint_ns, parent_id, TASKS),
+        ).fetchall()
+        return [self.serde.loads_typed((type_, value)) for type_, value in rows]
+
+    def _to_tuple(self, row: tuple) -> CheckpointTuple:
+        thread_id, checkpoint_ns, checkpoint_id, parent_id, type_, blob, meta_type, meta, delta = row
+        writes = self.conn.execute(
+            "SELECT task_id, channel, type, value FROM writes"
+            " WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?"
+            " ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        checkpoint: Checkpoint = self.serde.loads_typed((type_, blob))
+        if delta:
+            parent_values = self._channel_values(thread_id, checkpoint_ns, parent_id)
+            checkpoint["channel_values"] = _apply_deltas(parent_values, checkpoint)
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={
+                **checkpoint,
+                "pending_sends": self._parent_sends(thread_id, checkpoint_ns, parent_id),
+            },
+            metadata=self.serde.loads_typed((meta_type, meta)),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_id,
+                    }
+                }
+                if parent_id
+                else None
+            ),
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((w_type, value)))
+                for task_id, channel, w_type, value in writes
+            ],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        query = f"SELECT {_COLUMNS} FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+        params: tuple = (thread_id, checkpoint_ns)
+        if checkpoint_id := get_checkpoint_id(config):
+            query += " AND checkpoint_id = ?"
+            params += (checkpoint_id,)
+        else:
+            query += " ORDER BY checkpoint_id DESC LIMIT 1"
+        with self.lock:
+            row = self.conn.execute(query, params).fetchone()
+            return self._to_tuple(row) if row else None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        query = f"SELECT {_COLUMNS} FROM checkpoints"
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+            results = []
+            for row in rows:
+                if limit is not None and len(results) >= limit:
+                    break
+                # Metadata is stored serialized, so it is filtered in Python
+                if filter:
+                    metadata = self.serde.loads_typed((row[6], row[7]))
+                    if not all(metadata.get(k) == v for k, v in filter.items()):
+                        continue
+                results.append(self._to_tuple(row))
+        yield from results
+
+    # --- Writing ---
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        parent_id = config["configurable"].get("checkpoint_id")
+        key = (thread_id, checkpoint_ns)
+        c = checkpoint.copy()
+        # Pending sends are rebuilt from the parent's writes when reading
+        c.pop("pending_sends", None)
+        meta_type, meta = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+        with self.lock:
+            c["channel_values"], deltas, depth = self._encode(key, parent_id, checkpoint["channel_values"])
+            if deltas:
+                c["channel_deltas"] = deltas
+            type_, blob = self.serde.dumps_typed(c)
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO checkpoints ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    parent_id,
+                    type_,
+                    blob,
+                    meta_type,
+                    meta,
+                    1 if deltas else 0,
+                ),
+            )
+            if self.snapshot_every:
+                self._remember(key, checkpoint["id"], checkpoint["channel_values"], depth)
+            self.prune(thread_id, checkpoint_ns)
+            self._maybe_commit()
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        # Special channels (errors, interrupts...) overwrite; regular writes
+        # keep the first value, same as MemorySaver
+        verb = "REPLACE" if all(c in WRITES_IDX_MAP for c, _ in writes) else "IGNORE"
+        rows = [
+            (
+                thread_id,
+                checkpoint_ns,
+                checkpoint_id,
+                task_id,
+                WRITES_IDX_MAP.get(channel, idx),
+                channel,
+                *self.serde.dumps_typed(value),
+                task_path,
+            )
+            for idx, (channel, value) in enumerate(writes)
+        ]
+        with self.lock:
+            self.conn.executemany(
+                f"INSERT OR {verb} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self._maybe_commit()
+
+    # --- Async API (local disk I/O, same as MemorySaver's wrappers) ---
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self.get_tuple(config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        for item in self.list(config, filter=filter, before=before, limit=limit):
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        return self.put_writes(config, writes, task_id, task_path)
+
+    def get_next_version(self, current: Optional[str], channel: ChannelProtocol) -> str:
+        # Same version format as MemorySaver, so the two are interchangeable
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
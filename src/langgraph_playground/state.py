@@ -0,0 +1,12 @@
+# ---------------------------------------------------
+# State shared by every chatbot graph
+# ---------------------------------------------------
+from typing import Annotated
+
+from typing_extensions import TypedDict
+from langgraph.graph.message import add_messages
+
+
+# Defines the type of state that will be passed between graph nodes
+class State(TypedDict):
+    messages: Annotated[list, add_messages]
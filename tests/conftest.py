@@ -0,0 +1,51 @@
+# ---------------------------------------------------
+# Shared fixtures: offline graphs built on the fakes
+# ---------------------------------------------------
+# The suite never touches the network: every graph uses FakeChatModel and
+# FakeSearchTool (fakes.py) with no latency, and the environment knobs that
+# switch optional components on are cleared, so each test opts in explicitly.
+#
+# Usage (from the project root):
+#     python -m pytest -q
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pytest
+
+from langgraph_playground.fakes import FakeChatModel, FakeSearchTool
+from langgraph_playground.graph import build_graph
+
+OPTIONAL_ENV = (
+    "SEARCH_PREFETCH", "SEMANTIC_CACHE", "LONG_TERM_MEMORY_DB", "MODEL_ROUTING", "TOOL_ROUTING",
+    "LLM_CACHE", "LLM_CACHE_DB", "LLM_BATCH_WINDOW_MS", "CHECKPOINT_DB", "CHECKPOINT_ZSTD_LEVEL",
+    "HISTORY_MAX_MESSAGES", "GRAPH_TRACE", "METRICS_PORT", "TOOL_OUTPUT_TOKENS", "TOOL_PAYLOAD_DB",
+)
+
+
+@pytest.fixture(autouse=True)
+def offline_env(monkeypatch):
+    for var in OPTIONAL_ENV:
+        monkeypatch.delenv(var, raising=False)
+
+
+def fake_graph(checkpointer=None, variant: str = "memory", **kwargs):
+    """`build_graph(variant)` on the offline fakes, with no latency."""
+    kwargs.setdefault("llm", FakeChatModel(latency=0.0))
+    kwargs.setdefault("tools", [FakeSearchTool(latency=0.0)])
+    return build_graph(variant, checkpointer=checkpointer, **kwargs)
+
+
+def turn(graph, thread_id: str, message: str, **configurable) -> dict:
+    config = {"configurable": {"thread_id": thread_id, **configurable}}
+    return graph.invoke({"messages": [{"role": "user", "content": message}]}, config)
+
+
+QUESTIONS = [
+    "Hi! I'm learning LangGraph.",
+    "What is a StateGraph?",
+    "Search the latest LangGraph release notes.",
+    "Great, summarize that in one sentence.",
+    "Explain checkpointers to me.",
+]
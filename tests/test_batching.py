@@ -0,0 +1,99 @@
+# ---------------------------------------------------
+# MicroBatchChatModel: window and size flush, dedup, fan-out, cancellation
+# ---------------------------------------------------
+import asyncio
+import threading
+import time
+
+import pytest
+
+from langgraph_playground.batching import MicroBatchChatModel
+from langgraph_playground.fakes import FakeChatModel
+
+PROMPTS = ["Explain nodes", "Explain edges", "Explain state", "Explain reducers"]
+
+
+class RecordingModel(FakeChatModel):
+    """FakeChatModel that records the size of every batch it is sent."""
+
+    batches: list = []
+
+    def batch(self, inputs, config=None, **kwargs):
+        self.batches.append(len(inputs))
+        return super().batch(inputs, config, **kwargs)
+
+    async def abatch(self, inputs, config=None, **kwargs):
+        self.batches.append(len(inputs))
+        return await super().abatch(inputs, config, **kwargs)
+
+
+def expected(prompt: str) -> str:
+    return FakeChatModel(latency=0.0).invoke(prompt).content
+
+
+def invoke_together(llm, prompts: list) -> list:
+    """`llm.invoke` of each prompt on its own thread, all at once; answers in prompt order."""
+    answers = [None] * len(prompts)
+
+    def call(i):
+        answers[i] = llm.invoke(prompts[i]).content
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(len(prompts))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return answers
+
+
+def test_window_collects_concurrent_calls_into_one_batch():
+    inner = RecordingModel(latency=0.05)
+    llm = MicroBatchChatModel(model=inner, max_wait=0.2)
+    # Every caller gets the answer to its own prompt
+    assert invoke_together(llm, PROMPTS) == [expected(p) for p in PROMPTS]
+    assert inner.batches == [len(PROMPTS)]
+    assert llm.stats == {"requests": 4, "batches": 1, "upstream_calls": 4, "coalesced": 0}
+
+
+def test_full_batch_is_sent_without_waiting_out_the_window():
+    inner = RecordingModel(latency=0.0)
+    llm = MicroBatchChatModel(model=inner, max_wait=5.0, max_batch_size=2)
+    start = time.perf_counter()
+    assert invoke_together(llm, PROMPTS[:2]) == [expected(p) for p in PROMPTS[:2]]
+    assert time.perf_counter() - start < 1.0
+    assert inner.batches == [2]
+
+
+def test_identical_prompts_are_sent_once():
+    inner = RecordingModel(latency=0.05)
+    llm = MicroBatchChatModel(model=inner, max_wait=0.2)
+    prompts = [PROMPTS[0], PROMPTS[1], PROMPTS[0], PROMPTS[0]]
+
+    async def main():
+        return await asyncio.gather(*(llm.ainvoke(p) for p in prompts))
+
+    answers = asyncio.run(main())
+    assert [a.content for a in answers] == [expected(p) for p in prompts]
+    # Each caller has its own copy of a shared answer
+    assert len({id(a) for a in answers}) == len(prompts)
+    assert inner.batches == [2]
+    assert llm.stats["upstream_calls"] == 2 and llm.stats["coalesced"] == 2
+
+
+def test_cancelled_leader_still_dispatches_the_batch():
+    inner = RecordingModel(latency=0.05)
+    llm = MicroBatchChatModel(model=inner, max_wait=0.2)
+
+    async def main():
+        leader = asyncio.create_task(llm.ainvoke(PROMPTS[0]))
+        await asyncio.sleep(0.02)
+        followers = [asyncio.create_task(llm.ainvoke(p)) for p in PROMPTS[1:3]]
+        await asyncio.sleep(0.02)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.wait_for(asyncio.gather(*followers), 1.0)
+
+    answers = asyncio.run(main())
+    assert [a.content for a in answers] == [expected(p) for p in PROMPTS[1:3]]
+    assert inner.batches == [3]
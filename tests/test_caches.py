@@ -0,0 +1,148 @@
+# ---------------------------------------------------
+# ResponseCache and SemanticCache: hits, misses and the skip rules
+# ---------------------------------------------------
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from conftest import fake_graph, turn
+from langgraph_playground.fakes import FakeChatModel, FakeSearchTool
+from langgraph_playground.prefetch import looks_like_search
+from langgraph_playground.response_cache import ResponseCache
+from langgraph_playground.semantic_cache import SemanticCache
+
+
+# --- ResponseCache ---
+def test_response_cache_hits_on_the_same_conversation():
+    cache = ResponseCache()
+    llm = FakeChatModel(latency=0.0, cache=cache)
+    first = llm.invoke([HumanMessage(content="Explain nodes")])
+    second = llm.invoke([HumanMessage(content="Explain nodes", id="other-run")])
+    assert second.content == first.content
+    assert cache.stats == {"memory_hits": 1, "disk_hits": 0, "misses": 1}
+
+
+def test_response_cache_key_includes_model_and_tools():
+    cache = ResponseCache()
+    question = [HumanMessage(content="Explain nodes")]
+    FakeChatModel(latency=0.0, cache=cache).invoke(question)
+    FakeChatModel(latency=0.0, model="other", cache=cache).invoke(question)
+    FakeChatModel(latency=0.0, cache=cache).bind_tools([FakeSearchTool()]).invoke(question)
+    assert cache.stats["misses"] == 3
+
+
+def test_response_cache_disk_tier_survives_a_restart(tmp_path):
+    path = str(tmp_path / "llm.db")
+    question = [HumanMessage(content="Explain nodes")]
+    answer = FakeChatModel(latency=0.0, cache=ResponseCache(path)).invoke(question)
+    cache = ResponseCache(path)
+    assert FakeChatModel(latency=0.0, cache=cache).invoke(question).content == answer.content
+    assert cache.stats["disk_hits"] == 1
+
+
+def test_response_cache_expires_entries():
+    cache = ResponseCache(ttl=0)
+    llm = FakeChatModel(latency=0.0, cache=cache)
+    llm.invoke([HumanMessage(content="Explain nodes")])
+    llm.invoke([HumanMessage(content="Explain nodes")])
+    assert cache.stats["misses"] == 2
+
+
+def test_response_cache_is_opt_in(monkeypatch):
+    from langgraph_playground.graph import default_llm
+
+    monkeypatch.setenv("TOGETHER_API_KEY", "offline")
+    assert default_llm().cache is None
+    monkeypatch.setenv("LLM_CACHE", "1")
+    assert isinstance(default_llm().cache, ResponseCache)
+
+
+# --- SemanticCache ---
+def ask(text: str) -> list:
+    return [HumanMessage(content=text)]
+
+
+def answer(text: str = "A node is a function of the state.") -> AIMessage:
+    return AIMessage(content=text, id="run-1")
+
+
+def test_semantic_cache_serves_paraphrases():
+    cache = SemanticCache(threshold=0.6)
+    cache.store(ask("What is a node in LangGraph?"), answer())
+    hit = cache.lookup(ask("explain LangGraph nodes"))
+    assert hit is not None and hit.content == answer().content
+    assert hit.id is None and "semantic_cache" in hit.response_metadata
+    assert cache.lookup(ask("How do I install Python on Windows?")) is None
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+
+def test_semantic_cache_numbers_must_match():
+    cache = SemanticCache(threshold=0.5)
+    cache.store(ask("What changed in Python 3.11?"), answer("Faster CPython."))
+    assert cache.lookup(ask("What changed in Python 3.12?")) is None
+    assert cache.lookup(ask("What changed in Python 3.11?")) is not None
+
+
+def test_semantic_cache_skip_rules():
+    cache = SemanticCache(threshold=0.0)
+    cache.store(ask("What is a node in LangGraph?"), answer())
+    tool_turn = [*ask("What is a node?"), ToolMessage(content="...", tool_call_id="c1")]
+    assert cache.lookup(tool_turn) is None
+    assert cache.lookup(ask("What is the latest LangGraph news?")) is None
+    assert cache.lookup(ask("Can you explain that again?")) is None
+    assert cache.skipped == {"tool_turn": 1, "time_sensitive": 1, "refers_to_context": 1}
+
+
+def test_semantic_cache_only_caches_the_opening_question():
+    cache = SemanticCache(threshold=0.0)
+    summary = SystemMessage(content="Summary of the conversation so far: the user builds agents in Rust.")
+    later = [HumanMessage(content="Hi!"), answer("Hello!"), *ask("Explain LangGraph nodes")]
+    cache.store(later, answer("Nodes, explained for your Rust agents."))
+    cache.store([summary, *ask("Explain LangGraph nodes")], answer("Nodes, explained for your Rust agents."))
+    assert cache.stats["stores"] == 0
+    cache.store(ask("Explain LangGraph nodes"), answer())
+    assert cache.lookup(later) is None and cache.lookup([summary, *ask("Explain LangGraph nodes")]) is None
+    assert cache.skipped == {"has_history": 2}
+
+
+def test_time_sensitive_hints_match_whole_words():
+    assert looks_like_search("Any LangGraph releases in 2024?") and looks_like_search("What is it now?")
+    assert not looks_like_search("Do you know what snowballing state means?")
+    cache = SemanticCache(threshold=0.5)
+    cache.store(ask("Do you know what a LangGraph node is?"), answer())
+    assert cache.lookup(ask("Do you know what a LangGraph node is?")) is not None
+    assert cache.skipped == {}
+
+
+def test_semantic_cache_stores_plain_answers_only():
+    cache = SemanticCache(threshold=0.0)
+    cache.store(ask("What is a node?"), AIMessage(content="", tool_calls=[{"name": "s", "args": {}, "id": "c"}]))
+    cache.store(ask("What is the weather today?"), answer())
+    assert cache.stats["stores"] == 0
+
+
+def test_semantic_cache_expires_entries():
+    cache = SemanticCache(threshold=0.5, ttl=0)
+    cache.store(ask("What is a node in LangGraph?"), answer())
+    assert cache.lookup(ask("What is a node in LangGraph?")) is None
+
+
+def test_semantic_cache_in_the_graph():
+    cache = SemanticCache(threshold=0.6)
+    graph = fake_graph(semantic_cache=cache)
+    # No search keywords: the fake answers without calling the tool
+    first = turn(graph, "a", "Explain nodes in LangGraph")["messages"][-1]
+    second = turn(graph, "b", "Describe LangGraph nodes, please")["messages"][-1]
+    assert second.content == first.content
+    assert cache.stats["hits"] == 1
+
+
+
+def test_semantic_cache_does_not_share_answers_built_on_history():
+    cache = SemanticCache(threshold=0.6)
+    graph = fake_graph(semantic_cache=cache)
+    turn(graph, "a", "Hi! I build agents in Rust.")
+    personal = turn(graph, "a", "Explain nodes in LangGraph")["messages"][-1]
+    fresh = turn(graph, "b", "Explain nodes in LangGraph")["messages"][-1]
+    # The answer the fake gave in thread "a" depends on its history: not served to "b"
+    assert fresh.content != personal.content
+    assert "semantic_cache" not in fresh.response_metadata
+    assert cache.stats["hits"] == 0 and cache.skipped == {"has_history": 1}
@@ -0,0 +1,104 @@
+# ---------------------------------------------------
+# SqliteCheckpointer (delta storage) vs MemorySaver
+# ---------------------------------------------------
+from langgraph.checkpoint.memory import MemorySaver
+
+from conftest import QUESTIONS, fake_graph, turn
+from langgraph_playground.serialization import MessageSerializer
+from langgraph_playground.sqlite_checkpointer import SqliteCheckpointer
+
+
+def contents(state) -> list:
+    return [(m.type, m.content, [c["name"] for c in getattr(m, "tool_calls", [])]) for m in state["messages"]]
+
+
+def replay(graph, thread_id: str = "t", rounds: int = 3) -> dict:
+    state = None
+    for _ in range(rounds):
+        for question in QUESTIONS:
+            state = turn(graph, thread_id, question)
+    return state
+
+
+def delta_saver(path, **kwargs) -> SqliteCheckpointer:
+    return SqliteCheckpointer(str(path), serde=MessageSerializer(), snapshot_every=4, **kwargs)
+
+
+def stored(saver: SqliteCheckpointer, thread_id: str = "t") -> tuple:
+    """`(checkpoints, delta checkpoints)` stored for a thread."""
+    return saver.conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(delta), 0) FROM checkpoints WHERE thread_id = ?", (thread_id,)
+    ).fetchone()
+
+
+def test_delta_round_trip_matches_memory_saver(tmp_path):
+    expected = replay(fake_graph(MemorySaver()))
+    saver = delta_saver(tmp_path / "c.db")
+    state = replay(fake_graph(saver))
+    assert contents(state) == contents(expected)
+    total, deltas = stored(saver)
+    assert 0 < deltas < total  # deltas with periodic base snapshots
+
+
+def test_every_checkpoint_reads_back_like_memory_saver(tmp_path):
+    memory_graph, delta_graph = fake_graph(MemorySaver()), fake_graph(delta_saver(tmp_path / "c.db"))
+    replay(memory_graph, rounds=1)
+    replay(delta_graph, rounds=1)
+    config = {"configurable": {"thread_id": "t"}}
+    history = list(delta_graph.get_state_history(config))
+    assert len(history) == len(list(memory_graph.get_state_history(config)))
+    for mine, theirs in zip(history, memory_graph.get_state_history(config)):
+        assert contents(mine.values) == contents(theirs.values)
+        assert mine.next == theirs.next
+
+
+def test_reopen_continues_the_thread(tmp_path):
+    path = tmp_path / "c.db"
+    saver = delta_saver(path)
+    replay(fake_graph(saver), rounds=1)
+    saver.close()
+
+    reopened = delta_saver(path)  # no cached chains: reads walk back to the base
+    graph = fake_graph(reopened)
+    expected_graph = fake_graph(MemorySaver())
+    replay(expected_graph, rounds=1)
+    assert contents(graph.get_state({"configurable": {"thread_id": "t"}}).values) == contents(
+        expected_graph.get_state({"configurable": {"thread_id": "t"}}).values
+    )
+    assert contents(turn(graph, "t", "And after a restart?")) == contents(turn(expected_graph, "t", "And after a restart?"))
+
+
+def test_fork_from_an_older_checkpoint(tmp_path):
+    graphs = [fake_graph(MemorySaver()), fake_graph(delta_saver(tmp_path / "c.db"))]
+    forks = []
+    for graph in graphs:
+        replay(graph, rounds=2)
+        config = {"configurable": {"thread_id": "t"}}
+        # A checkpoint from the first round, in the middle of a delta chain
+        past = [s for s in graph.get_state_history(config) if not s.next][-4]
+        forked = turn(graph, "t", "Let's take another path.", checkpoint_id=past.config["configurable"]["checkpoint_id"])
+        forks.append(contents(forked))
+        # The fork is now the latest state; the old branch stays readable
+        assert contents(graph.get_state(config).values) == forks[-1]
+        assert contents(graph.get_state(past.config).values) == contents(past.values)
+    assert forks[0] == forks[1]
+
+
+def test_prune_keeps_the_newest_checkpoints(tmp_path):
+    saver = delta_saver(tmp_path / "c.db", keep_last=6)
+    graph = fake_graph(saver)
+    expected = replay(fake_graph(MemorySaver()))
+    state = replay(graph)
+    total, _ = stored(saver)
+    assert 6 <= total <= 6 + saver.snapshot_every
+    # The cut is at a base snapshot: the oldest checkpoint kept is not a delta
+    oldest = saver.conn.execute(
+        "SELECT delta FROM checkpoints WHERE thread_id = 't' ORDER BY checkpoint_id LIMIT 1"
+    ).fetchone()
+    assert oldest == (0,)
+    assert contents(state) == contents(expected)
+    assert saver.prune("t") == 0  # already applied on every put
+
+    saver.close()
+    reopened = delta_saver(tmp_path / "c.db", keep_last=6)
+    assert contents(fake_graph(reopened).get_state({"configurable": {"thread_id": "t"}}).values) == contents(expected)
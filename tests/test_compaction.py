@@ -0,0 +1,75 @@
+# ---------------------------------------------------
+# Tool-output compaction: compact, expand from the PayloadStore, opt-in
+# ---------------------------------------------------
+import json
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.checkpoint.memory import MemorySaver
+
+from conftest import fake_graph, turn
+from langgraph_playground.compaction import PayloadStore, ToolOutputCompactor, compact_results
+
+RESULTS = [
+    {"url": "https://example.com/a?utm=1", "content": "LangGraph 0.3 adds a functional API. Accept all cookies to continue."},
+    {"url": "https://www.example.com/a", "content": "Duplicate of the first page, same canonical URL."},
+    {"url": "https://example.com/b", "content": "The release also improves checkpointer performance. Unrelated trivia about the weather in Lisbon."},
+]
+
+
+def search_step(content: str) -> dict:
+    call = {"name": "tavily_search_results_json", "args": {"query": "LangGraph release"}, "id": "c1"}
+    return {"messages": [
+        HumanMessage(content="Search the latest LangGraph release"),
+        AIMessage(content="", tool_calls=[call]),
+        ToolMessage(content=content, artifact={"results": RESULTS}, tool_call_id="c1", id="tool-1"),
+    ]}
+
+
+def test_compact_results_dedupes_and_drops_boilerplate():
+    text = compact_results(json.dumps(RESULTS), "LangGraph release", max_tokens=60)
+    assert "functional API" in text and "example.com/b" in text
+    assert "Duplicate" not in text and "cookies" not in text
+    assert len(text) <= 60 * 4
+
+
+def test_compact_results_trims_other_output():
+    assert compact_results("plain text", "q") == "plain text"
+    assert compact_results("x" * 1000, "q", max_tokens=10) == "x" * 40
+
+
+def test_compactor_replaces_the_message_and_keeps_the_payload():
+    compactor = ToolOutputCompactor(max_tokens=60)
+    content = json.dumps(RESULTS)
+    (message,) = compactor(search_step(content))["messages"]
+    # Same id: add_messages replaces the raw message in place
+    assert message.id == "tool-1" and len(message.content) < len(content)
+    assert compactor.store.get(message.artifact["ref"]) == {"content": content, "artifact": {"results": RESULTS}}
+    # Already compacted messages are left alone
+    step = search_step(content)
+    step["messages"][-1] = message
+    assert compactor(step) == {"messages": []}
+    assert compactor.stats["messages"] == 1 and compactor.stats["tokens_after"] < compactor.stats["tokens_before"]
+
+
+def test_payload_store_in_memory_is_bounded_and_sqlite_persists(tmp_path):
+    memory = PayloadStore(max_entries=2)
+    refs = [memory.put({"n": i}) for i in range(3)]
+    assert memory.get(refs[0]) is None and memory.get(refs[2]) == {"n": 2}
+
+    path = str(tmp_path / "payloads.db")
+    ref = PayloadStore(path).put({"content": "full results"})
+    assert PayloadStore(path).get(ref) == {"content": "full results"}
+
+
+def test_compaction_is_opt_in(monkeypatch, tmp_path):
+    question = "Search the latest LangGraph release notes."
+    raw = turn(fake_graph(MemorySaver()), "t", question)
+    assert "compact" not in fake_graph(MemorySaver()).nodes
+    assert next(m for m in raw["messages"] if m.type == "tool").artifact.get("ref") is None
+
+    monkeypatch.setenv("TOOL_OUTPUT_TOKENS", "80")
+    monkeypatch.setenv("TOOL_PAYLOAD_DB", str(tmp_path / "payloads.db"))
+    compacted = turn(fake_graph(MemorySaver()), "t", question)
+    message = next(m for m in compacted["messages"] if m.type == "tool")
+    payload = PayloadStore(str(tmp_path / "payloads.db")).get(message.artifact["ref"])
+    assert payload["content"] == next(m for m in raw["messages"] if m.type == "tool").content
@@ -0,0 +1,129 @@
+# ---------------------------------------------------
+# build_graph: optional components, instrumentation, prefetch, routing
+# ---------------------------------------------------
+from langgraph.checkpoint.memory import MemorySaver
+
+from conftest import QUESTIONS, fake_graph, turn
+from langgraph_playground.fakes import FakeChatModel, FakeSearchTool
+from langgraph_playground.graph import components
+from langgraph_playground.instrumentation import GraphMetrics, MeasuredCheckpointer, instrument
+from langgraph_playground.routing import ModelRouter, Route
+from langgraph_playground.semantic_cache import SemanticCache
+from langgraph_playground.serialization import MessageSerializer
+from langgraph_playground.sqlite_checkpointer import SqliteCheckpointer
+
+
+def full_graph(checkpointer=None):
+    router = ModelRouter([
+        Route("small", FakeChatModel(model="small", latency=0.0), max_complexity=1.5),
+        Route("large", FakeChatModel(model="large", latency=0.0)),
+    ])
+    graph = fake_graph(checkpointer or MemorySaver(), prefetch=True, semantic_cache=SemanticCache(), router=router)
+    return graph, router
+
+
+# --- Components stay off the compiled graph ---
+def test_copies_keep_their_components():
+    # Regression: components stored on the Pregel object broke Pregel.copy()
+    # (and so with_config / instrument) with an unexpected keyword argument
+    graph, router = full_graph()
+    parts = components(graph)
+    assert parts.router is router and parts.prefetcher is not None and parts.semantic_cache is not None
+    for copy in (graph.copy(), graph.with_config(tags=["test"]), instrument(graph, GraphMetrics())):
+        assert components(copy) == parts
+        assert turn(copy, "t", "Explain nodes")["route"] == "small"
+
+
+def test_graph_without_components():
+    graph = fake_graph(MemorySaver())
+    assert components(graph).router is None and components(graph).prefetcher is None
+    assert components(object()).router is None
+
+
+def test_instrument_reports_nodes_tokens_and_checkpoints():
+    metrics = GraphMetrics()
+    graph, _ = full_graph(MeasuredCheckpointer(MemorySaver(), metrics))
+    graph = instrument(graph, metrics)
+    for question in QUESTIONS:
+        turn(graph, "t", question)
+    assert metrics.turns == len(QUESTIONS)
+    assert metrics.node_count["chatbot"] > len(QUESTIONS)  # search turns call it twice
+    assert metrics.tool_calls["tavily_search_results_json"] >= 1
+    assert metrics.checkpoint_writes > 0 and metrics.checkpoint_bytes > 0
+    assert 'node="chatbot"' in metrics.to_prometheus()
+
+
+def test_measured_bytes_are_what_the_saver_stored(tmp_path):
+    metrics = GraphMetrics()
+    saver = SqliteCheckpointer(str(tmp_path / "c.db"), serde=MessageSerializer(), snapshot_every=8)
+    graph = fake_graph(MeasuredCheckpointer(saver, metrics))
+    full = GraphMetrics()
+    reference = fake_graph(MeasuredCheckpointer(MemorySaver(serde=MessageSerializer()), full))
+    for _ in range(4):
+        for question in QUESTIONS:
+            turn(graph, "t", question)
+            turn(reference, "t", question)
+    stored = saver.conn.execute("SELECT SUM(LENGTH(checkpoint) + LENGTH(metadata)) FROM checkpoints").fetchone()[0]
+    assert metrics.checkpoint_bytes == stored
+    # Deltas store the new messages only
+    assert metrics.checkpoint_bytes < full.checkpoint_bytes
+
+
+# --- Prefetch ---
+class FlakySearch(FakeSearchTool):
+    """Fails (the way TavilySearchResults does, without raising) on its first call."""
+
+    failures: int = 1
+
+    def _run(self, query: str, run_manager=None) -> tuple:
+        if self.failures:
+            self.failures -= 1
+            return "HTTPError('503 Service Unavailable')", {}
+        return super()._run(query)
+
+
+def test_failed_prefetch_is_searched_again():
+    search = FlakySearch(latency=0.0)
+    graph = fake_graph(MemorySaver(), tools=[search], prefetch=True)
+    state = turn(graph, "t", "Search the latest LangGraph release notes.")
+    result = next(m for m in state["messages"] if m.type == "tool")
+    assert "HTTPError" not in result.content and "example.com" in result.content
+    stats = components(graph).prefetcher.stats
+    assert stats["prefetched"] == 1 and stats["failed"] == 1 and stats["hits"] == 0
+
+
+def test_prefetch_hit_and_no_prefetch_without_thread_id():
+    graph = fake_graph(MemorySaver(), prefetch=True)
+    turn(graph, "t", "Search the latest LangGraph release notes.")
+    prefetcher = components(graph).prefetcher
+    assert prefetcher.stats["hits"] == 1
+
+    unthreaded = fake_graph(variant="web", prefetch=True)
+    unthreaded.invoke({"messages": [{"role": "user", "content": "Search the latest LangGraph news"}]})
+    assert components(unthreaded).prefetcher.stats["prefetched"] == 0
+
+
+# --- Routing ---
+def test_tool_routing_binds_tools_only_when_needed():
+    graph = fake_graph(MemorySaver(), tool_routing=True)
+    chat = turn(graph, "t", "What is a StateGraph?")
+    assert chat["route"] == "llm" and not any(m.type == "tool" for m in chat["messages"])
+    search = turn(graph, "t", "Search the latest LangGraph release notes.")
+    assert search["route"] == "llm+tools" and search["messages"][-2].type == "tool"
+
+
+def test_router_picks_the_model_per_turn():
+    graph, router = full_graph()
+    assert turn(graph, "t", "Hi!")["route"] == "small"
+    hard = "Compare MemorySaver and a SQLite checkpointer: trade-offs for a multi-process server, step by step?"
+    assert turn(graph, "t", hard)["route"].startswith("large")
+    assert set(router.summary()) >= {"small", "large"}
+
+
+def test_router_keeps_a_bounded_latency_window():
+    router = ModelRouter([Route("small", FakeChatModel(latency=0.0))], latency_window=100)
+    for i in range(1000):
+        router.record("small", i / 1000, None)
+    assert router.stats["small"]["calls"] == 1000 and len(router.stats["small"]["latencies"]) == 100
+    # Percentiles over the latest calls only
+    assert router.summary()["small"]["p50"] == 0.95
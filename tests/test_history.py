@@ -0,0 +1,115 @@
+# ---------------------------------------------------
+# HistoryPolicy windows and the summarize node
+# ---------------------------------------------------
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage, SystemMessage, ToolMessage
+from langgraph.checkpoint.memory import MemorySaver
+
+from conftest import QUESTIONS, fake_graph, turn
+from langgraph_playground.fakes import FakeChatModel
+from langgraph_playground.history import HistoryPolicy, summarize_history, with_summary
+
+
+class RecordingModel(FakeChatModel):
+    """FakeChatModel that keeps the prompts it was sent."""
+
+    prompts: list = []
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.prompts.append(messages[-1].content)
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.prompts.append(messages[-1].content)
+        return await super()._agenerate(messages, stop, run_manager, **kwargs)
+
+
+def conversation() -> list:
+    call = {"name": "tavily_search_results_json", "args": {"query": "langgraph"}, "id": "c1"}
+    return [
+        HumanMessage("Hi! I'm Ana.", id="h1"),
+        AIMessage("Hello Ana!", id="a1"),
+        HumanMessage("Search the latest LangGraph release.", id="h2"),
+        AIMessage("", tool_calls=[call], id="a2"),
+        ToolMessage("[{\"url\": \"https://example.com\"}]", tool_call_id="c1", id="t1"),
+        AIMessage("LangGraph 0.3 is out.", id="a3"),
+        HumanMessage("Thanks, what changed?", id="h3"),
+    ]
+
+
+def orphans(messages: list) -> list:
+    calls = {c["id"] for m in messages if isinstance(m, AIMessage) for c in m.tool_calls}
+    return [m for m in messages if isinstance(m, ToolMessage) and m.tool_call_id not in calls]
+
+
+# --- HistoryPolicy.split ---
+def test_short_history_is_kept_whole():
+    messages = conversation()
+    assert HistoryPolicy(max_messages=20).split(messages) == ([], messages)
+    assert HistoryPolicy(max_messages=None, max_tokens=None).split(messages) == ([], messages)
+
+
+def test_window_starts_at_a_user_message():
+    messages = conversation()
+    # The last 4 would start at the AI tool call: the window moves on to h3
+    older, recent = HistoryPolicy(max_messages=4).split(messages)
+    assert [m.id for m in recent] == ["h3"] and older + recent == messages
+    # The last 5 start right at h2: the search round trip stays together
+    older, recent = HistoryPolicy(max_messages=5).split(messages)
+    assert [m.id for m in recent] == ["h2", "a2", "t1", "a3", "h3"]
+
+
+def test_tool_messages_are_never_orphaned():
+    messages = conversation()
+    for n in range(1, len(messages) + 1):
+        older, recent = HistoryPolicy(max_messages=n).split(messages)
+        assert isinstance(recent[0], HumanMessage)
+        assert orphans(recent) == []
+
+
+def test_token_budget_cut_and_stricter_limit_wins():
+    messages = conversation()
+    messages[1] = AIMessage("word " * 400, id="a1")  # one long answer early on
+    older, recent = HistoryPolicy(max_messages=None, max_tokens=200).split(messages)
+    assert [m.id for m in older] == ["h1", "a1"] and recent[0].id == "h2"
+    # max_messages=7 alone keeps everything; the budget is stricter
+    assert HistoryPolicy(max_messages=7).split(messages) == ([], messages)
+    assert HistoryPolicy(max_messages=7, max_tokens=200).split(messages) == (older, recent)
+    # A budget smaller than the current question keeps the question anyway
+    older, recent = HistoryPolicy(max_messages=None, max_tokens=1).split(messages)
+    assert [m.id for m in recent] == ["h3"]
+
+
+# --- summarize node ---
+def test_summarize_folds_older_messages_into_the_summary():
+    llm = RecordingModel(latency=0.0)
+    node = summarize_history(llm, HistoryPolicy(max_messages=4))
+    state = {"messages": conversation(), "summary": "The user said hello."}
+    update = node.invoke(state)
+    assert update["messages"] == [RemoveMessage(id=i) for i in ("h1", "a1", "h2", "a2", "t1", "a3")]
+    assert update["summary"].startswith("Sure!")
+    # The prompt carries the previous summary and the transcript of the removed messages
+    (prompt,) = llm.prompts
+    assert "The user said hello." in prompt and "human: Hi! I'm Ana." in prompt and "ai: LangGraph 0.3 is out." in prompt
+    assert asyncio.run(node.ainvoke(state)) == update
+    # Nothing outside the window: no model call, no update
+    assert node.invoke({"messages": conversation()[-1:]}) == {}
+    assert len(llm.prompts) == 2
+
+
+def test_graph_keeps_a_bounded_window_with_a_rolling_summary():
+    llm = RecordingModel(latency=0.0)
+    graph = fake_graph(MemorySaver(), llm=llm, history_policy=HistoryPolicy(max_messages=4))
+    for question in QUESTIONS:
+        state = turn(graph, "t", question)
+    assert state["summary"] and isinstance(state["messages"][0], HumanMessage)
+    # At most the 4-message window plus this turn's tool call, result and answer
+    assert len(state["messages"]) <= 4 + 3 and orphans(state["messages"]) == []
+    # The chatbot sees the summary first, then the window
+    prompt = with_summary(state)
+    assert isinstance(prompt[0], SystemMessage) and state["summary"] in prompt[0].content
+    assert prompt[1:] == state["messages"]
+    # Each new summary builds on the previous one
+    summaries = [p for p in llm.prompts if p.startswith("Summarize the conversation")]
+    assert len(summaries) >= 2 and "(none)" not in summaries[-1]
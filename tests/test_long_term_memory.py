@@ -0,0 +1,59 @@
+# ---------------------------------------------------
+# LongTermMemory: fact extraction, recall across threads, user scoping
+# ---------------------------------------------------
+from langchain_core.messages import HumanMessage, SystemMessage
+from langgraph.checkpoint.memory import MemorySaver
+
+from conftest import fake_graph, turn
+from langgraph_playground.long_term_memory import LongTermMemory, extract_facts
+
+
+def user(user_id=None) -> dict:
+    return {"configurable": {"thread_id": "t", **({"user_id": user_id} if user_id else {})}}
+
+
+def test_extract_facts_keeps_statements_not_questions():
+    text = "My name is Ana. I work with Rust every day! What is a StateGraph? Eu moro em Lisboa."
+    assert extract_facts(text) == ["My name is Ana.", "I work with Rust every day!", "Eu moro em Lisboa."]
+    assert extract_facts("Do I like Rust?") == []
+
+
+def test_recall_the_relevant_facts_of_the_user():
+    memory = LongTermMemory()
+    memory.remember([HumanMessage("My name is Ana. I work with Rust at a bank.")], user("ana"))
+    memory.remember([HumanMessage("I work with Rust at a bank, still.")], user("ana"))
+    assert memory.count("ana") == 2 and memory.stats["refreshed"] == 1
+    messages = [SystemMessage("summary"), HumanMessage("Which language do I work with?")]
+    prompt = memory.prompt(messages, user("ana"))
+    assert prompt[0] is messages[0] and prompt[2:] == messages[1:]
+    assert "Rust" in prompt[1].content
+
+
+def test_namespaces_do_not_leak_between_users():
+    memory = LongTermMemory()
+    memory.remember([HumanMessage("I work with Rust at a bank.")], user("ana"))
+    question = [HumanMessage("Which language do I work with?")]
+    assert memory.prompt(question, user("bob")) == question
+
+
+def test_turns_without_a_user_id_skip_memory():
+    memory = LongTermMemory()
+    memory.remember([HumanMessage("I work with Rust at a bank.")], user())
+    assert memory.stats["added"] == 0
+    memory.remember([HumanMessage("I work with Rust at a bank.")], user("ana"))
+    question = [HumanMessage("Which language do I work with?")]
+    # An anonymous caller is never shown anyone's facts
+    assert memory.prompt(question, user()) == question
+    assert memory.stats["searches"] == 0
+
+
+def test_graph_recalls_facts_in_a_new_thread(tmp_path):
+    memory = LongTermMemory(str(tmp_path / "memories.db"))
+    graph = fake_graph(MemorySaver(), long_term_memory=memory)
+    turn(graph, "t1", "Hi! My name is Ana and I work with Rust.", user_id="ana")
+    turn(graph, "t2", "Hi! I'm Bob.")
+    assert memory.count("ana") == 1 and memory.stats["added"] == 1
+    turn(graph, "t3", "Which language do I work with?", user_id="ana")
+    assert memory.stats["retrieved"] >= 1
+    # Stored in SQLite: a new instance on the same file sees the fact
+    assert LongTermMemory(str(tmp_path / "memories.db")).count("ana") == 1
@@ -0,0 +1,91 @@
+# ---------------------------------------------------
+# ParallelToolNode: concurrency, order and timeouts
+# ---------------------------------------------------
+import asyncio
+import time
+
+from langchain_core.messages import AIMessage
+from langgraph.constants import CONFIG_KEY_STORE
+
+from langgraph_playground.fakes import FakeSearchTool
+from langgraph_playground.parallel_tools import ParallelToolNode
+
+
+class NamedSearch(FakeSearchTool):
+    """FakeSearchTool under another name, so each call can have its own latency."""
+
+    name: str = "slow_search"
+
+
+def calls(*names: str) -> dict:
+    return {"messages": [AIMessage(
+        content="",
+        tool_calls=[{"name": name, "args": {"query": f"q{i}"}, "id": f"call_{i}"} for i, name in enumerate(names)],
+    )]}
+
+
+# ToolNode reads the store from the config Pregel passes; called alone it needs one
+STANDALONE = {"configurable": {CONFIG_KEY_STORE: None}}
+
+
+def node(timeout: float, **kwargs) -> ParallelToolNode:
+    fast = FakeSearchTool(latency=0.1)
+    slow = NamedSearch(latency=1.0)
+    return ParallelToolNode([fast, slow], timeout=timeout, **kwargs)
+
+
+def check(result: dict, statuses: list) -> None:
+    messages = result["messages"]
+    assert [m.tool_call_id for m in messages] == [f"call_{i}" for i in range(len(statuses))]
+    assert [m.status for m in messages] == statuses
+    for message in messages:
+        if message.status == "error":
+            assert "timed out after 0.4s" in message.content
+
+
+def test_calls_run_concurrently():
+    start = time.perf_counter()
+    result = node(timeout=None).invoke(calls(*["tavily_search_results_json"] * 4), STANDALONE)
+    assert time.perf_counter() - start < 0.35  # 4 x 0.1s one after the other would be 0.4s
+    check(result, ["success"] * 4)
+
+
+def test_slow_calls_time_out_in_order():
+    start = time.perf_counter()
+    result = node(timeout=0.4).invoke(calls("slow_search", "tavily_search_results_json", "slow_search"), STANDALONE)
+    assert time.perf_counter() - start < 0.9
+    check(result, ["error", "success", "error"])
+
+
+def test_slow_calls_time_out_async():
+    async def main():
+        start = time.perf_counter()
+        result = await node(timeout=0.4).ainvoke(calls("tavily_search_results_json", "slow_search"), STANDALONE)
+        return result, time.perf_counter() - start
+
+    result, elapsed = asyncio.run(main())
+    assert elapsed < 0.9
+    check(result, ["success", "error"])
+
+
+def test_max_concurrency_caps_parallel_calls():
+    start = time.perf_counter()
+    node(timeout=None, max_concurrency=2).invoke(calls(*["tavily_search_results_json"] * 4), STANDALONE)
+    assert time.perf_counter() - start >= 0.2  # two waves of 0.1s
+
+
+def test_timeout_starts_when_the_call_gets_a_slot():
+    # Two waves of 0.3s under a 0.5s timeout: the second wave must not be
+    # charged for the time it waited behind the first
+    tool_node = ParallelToolNode([FakeSearchTool(latency=0.3)], timeout=0.5, max_concurrency=2)
+    request = calls(*["tavily_search_results_json"] * 4)
+    check(tool_node.invoke(request, STANDALONE), ["success"] * 4)
+    check(asyncio.run(tool_node.ainvoke(request, STANDALONE)), ["success"] * 4)
+
+
+def test_timed_out_call_frees_its_slot():
+    start = time.perf_counter()
+    result = node(timeout=0.4, max_concurrency=1).invoke(calls("slow_search", "tavily_search_results_json"), STANDALONE)
+    # The fast call starts once the slow one timed out, not when its thread ends
+    assert time.perf_counter() - start < 0.9
+    check(result, ["error", "success"])
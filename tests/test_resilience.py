@@ -0,0 +1,156 @@
+# ---------------------------------------------------
+# Upstream retries: what is retried, Retry-After, circuit breaker
+# ---------------------------------------------------
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from langgraph_playground.resilience import (
+    AsyncResilientTransport,
+    CircuitBreaker,
+    CircuitOpenError,
+    ResilientTransport,
+    RetryPolicy,
+    Upstream,
+    UpstreamMetrics,
+)
+
+
+class Script:
+    """MockTransport handler answering each attempt with the next scripted outcome."""
+
+    def __init__(self, *outcomes) -> None:
+        self.outcomes = list(outcomes)
+        self.attempts = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.attempts += 1
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, type):
+            raise outcome("scripted", request=request)
+        if isinstance(outcome, tuple):
+            return httpx.Response(outcome[0], headers=outcome[1])
+        return httpx.Response(outcome)
+
+
+def upstream(**policy) -> Upstream:
+    policy = {"base_delay": 0.01, "max_delay": 0.01, **policy}
+    return Upstream("test", RetryPolicy(**policy), CircuitBreaker(failure_threshold=2), UpstreamMetrics())
+
+
+def post(up: Upstream, script: Script):
+    client = httpx.Client(transport=ResilientTransport(up, httpx.MockTransport(script)))
+    return client.post("http://upstream/v1/chat/completions", json={})
+
+
+def test_429_waits_for_retry_after():
+    up, script = upstream(), Script((429, {"retry-after": "0.3"}), 200)
+    start = time.perf_counter()
+    assert post(up, script).status_code == 200
+    assert time.perf_counter() - start >= 0.3
+    assert script.attempts == 2
+    assert up.metrics.snapshot()["test"]["retries"] == 1
+
+
+def test_retry_after_beyond_the_deadline_gives_up():
+    up, script = upstream(deadline=1.0), Script((503, {"retry-after": "30"}))
+    assert post(up, script).status_code == 503
+    assert script.attempts == 1
+
+
+@pytest.mark.parametrize("status", [500, 502, 503, 504])
+def test_5xx_are_retried(status):
+    up, script = upstream(), Script(status, status, 200)
+    assert post(up, script).status_code == 200
+    assert script.attempts == 3
+
+
+@pytest.mark.parametrize("status", [400, 408, 409, 422])
+def test_other_errors_are_not_retried(status):
+    up, script = upstream(), Script(status)
+    assert post(up, script).status_code == status
+    assert script.attempts == 1
+
+
+def test_connect_errors_are_retried():
+    up, script = upstream(), Script(httpx.ConnectError, httpx.ConnectTimeout, 200)
+    assert post(up, script).status_code == 200
+    assert script.attempts == 3
+
+
+@pytest.mark.parametrize("error", [httpx.ReadTimeout, httpx.RemoteProtocolError, httpx.ReadError])
+def test_request_already_sent_is_not_retried(error):
+    # The POST may be running upstream: a retry would run (and bill) it twice
+    up, script = upstream(), Script(error)
+    with pytest.raises(error):
+        post(up, script)
+    assert script.attempts == 1
+    assert up.metrics.snapshot()["test"]["failures"] == 1
+
+
+def test_circuit_opens_after_repeated_failures():
+    up, script = upstream(attempts=1), Script(503)
+    post(up, script)
+    post(up, script)
+    with pytest.raises(CircuitOpenError):
+        post(up, script)
+    assert script.attempts == 2
+    assert up.metrics.snapshot()["test"]["short_circuits"] == 1
+
+
+def test_async_transport_honours_retry_after():
+    up, script = upstream(), Script((429, {"retry-after": "0.2"}), 200)
+
+    async def main():
+        async with httpx.AsyncClient(transport=AsyncResilientTransport(up, httpx.MockTransport(script))) as client:
+            return await client.post("http://upstream/v1/chat/completions", json={})
+
+    start = time.perf_counter()
+    assert asyncio.run(main()).status_code == 200
+    assert time.perf_counter() - start >= 0.2
+    assert script.attempts == 2
+
+
+def open_circuit(up: Upstream) -> None:
+    up.breaker.state, up.breaker.opened_at = "open", time.monotonic() - up.breaker.reset_timeout
+
+
+def test_cancelled_probe_reopens_the_circuit():
+    up = upstream()
+    open_circuit(up)
+
+    async def slow(request):
+        await asyncio.sleep(10)
+
+    async def main():
+        transport = AsyncResilientTransport(up, httpx.MockTransport(slow))
+        async with httpx.AsyncClient(transport=transport) as client:
+            probe = asyncio.create_task(client.post("http://upstream/v1/chat/completions", json={}))
+            await asyncio.sleep(0.05)
+            assert up.breaker.state == "half_open"
+            probe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await probe
+
+    asyncio.run(main())
+    assert up.breaker.state == "open" and up.breaker.failures == 0
+    # After the reset timeout, a new probe goes through and closes it
+    open_circuit(up)
+    assert post(up, Script(200)).status_code == 200
+    assert up.breaker.state == "closed"
+
+
+def test_probe_with_an_unexpected_error_reopens_the_circuit():
+    up = upstream()
+    open_circuit(up)
+
+    def broken(request):
+        raise ValueError("bug in the transport")
+
+    with pytest.raises(ValueError):
+        post(up, broken)
+    assert up.breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        post(up, Script(200))
@@ -0,0 +1,98 @@
+# ---------------------------------------------------
+# CachedSearchTool: TTL cache, single-flight coalescing, cancellation
+# ---------------------------------------------------
+import asyncio
+import threading
+
+import pytest
+
+from langgraph_playground.fakes import FakeSearchTool
+from langgraph_playground.search_cache import CachedSearchTool
+
+
+class CountingSearch(FakeSearchTool):
+    calls: int = 0
+
+    def _run(self, query: str, run_manager=None) -> tuple:
+        self.calls += 1
+        return super()._run(query)
+
+    async def _arun(self, query: str, run_manager=None) -> tuple:
+        self.calls += 1
+        return await super()._arun(query)
+
+
+def search(tool, query: str):
+    return tool.invoke({"type": "tool_call", "name": tool.name, "args": {"query": query}, "id": "c1"})
+
+
+def test_normalized_queries_share_an_entry():
+    inner = CountingSearch(latency=0.0)
+    tool = CachedSearchTool(inner)
+    first = search(tool, "What is  LangGraph?")
+    second = search(tool, "what is langgraph")
+    assert second.content == first.content and second.artifact == first.artifact
+    assert inner.calls == 1 and tool.stats["hits"] == 1
+
+
+def test_entries_expire():
+    inner = CountingSearch(latency=0.0)
+    tool = CachedSearchTool(inner, ttl=0)
+    search(tool, "langgraph")
+    search(tool, "langgraph")
+    assert inner.calls == 2
+
+
+def test_concurrent_identical_searches_coalesce():
+    inner = CountingSearch(latency=0.2)
+    tool = CachedSearchTool(inner)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(search(tool, "langgraph"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert inner.calls == 1 and tool.stats["coalesced"] == 3
+    assert len({r.content for r in results}) == 1
+
+    async def main():
+        return await asyncio.gather(*(tool.ainvoke({"query": "asyncio"}) for _ in range(4)))
+
+    assert len(set(asyncio.run(main()))) == 1
+    assert inner.calls == 2
+
+
+def test_failed_searches_are_not_cached():
+    class Failing(CountingSearch):
+        def _run(self, query: str, run_manager=None) -> tuple:
+            self.calls += 1
+            return "HTTPError('503')", {}
+
+    inner = Failing(latency=0.0)
+    tool = CachedSearchTool(inner)
+    search(tool, "langgraph")
+    search(tool, "langgraph")
+    assert inner.calls == 2
+
+
+def test_cancelled_leader_releases_the_key():
+    inner = CountingSearch(latency=0.3)
+    tool = CachedSearchTool(inner)
+
+    async def main():
+        leader = asyncio.create_task(tool.ainvoke({"query": "langgraph"}))
+        await asyncio.sleep(0.05)
+        follower = asyncio.create_task(tool.ainvoke({"query": "langgraph"}))
+        await asyncio.sleep(0.05)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        # The follower gets an error instead of waiting forever
+        with pytest.raises(RuntimeError, match="cancelled"):
+            await asyncio.wait_for(follower, 1.0)
+        assert tool._inflight == {}
+        # The next search runs for real and is cached
+        return await asyncio.wait_for(tool.ainvoke({"query": "langgraph"}), 1.0)
+
+    assert "langgraph" in asyncio.run(main())
+    assert inner.calls == 2 and tool.stats["misses"] == 2
@@ -0,0 +1,59 @@
+# ---------------------------------------------------
+# MessageSerializer round trips
+# ---------------------------------------------------
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from langgraph_playground.serialization import MessageSerializer
+
+MESSAGES = [
+    SystemMessage(content="You are helpful."),
+    HumanMessage(content="Olá! Quem ganhou o Oscar?", id="h1"),
+    AIMessage(
+        content="",
+        id="a1",
+        tool_calls=[{"name": "search", "args": {"query": "oscar 2025"}, "id": "call_1"}],
+        usage_metadata={"input_tokens": 12, "output_tokens": 3, "total_tokens": 15},
+    ),
+    ToolMessage(content='[{"url": "https://example.com"}]', tool_call_id="call_1", name="search", artifact={"results": [1]}),
+    ToolMessage(content="Error: timed out", tool_call_id="call_2", status="error"),
+    AIMessage(content=[{"type": "text", "text": "multi-part"}], response_metadata={"model_name": "fake"}),
+    HumanMessage(content="emoji 🚀 and a very long line " * 50, additional_kwargs={"k": [1, 2]}),
+]
+
+
+@pytest.mark.parametrize("compress_level", [None, 3])
+def test_messages_round_trip(compress_level):
+    serde = MessageSerializer(compress_level=compress_level)
+    type_, data = serde.dumps_typed(MESSAGES)
+    assert type_.startswith("msgpack-lc")
+    restored = serde.loads_typed((type_, data))
+    assert restored == MESSAGES
+    assert [type(m) for m in restored] == [type(m) for m in MESSAGES]
+    assert restored[2].tool_calls[0]["type"] == "tool_call"
+
+
+def test_compression_only_above_the_threshold():
+    serde = MessageSerializer(compress_level=3, compress_min_bytes=1024)
+    assert serde.dumps_typed([MESSAGES[1]])[0] == "msgpack-lc"
+    assert serde.dumps_typed(MESSAGES)[0] == "msgpack-lc+zstd"
+
+
+def test_smaller_than_the_default_serializer():
+    assert len(MessageSerializer().dumps_typed(MESSAGES)[1]) < len(JsonPlusSerializer().dumps_typed(MESSAGES)[1])
+
+
+def test_reads_the_default_format_and_other_state():
+    serde = MessageSerializer()
+    state = {"messages": MESSAGES, "summary": "", "route": "small+tools", "count": 3, "raw": b"\x00\x01"}
+    assert serde.loads_typed(JsonPlusSerializer().dumps_typed(state)) == state
+    assert serde.loads_typed(serde.dumps_typed(state)) == state
+    assert serde.loads_typed(serde.dumps_typed(None)) is None
+
+
+def test_restored_defaults_are_not_shared():
+    serde = MessageSerializer()
+    first, second = (serde.loads_typed(serde.dumps_typed(HumanMessage(content="hi"))) for _ in range(2))
+    first.additional_kwargs["x"] = 1
+    assert second.additional_kwargs == {}
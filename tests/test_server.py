@@ -0,0 +1,137 @@
+# ---------------------------------------------------
+# GraphServer: routes, admission control and streaming
+# ---------------------------------------------------
+import asyncio
+import json
+
+import httpx
+from langgraph.checkpoint.memory import MemorySaver
+
+from conftest import fake_graph
+from langgraph_playground.fakes import FakeChatModel
+from langgraph_playground.server import GraphServer
+
+
+def server(llm_latency: float = 0.0, **kwargs) -> GraphServer:
+    return GraphServer(fake_graph(MemorySaver(), llm=FakeChatModel(latency=llm_latency)), **kwargs)
+
+
+def serve(app: GraphServer, scenario) -> object:
+    """Run `scenario(client)` against `app` in process."""
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await scenario(client)
+
+    return asyncio.run(main())
+
+
+def post(client, thread_id: str, message: str = "Explain nodes", **kwargs):
+    return client.post(f"/threads/{thread_id}", json={"message": message}, **kwargs)
+
+
+def test_json_turn_and_health():
+    app = server()
+
+    async def scenario(client):
+        answer = await post(client, "t1")
+        health = await client.get("/healthz")
+        return answer, health
+
+    answer, health = serve(app, scenario)
+    assert answer.status_code == 200
+    assert answer.json()["thread_id"] == "t1" and answer.json()["answer"].startswith("Sure!")
+    assert health.json() == {"status": "ok", "active": 0, "queued": 0, "served": 1, "rejected": 0, "failed": 0}
+
+
+def test_sse_turn_streams_tokens_then_done():
+    app = server()
+
+    async def scenario(client):
+        return await post(client, "t1", "Search the latest LangGraph news", headers={"accept": "text/event-stream"})
+
+    response = serve(app, scenario)
+    assert response.headers["content-type"] == "text/event-stream"
+    events = [line[len("event: "):] for line in response.text.splitlines() if line.startswith("event: ")]
+    assert events[0] == "tool_call" and "tool_result" in events and "token" in events
+    assert events[-1] == "done"
+    done = json.loads(response.text.strip().splitlines()[-1][len("data: "):])
+    assert done["answer"].startswith("Based on the search results")
+
+
+def test_bad_requests():
+    app = server(max_body=128)
+
+    async def scenario(client):
+        return [
+            (await client.post("/threads/t1", content=b"not json")).status_code,
+            (await client.post("/threads/t1", json={"no": "message"})).status_code,
+            (await post(client, "t1", "x" * 256)).status_code,
+            (await client.get("/threads/t1")).status_code,
+            (await post(client, "bad thread id")).status_code,
+        ]
+
+    assert serve(app, scenario) == [400, 400, 413, 405, 404]
+
+
+def test_full_queue_is_rejected_with_retry_after():
+    app = server(llm_latency=0.3, max_concurrency=1, max_queue=1)
+
+    async def scenario(client):
+        return await asyncio.gather(*(post(client, f"t{i}") for i in range(3)))
+
+    responses = serve(app, scenario)
+    assert sorted(r.status_code for r in responses) == [200, 200, 503]
+    rejected = next(r for r in responses if r.status_code == 503)
+    assert rejected.headers["retry-after"] == "1"
+    assert "queue is full" in rejected.json()["error"]
+    assert app.stats["rejected"] == 1 and app.stats["queued"] == 0 and app.stats["active"] == 0
+
+
+def test_queue_timeout_is_rejected():
+    app = server(llm_latency=0.3, max_concurrency=1, queue_timeout=0.05)
+
+    async def scenario(client):
+        return await asyncio.gather(post(client, "a"), post(client, "b"))
+
+    first, second = serve(app, scenario)
+    assert first.status_code == 200 and second.status_code == 503
+    assert "timed out" in second.json()["error"]
+    assert app._thread_locks == {}  # the waiter's lock entry was released
+
+
+def test_turns_of_one_thread_run_one_after_the_other():
+    app = server(llm_latency=0.1, max_concurrency=4)
+
+    async def scenario(client):
+        return await asyncio.gather(post(client, "same", "Explain nodes"), post(client, "same", "Explain edges"))
+
+    assert [r.status_code for r in serve(app, scenario)] == [200, 200]
+    messages = app.graph.get_state({"configurable": {"thread_id": "same"}}).values["messages"]
+    # Two complete turns, not two answers to the same history
+    assert [m.type for m in messages] == ["human", "ai", "human", "ai"]
+
+
+def test_client_disconnect_stops_the_stream():
+    app = server(llm_latency=0.2)
+    sent = []
+    requests = [{"type": "http.request", "body": json.dumps({"message": "Explain nodes"}).encode()}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await asyncio.sleep(0.05)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    async def main():
+        scope = {"type": "http", "method": "POST", "path": "/threads/gone", "headers": [(b"accept", b"text/event-stream")]}
+        await app(scope, receive, send)
+        return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    assert asyncio.run(main()) == []
+    assert not any(m.get("body") for m in sent)  # the answer was never streamed
+    assert app.stats["active"] == 0 and app._thread_locks == {}
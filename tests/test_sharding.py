@@ -0,0 +1,94 @@
+# ---------------------------------------------------
+# HashRing placement and ShardRouter rebalancing
+# ---------------------------------------------------
+import asyncio
+
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+
+from conftest import QUESTIONS, fake_graph
+from langgraph_playground.server import GraphServer
+from langgraph_playground.sharding import HashRing, ShardRouter
+
+KEYS = [f"thread-{i}" for i in range(2000)]
+
+
+def placement(ring: HashRing) -> dict:
+    return {key: ring.node_for(key) for key in KEYS}
+
+
+# --- HashRing ---
+def test_ring_is_deterministic_and_balanced():
+    ring = HashRing(("w0", "w1", "w2"))
+    assert placement(ring) == placement(HashRing(("w2", "w0", "w1")))
+    counts = {node: list(placement(ring).values()).count(node) for node in ring.nodes}
+    assert min(counts.values()) > len(KEYS) / 3 * 0.6
+
+
+def test_adding_a_node_moves_keys_only_to_it():
+    ring = HashRing(("w0", "w1", "w2"))
+    before = placement(ring)
+    grown = ring.copy()
+    grown.add("w3")
+    after = placement(grown)
+    moved = [key for key in KEYS if before[key] != after[key]]
+    assert {after[key] for key in moved} == {"w3"}
+    assert 0.15 < len(moved) / len(KEYS) < 0.35  # ideally 1/4
+    assert placement(ring) == before  # the copy left the original alone
+
+
+def test_removing_a_node_moves_only_its_keys():
+    ring = HashRing(("w0", "w1", "w2", "w3"))
+    before = placement(ring)
+    ring.remove("w1")
+    after = placement(ring)
+    assert [key for key in KEYS if before[key] != after[key]] == [key for key in KEYS if before[key] == "w1"]
+
+
+def test_empty_ring_raises():
+    with pytest.raises(LookupError):
+        HashRing().node_for("t")
+
+
+# --- ShardRouter (real worker processes) ---
+def fake_server() -> GraphServer:
+    # Module level so that spawned workers can unpickle it
+    return GraphServer(fake_graph(MemorySaver()))
+
+
+async def direct(server: GraphServer, thread_id: str, message: str) -> dict:
+    state = await server.graph.ainvoke({"messages": [{"role": "user", "content": message}]}, {"configurable": {"thread_id": thread_id}})
+    return {"thread_id": thread_id, "answer": state["messages"][-1].content}
+
+
+def test_rebalance_moves_sessions_with_their_history():
+    sessions = [f"s{i}" for i in range(40)]
+
+    async def turn_all(run, question: str) -> dict:
+        return {r["thread_id"]: r["answer"] for r in await asyncio.gather(*(run(t, question) for t in sessions))}
+
+    async def main():
+        reference = fake_server()
+        router = ShardRouter(2, server_factory=fake_server)
+        await router.start()
+        try:
+            steps = [None, router.add_worker, lambda: router.remove_worker("w0")]
+            for step, change in enumerate(steps):
+                owners = {t: name for name, w in router.workers.items() for t in w.threads}
+                if change is not None:
+                    await change()
+                moved = sum(owners[t] != name for name, w in router.workers.items() for t in w.threads if t in owners)
+                if change is not None:
+                    assert 0 < moved < len(sessions)
+                # The fake's answer depends on the conversation so far: lost history shows
+                question = QUESTIONS[step]
+                assert await turn_all(router.run, question) == await turn_all(lambda t, q: direct(reference, t, q), question)
+            health = await router.health()
+            assert sorted(health["workers"]) == ["w1", "w2"]
+            assert sum(w["sessions"] for w in health["workers"].values()) == len(sessions)
+            assert health["moved"] > 0
+        finally:
+            await router.stop()
+        assert router.workers == {}
+
+    asyncio.run(main())